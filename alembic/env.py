@@ -13,8 +13,10 @@ from app.modules.chats.models import *  # noqa: F403
 from app.modules.invites.models import *  # noqa: F403
 from app.modules.logs.models import *  # noqa: F403
 from app.modules.notifications.models import *  # noqa: F403
+from app.modules.progress.models import *  # noqa: F403
 from app.modules.roles.models import *  # noqa: F403
 from app.modules.tasks.models import *  # noqa: F403
+from app.modules.templates.models import *  # noqa: F403
 from app.modules.user_sessions.models import *  # noqa: F403
 from app.modules.users.models import *  # noqa: F403
 
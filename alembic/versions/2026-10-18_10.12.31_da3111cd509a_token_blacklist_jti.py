@@ -0,0 +1,69 @@
+"""token_blacklist_jti
+
+Revision ID: da3111cd509a
+Revises: b57374c32b69
+Create Date: 2026-10-18 10:12:31.402118
+
+"""
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "da3111cd509a"
+down_revision = "b57374c32b69"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("user_token_blacklist", sa.Column("jti", sa.String(), nullable=True))
+    op.add_column("user_token_blacklist", sa.Column("expires_at", sa.DateTime(), nullable=True))
+    # Legacy rows have no jti, they are keyed by the token digest (see jwt_utils.get_token_id)
+    # and kept for a day, which outlives any access token issued before this migration
+    op.execute(
+        """
+        UPDATE user_token_blacklist
+        SET jti = encode(sha256(convert_to(access_token, 'UTF8')), 'hex'),
+            expires_at = (now() AT TIME ZONE 'utc') + interval '1 day'
+        """
+    )
+    op.execute(
+        """
+        DELETE FROM user_token_blacklist a
+        USING user_token_blacklist b
+        WHERE a.jti = b.jti AND a.id > b.id
+        """
+    )
+    op.alter_column("user_token_blacklist", "jti", nullable=False)
+    op.alter_column("user_token_blacklist", "expires_at", nullable=False)
+    op.drop_column("user_token_blacklist", "access_token")
+    op.create_index(
+        op.f("ix_user_token_blacklist_jti"), "user_token_blacklist", ["jti"], unique=True
+    )
+    op.create_index(
+        op.f("ix_user_token_blacklist_expires_at"),
+        "user_token_blacklist",
+        ["expires_at"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("ix_user_token_blacklist_created_at"),
+        "user_token_blacklist",
+        ["created_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_user_token_blacklist_created_at"), table_name="user_token_blacklist")
+    op.drop_index(op.f("ix_user_token_blacklist_expires_at"), table_name="user_token_blacklist")
+    op.drop_index(op.f("ix_user_token_blacklist_jti"), table_name="user_token_blacklist")
+    # Original tokens can't be restored from their ids
+    op.execute("DELETE FROM user_token_blacklist")
+    op.add_column(
+        "user_token_blacklist",
+        sa.Column("access_token", sa.VARCHAR(), autoincrement=False, nullable=False),
+    )
+    op.drop_column("user_token_blacklist", "expires_at")
+    op.drop_column("user_token_blacklist", "jti")
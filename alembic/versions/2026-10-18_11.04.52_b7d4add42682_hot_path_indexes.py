@@ -0,0 +1,40 @@
+"""hot_path_indexes
+
+Revision ID: b7d4add42682
+Revises: da3111cd509a
+Create Date: 2026-10-18 11:04:52.118730
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "b7d4add42682"
+down_revision = "da3111cd509a"
+branch_labels = None
+depends_on = None
+
+# (index name, table, columns)
+INDEXES = (
+    ("ix_calendars_user_id_scheduled", "calendars", ["user_id", "scheduled"]),
+    ("ix_tasks_calendar_id", "tasks", ["calendar_id"]),
+    ("ix_logs_user_id_created_at", "logs", ["user_id", "created_at"]),
+    ("ix_notifications_user_id_created_at", "notifications", ["user_id", "created_at"]),
+    ("ix_messages_chat_id_created_at", "messages", ["chat_id", "created_at"]),
+    ("ix_user_session_user_id_end_at", "user_session", ["user_id", "end_at"]),
+    ("ix_user_fingerprint_user_id_updated_at", "user_fingerprint", ["user_id", "updated_at"]),
+    ("ix_invites_email", "invites", ["email"]),
+    ("ix_users_trainer_id", "users", ["trainer_id"]),
+)
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY can't run inside a transaction block
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, unique=False, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
@@ -0,0 +1,78 @@
+"""calendar_templates
+
+Revision ID: 3aedd957c3ac
+Revises: b7d4add42682
+Create Date: 2026-10-18 12:21:07.530164
+
+"""
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "3aedd957c3ac"
+down_revision = "b7d4add42682"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "calendar_templates",
+        sa.Column("id", sa.Uuid(), server_default=sa.text("gen_random_uuid()"), nullable=False),
+        sa.Column("user_id", sa.Uuid(), nullable=False),
+        sa.Column("assigner_id", sa.Uuid(), nullable=True),
+        sa.Column("title", sa.String(), nullable=True),
+        sa.Column(
+            "type",
+            postgresql.ENUM("FOOD", "EXERCISE", name="calendartype", create_type=False),
+            nullable=False,
+        ),
+        sa.Column("dtstart", sa.DateTime(), nullable=False),
+        sa.Column("rrule", sa.String(), nullable=False),
+        sa.Column("until", sa.DateTime(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), server_default=sa.text("now()"), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], onupdate="CASCADE", ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_calendar_templates_user_id_until",
+        "calendar_templates",
+        ["user_id", "until"],
+        unique=False,
+    )
+    op.create_table(
+        "template_tasks",
+        sa.Column("id", sa.Uuid(), server_default=sa.text("gen_random_uuid()"), nullable=False),
+        sa.Column("template_id", sa.Uuid(), nullable=False),
+        sa.Column("position", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("amount", sa.Integer(), nullable=True),
+        sa.Column("unit", sa.String(), nullable=True),
+        sa.ForeignKeyConstraint(
+            ["template_id"], ["calendar_templates.id"], onupdate="CASCADE", ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        op.f("ix_template_tasks_template_id"), "template_tasks", ["template_id"], unique=False
+    )
+    op.create_table(
+        "template_task_completions",
+        sa.Column("template_task_id", sa.Uuid(), nullable=False),
+        sa.Column("occurrence", sa.DateTime(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), server_default=sa.text("now()"), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["template_task_id"], ["template_tasks.id"], onupdate="CASCADE", ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("template_task_id", "occurrence"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("template_task_completions")
+    op.drop_index(op.f("ix_template_tasks_template_id"), table_name="template_tasks")
+    op.drop_table("template_tasks")
+    op.drop_index("ix_calendar_templates_user_id_until", table_name="calendar_templates")
+    op.drop_table("calendar_templates")
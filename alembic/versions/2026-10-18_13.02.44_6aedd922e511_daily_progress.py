@@ -0,0 +1,48 @@
+"""daily_progress
+
+Revision ID: 6aedd922e511
+Revises: 3aedd957c3ac
+Create Date: 2026-10-18 13:02:44.071925
+
+"""
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "6aedd922e511"
+down_revision = "3aedd957c3ac"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "daily_progress",
+        sa.Column("user_id", sa.Uuid(), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column(
+            "type",
+            postgresql.ENUM("FOOD", "EXERCISE", name="calendartype", create_type=False),
+            nullable=False,
+        ),
+        sa.Column("total", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("done", sa.Integer(), server_default="0", nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], onupdate="CASCADE", ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("user_id", "day", "type"),
+    )
+    op.execute(
+        """
+        INSERT INTO daily_progress (user_id, day, type, total, done)
+        SELECT c.user_id, c.scheduled::date, c.type,
+               count(t.id), count(t.id) FILTER (WHERE t.completed)
+        FROM calendars c
+        JOIN tasks t ON t.calendar_id = c.id
+        GROUP BY c.user_id, c.scheduled::date, c.type
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("daily_progress")
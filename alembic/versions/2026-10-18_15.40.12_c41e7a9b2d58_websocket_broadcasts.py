@@ -0,0 +1,30 @@
+"""websocket_broadcasts
+
+Revision ID: c41e7a9b2d58
+Revises: 6aedd922e511
+Create Date: 2026-10-18 15:40:12.384519
+
+"""
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "c41e7a9b2d58"
+down_revision = "6aedd922e511"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "websocket_broadcasts",
+        sa.Column("id", sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column("payload", sa.String(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), server_default=sa.text("now()"), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("websocket_broadcasts")
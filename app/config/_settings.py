@@ -1,5 +1,5 @@
 from pathlib import Path
-from typing import Optional
+from typing import Literal, Optional
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -25,6 +25,39 @@ class Settings(BaseSettings):
 
     MAX_CONTENT_LENGTH: int = 100 * 1024 * 1024  # 100MB
 
+    # settings auth
+    AUTH_CACHE_MAXSIZE: int = 10_000
+    # Upper bound on how long other workers authenticate with a changed user's old row
+    AUTH_CACHE_TTL_SECONDS: int = 10
+    JWT_DECODE_CACHE_MAXSIZE: int = 10_000
+    TOKEN_REVOCATION_REFRESH_SECONDS: int = 5
+    TOKEN_REVOCATION_PRUNE_SECONDS: int = 60 * 60
+    PASSWORD_HASHING_WORKERS: int = 4
+    PASSWORD_HASHING_QUEUE_LIMIT: int = 32
+
+    # settings websocket
+    # memory: broadcasts reach this worker only, postgres: LISTEN/NOTIFY across workers
+    WEBSOCKET_BACKPLANE: Literal["memory", "postgres"] = "memory"
+    WEBSOCKET_BACKPLANE_CHANNEL: str = "websocket_broadcast"
+    # Outbound messages buffered per connection, newer ones are dropped when it's full
+    WEBSOCKET_SEND_QUEUE_SIZE: int = 100
+    # A client whose queue stays full this long is disconnected
+    WEBSOCKET_SLOW_CONSUMER_SECONDS: float = 10
+    # Session state changes within this window are written to the database once
+    WEBSOCKET_STATE_FLUSH_SECONDS: float = 2
+
+    # settings calendar
+    CALENDAR_RANGE_MAX_DAYS: int = 62
+    # Days covered by adherence and overdue counts of the trainer dashboard, today included
+    TRAINER_DASHBOARD_WINDOW_DAYS: int = 7
+    TRAINER_DASHBOARD_CACHE_MAXSIZE: int = 1_000
+    # How long other workers may serve a dashboard that predates a client's change
+    TRAINER_DASHBOARD_CACHE_TTL_SECONDS: int = 60
+    # Largest COUNT of a template recurrence rule
+    TEMPLATE_MAX_COUNT: int = 1_000
+    # Occurrences expanded for one read, the rest of the range is left out
+    TEMPLATE_MAX_OCCURRENCES: int = 5_000
+
     # settings db
     POSTGRES_HOST: str
     POSTGRES_USER: str
@@ -32,6 +65,35 @@ class Settings(BaseSettings):
     POSTGRES_DB: str
     POSTGRES_PORT: str
 
+    DB_POOL_SIZE: int = 50
+    DB_POOL_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30
+    DB_POOL_RECYCLE: int = 300
+    # checkout: ping on every checkout, background: ping idle connections
+    # every DB_POOL_LIVENESS_CHECK_SECONDS, none: no liveness checks
+    DB_POOL_PRE_PING: Literal["checkout", "background", "none"] = "checkout"
+    DB_POOL_LIVENESS_CHECK_SECONDS: int = 30
+    # Connections opened at startup so the first requests after a deploy don't pay for it
+    DB_POOL_WARMUP_CONNECTIONS: int = 0
+
+    # Only users with this role may read /api/metrics/
+    METRICS_ROLE: str = "admin"
+
+    # Statements slower than this are logged as warnings
+    SQL_SLOW_QUERY_MS: int = 200
+    # Warn when a request runs the same statement this many times (N+1)
+    SQL_REPEATED_STATEMENT_THRESHOLD: int = 5
+    # Share of the remaining statements that are logged, 0 disables it
+    SQL_LOG_SAMPLE_RATE: float = 0.0
+
+    # Optional streaming replica, same credentials and database as the primary
+    POSTGRES_REPLICA_HOST: Optional[str] = None
+    POSTGRES_REPLICA_PORT: Optional[str] = None
+    # Reads of a user who has just written go to the primary for this long. The worker that
+    # took the write remembers it; other workers rely on the signed db_primary_pin cookie,
+    # so API clients that drop cookies may read from the replica there
+    READ_YOUR_WRITES_SECONDS: int = 5
+
     POSTGRES_TEST_HOST: Optional[str] = None
     POSTGRES_TEST_USER: Optional[str] = None
     POSTGRES_TEST_PASSWORD: Optional[str] = None
@@ -42,6 +104,13 @@ class Settings(BaseSettings):
     def DATABASE_URL(self) -> str:  # noqa: N802
         return f"postgresql+asyncpg://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{self.POSTGRES_HOST}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
 
+    @property
+    def DATABASE_REPLICA_URL(self) -> Optional[str]:  # noqa: N802
+        if not self.POSTGRES_REPLICA_HOST:
+            return None
+        port = self.POSTGRES_REPLICA_PORT or self.POSTGRES_PORT
+        return f"postgresql+asyncpg://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{self.POSTGRES_REPLICA_HOST}:{port}/{self.POSTGRES_DB}"
+
     @property
     def DATABASE_TEST_URL(self) -> str:  # noqa: N802
         return f"postgresql+asyncpg://{self.POSTGRES_TEST_USER}:{self.POSTGRES_TEST_PASSWORD}@{self.POSTGRES_TEST_HOST}:{self.POSTGRES_TEST_PORT}/{self.POSTGRES_TEST_DB}"
@@ -0,0 +1,91 @@
+import time
+from typing import Any, Dict, List, Sequence
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool
+
+CHECKOUT_WAIT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000)
+
+
+class Histogram:
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(buckets)
+        self.counts: List[int] = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, value: float):
+        self.count += 1
+        self.total += value
+        for index, bucket in enumerate(self.buckets):
+            if value <= bucket:
+                self.counts[index] += 1
+                return
+        self.counts[-1] += 1
+
+    def as_dict(self) -> Dict[str, Any]:
+        buckets = {f"le_{bucket}": count for bucket, count in zip(self.buckets, self.counts)}
+        buckets["le_inf"] = self.counts[-1]
+        return {"count": self.count, "sum": self.total, "buckets": buckets}
+
+
+class PoolMetrics:
+    def __init__(self):
+        self.checkouts = 0
+        self.invalidations = 0
+        self.requests = 0
+        self.requests_with_session = 0
+        self.checkout_wait_ms = Histogram(CHECKOUT_WAIT_BUCKETS_MS)
+        self._pools: Dict[str, Pool] = {}
+
+    def on_checkout(self, *_args):
+        self.checkouts += 1
+
+    def on_invalidate(self, *_args):
+        self.invalidations += 1
+
+    @property
+    def checkouts_per_request(self) -> float:
+        if not self.requests:
+            return 0.0
+        return self.checkouts / self.requests
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "checkouts": self.checkouts,
+            "invalidations": self.invalidations,
+            "requests": self.requests,
+            "requests_with_session": self.requests_with_session,
+            "checkouts_per_request": self.checkouts_per_request,
+            "checkout_wait_ms": self.checkout_wait_ms.as_dict(),
+            "pools": {
+                name: {
+                    "size": pool.size(),
+                    "checked_in": pool.checkedin(),
+                    "checked_out": pool.checkedout(),
+                    "overflow": pool.overflow(),
+                }
+                for name, pool in self._pools.items()
+            },
+        }
+
+
+pool_metrics = PoolMetrics()
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            pool_metrics.checkout_wait_ms.observe((time.perf_counter() - started) * 1000)
+
+
+def register_pool_metrics(engine: AsyncEngine, name: str):
+    pool = engine.sync_engine.pool
+    pool_metrics._pools[name] = pool
+    event.listen(pool, "checkout", pool_metrics.on_checkout)
+    event.listen(pool, "invalidate", pool_metrics.on_invalidate)
+    event.listen(pool, "soft_invalidate", pool_metrics.on_invalidate)
@@ -0,0 +1,40 @@
+import asyncio
+from contextlib import AsyncExitStack
+from typing import Iterable
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.utils.logging import logger
+
+
+async def _open_connection(stack: AsyncExitStack, engine: AsyncEngine):
+    connection = await stack.enter_async_context(engine.connect())
+    await connection.execute(text("SELECT 1"))
+
+
+async def warm_up_pool(engine: AsyncEngine, connections: int):
+    # All connections are held at once, otherwise the pool would hand out the same one
+    connections = min(connections, engine.sync_engine.pool.size())
+    async with AsyncExitStack() as stack:
+        await asyncio.gather(*(_open_connection(stack, engine) for _ in range(connections)))
+
+
+async def check_pool_liveness(engine: AsyncEngine):
+    # The queue is FIFO, so sequential checkouts walk through every idle connection.
+    # A dead one raises a disconnect error, which invalidates the whole pool.
+    for _ in range(engine.sync_engine.pool.checkedin()):
+        async with engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+
+
+async def run_pool_liveness_checks(engines: Iterable[AsyncEngine], interval: float):
+    engines = list(engines)
+    while True:
+        await asyncio.sleep(interval)
+        results = await asyncio.gather(
+            *(check_pool_liveness(engine) for engine in engines), return_exceptions=True
+        )
+        for engine, result in zip(engines, results):
+            if isinstance(result, Exception):
+                logger.warning("Pool liveness check failed for %s", engine.url, exc_info=result)
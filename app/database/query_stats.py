@@ -0,0 +1,66 @@
+import random
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.config import settings
+from app.utils.logging import logger
+
+SLOWEST_STATEMENTS_KEPT = 3
+
+
+class QueryStats:
+    """Statements executed while handling a single request."""
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.slowest: List[Tuple[float, str]] = []
+        self.statements: Counter = Counter()
+
+    def record(self, statement: str, duration_ms: float):
+        self.count += 1
+        self.total_ms += duration_ms
+        # Bound parameters are not part of the statement, so equal strings share a shape
+        self.statements[statement] += 1
+        self.slowest.append((duration_ms, statement))
+        self.slowest.sort(reverse=True)
+        del self.slowest[SLOWEST_STATEMENTS_KEPT:]
+
+    def repeated_statements(self, threshold: int) -> Dict[str, int]:
+        return {
+            statement: count for statement, count in self.statements.items() if count >= threshold
+        }
+
+    def server_timing(self) -> str:
+        return f'db;dur={self.total_ms:.2f};desc="{self.count} queries"'
+
+
+current_query_stats: ContextVar[Optional[QueryStats]] = ContextVar(
+    "current_query_stats", default=None
+)
+
+
+def _before_cursor_execute(_conn, _cursor, _statement, _parameters, context, _executemany):
+    context._query_started = time.perf_counter()
+
+
+def _after_cursor_execute(_conn, _cursor, statement, _parameters, context, _executemany):
+    duration_ms = (time.perf_counter() - context._query_started) * 1000
+    stats = current_query_stats.get()
+    if stats is not None:
+        stats.record(statement, duration_ms)
+
+    if duration_ms >= settings.SQL_SLOW_QUERY_MS:
+        logger.warning("slow_query duration_ms=%.2f statement=%s", duration_ms, statement)
+    elif settings.SQL_LOG_SAMPLE_RATE and random.random() < settings.SQL_LOG_SAMPLE_RATE:
+        logger.info("query duration_ms=%.2f statement=%s", duration_ms, statement)
+
+
+def register_query_stats(engine: AsyncEngine):
+    event.listen(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
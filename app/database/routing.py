@@ -0,0 +1,90 @@
+import hashlib
+import hmac
+import time
+import uuid
+from typing import Callable, Dict, TypeVar
+
+from starlette.datastructures import Headers
+from starlette.requests import cookie_parser
+from starlette.types import Scope
+
+from app.config import settings
+
+READ_ONLY_METHODS = frozenset(("GET", "HEAD", "OPTIONS"))
+
+# Signed "<user id>:<unix time>" of a user's last write, so reads that land on
+# another worker are pinned to the primary as well
+PRIMARY_PIN_COOKIE = "db_primary_pin"
+
+# Past this many users, writes older than the window are dropped
+_MAX_RECENT_WRITERS = 10_000
+
+F = TypeVar("F", bound=Callable)
+
+
+def read_only(endpoint: F) -> F:
+    # For non-GET endpoints that only read, e.g. filters sent as a POST body
+    endpoint.__db_read_only__ = True  # type: ignore
+    return endpoint
+
+
+def read_write(endpoint: F) -> F:
+    # For GET endpoints that write
+    endpoint.__db_read_only__ = False  # type: ignore
+    return endpoint
+
+
+def is_read_only_request(scope: Scope) -> bool:
+    route = scope.get("route")
+    marker = getattr(getattr(route, "endpoint", None), "__db_read_only__", None)
+    if marker is not None:
+        return marker
+    return scope.get("method") in READ_ONLY_METHODS
+
+
+class RecentWriters:
+    def __init__(self, window: float):
+        self.window = window
+        self._writes: Dict[uuid.UUID, float] = {}
+
+    def mark(self, user_id: uuid.UUID):
+        now = time.monotonic()
+        self._writes[user_id] = now
+        if len(self._writes) > _MAX_RECENT_WRITERS:
+            self._writes = {
+                key: written for key, written in self._writes.items() if now - written < self.window
+            }
+
+    def wrote_recently(self, user_id: uuid.UUID) -> bool:
+        written = self._writes.get(user_id)
+        return written is not None and time.monotonic() - written < self.window
+
+
+recent_writers = RecentWriters(window=settings.READ_YOUR_WRITES_SECONDS)
+
+
+def _sign(value: str) -> str:
+    return hmac.new(settings.SECRET_KEY.encode(), value.encode(), hashlib.sha256).hexdigest()
+
+
+def primary_pin_cookie(user_id: uuid.UUID) -> str:
+    value = f"{user_id}:{int(time.time())}"
+    return (
+        f"{PRIMARY_PIN_COOKIE}={value}:{_sign(value)}; "
+        f"Max-Age={settings.READ_YOUR_WRITES_SECONDS}; Path=/; HttpOnly; SameSite=Lax"
+    )
+
+
+def has_primary_pin(scope: Scope, user_id: uuid.UUID) -> bool:
+    cookie = Headers(scope=scope).get("cookie")
+    if not cookie:
+        return False
+    pin = cookie_parser(cookie).get(PRIMARY_PIN_COOKIE, "")
+    value, _, signature = pin.rpartition(":")
+    pinned_user_id, _, written_at = value.partition(":")
+    if not hmac.compare_digest(signature, _sign(value)) or pinned_user_id != str(user_id):
+        return False
+    try:
+        return time.time() - int(written_at) < settings.READ_YOUR_WRITES_SECONDS
+    except ValueError:
+        return False
@@ -1,17 +1,53 @@
 from typing import ClassVar, Optional
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
-from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.orm import DeclarativeBase, ORMExecuteState
+from sqlalchemy.orm import Session as SyncSession
+from starlette.types import Scope
 
 from app.config import settings
+from app.database.metrics import (
+    InstrumentedAsyncQueuePool,
+    pool_metrics,
+    register_pool_metrics,
+)
+from app.database.query_stats import register_query_stats
+from app.database.routing import (
+    has_primary_pin,
+    is_read_only_request,
+    primary_pin_cookie,
+    recent_writers,
+)
+
+
+def _create_engine(url: str) -> AsyncEngine:
+    engine = create_async_engine(
+        url,
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_POOL_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING == "checkout",
+    )
+    register_query_stats(engine)
+    return engine
 
-async_engine = create_async_engine(
-    settings.DATABASE_URL,
-    pool_size=50,
-    pool_pre_ping=True,
-    pool_recycle=300,
-    echo=settings.LOGLEVEL == "DEBUG",
+
+async_engine = _create_engine(settings.DATABASE_URL)
+register_pool_metrics(async_engine, "primary")
+
+replica_engine = (
+    _create_engine(settings.DATABASE_REPLICA_URL) if settings.DATABASE_REPLICA_URL else None
 )
+if replica_engine is not None:
+    register_pool_metrics(replica_engine, "replica")
 
 AsyncSessionMaker = async_sessionmaker(
     async_engine,
@@ -19,11 +55,23 @@ AsyncSessionMaker = async_sessionmaker(
     expire_on_commit=False,
 )
 
+# Falls back to the primary when no replica is configured, still in READ ONLY transactions
+ReadOnlySessionMaker = async_sessionmaker(
+    (replica_engine or async_engine).execution_options(postgresql_readonly=True),
+    autoflush=False,
+    expire_on_commit=False,
+)
+
 
 class SessionManager:
-    def __init__(self, session: Optional[AsyncSession] = None):
-        self.session = session or AsyncSessionMaker()
-        self.autoclose = session is None
+    def __init__(self, session: Optional[AsyncSession] = None, read_only: bool = False):
+        self.read_only = read_only
+        if session is None:
+            session = ReadOnlySessionMaker() if read_only else AsyncSessionMaker()
+            self.autoclose = True
+        else:
+            self.autoclose = False
+        self.session = session
 
     async def __aenter__(self) -> AsyncSession:
         return self.session
@@ -31,12 +79,97 @@ class SessionManager:
     async def __aexit__(self, exc_type, exc, tb):
         if exc_type is not None:
             await self.session.rollback()
-        else:
+        elif not self.read_only:
             await self.session.commit()
 
         if self.autoclose:
             await self.session.close()
 
 
+@event.listens_for(SyncSession, "after_flush")
+def _mark_flushed(session: SyncSession, _flush_context):
+    session.info["has_writes"] = True
+
+
+@event.listens_for(SyncSession, "do_orm_execute")
+def _mark_dml_executed(orm_execute_state: ORMExecuteState):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info["has_writes"] = True
+
+
+def mark_session_has_writes(session: AsyncSession):
+    """For writes the ORM can't see, e.g. data-modifying CTEs inside a SELECT."""
+    session.info["has_writes"] = True
+
+
+def session_has_writes(session: AsyncSession) -> bool:
+    return bool(
+        session.info.get("has_writes") or session.new or session.dirty or session.deleted
+    )
+
+
+def _get_user_id(scope: Scope):
+    return getattr(scope.get("user"), "id", None)
+
+
+class LazySession:
+    """Request-scoped session that is only created when something asks for it.
+
+    Read-only requests get a replica session in a READ ONLY transaction, unless
+    the current user has just written something. A commit with writes sets
+    ``pin_cookie``, which carries that to the user's next requests on any worker.
+    """
+
+    def __init__(self, scope: Scope):
+        self.scope = scope
+        self.session: Optional[AsyncSession] = None
+        self.read_only = False
+        self.pin_cookie: Optional[str] = None
+
+    def _wants_read_only(self) -> bool:
+        if not is_read_only_request(self.scope):
+            return False
+        user_id = _get_user_id(self.scope)
+        return not (
+            user_id
+            and (recent_writers.wrote_recently(user_id) or has_primary_pin(self.scope, user_id))
+        )
+
+    async def get(self) -> AsyncSession:
+        read_only = self._wants_read_only()
+        if self.session is None:
+            pool_metrics.requests_with_session += 1
+        elif self.read_only and not read_only:
+            # Authentication runs before routing, the matched route may turn out to write
+            await self.session.close()
+        else:
+            return self.session
+        self.read_only = read_only
+        self.session = ReadOnlySessionMaker() if read_only else AsyncSessionMaker()
+        return self.session
+
+    async def commit(self):
+        if self.session is None:
+            return
+        if self.read_only or not session_has_writes(self.session):
+            # Nothing to commit, but the transaction still holds a pooled connection
+            await self.close()
+            return
+        await self.session.commit()
+        user_id = _get_user_id(self.scope)
+        if user_id:
+            recent_writers.mark(user_id)
+            self.pin_cookie = primary_pin_cookie(user_id)
+
+    async def rollback(self):
+        if self.session is not None:
+            await self.session.rollback()
+
+    async def close(self):
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+
 class Base(DeclarativeBase):
     __mapper_args__: ClassVar = {"eager_defaults": True}
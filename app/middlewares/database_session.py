@@ -1,6 +1,8 @@
+from starlette.datastructures import MutableHeaders
 from starlette.types import ASGIApp, Receive, Scope, Send
 
-from app.database.session import AsyncSessionMaker
+from app.database.metrics import pool_metrics
+from app.database.session import LazySession
 
 
 class DBSessionMiddleware:
@@ -12,30 +14,28 @@ class DBSessionMiddleware:
             await self.app(scope, receive, send)
             return
 
-        async def send_wrapper(message):
-            session = scope.get("db_session")
-            if not session:
-                await send(message)
-                return
+        db_session = LazySession(scope)
+        scope["db_session"] = db_session
 
+        async def send_wrapper(message):
             if message.get("type") == "http.response.start":
                 if message["status"] // 200 != 1:
-                    await session.rollback()
+                    await db_session.rollback()
                 else:
-                    await session.commit()
+                    await db_session.commit()
+                    if db_session.pin_cookie is not None:
+                        MutableHeaders(scope=message).append("set-cookie", db_session.pin_cookie)
 
             await send(message)
-            return
 
+        pool_metrics.requests += 1
         try:
-            async with AsyncSessionMaker() as session:
-                scope["db_session"] = session
-                await self.app(scope, receive, send_wrapper)
+            await self.app(scope, receive, send_wrapper)
         except Exception:
-            session = scope.get("db_session")
-            if session:
-                await session.rollback()
+            await db_session.rollback()
             raise
+        finally:
+            await db_session.close()
 
 
 class WebSocketDBSessionMiddleware:
@@ -43,16 +43,26 @@ class WebSocketDBSessionMiddleware:
         self.app = app
 
     async def __call__(self, scope: Scope, receive: Receive, send: Send):
-        async with AsyncSessionMaker() as session:
-            try:
-                scope["db_session"] = session
-                await self.app(scope, receive, send)
-            except Exception:
-                session = scope.get("db_session")
-                if session:
-                    await session.rollback()
-                raise
-            await session.commit()
+        db_session = LazySession(scope)
+        scope["db_session"] = db_session
+
+        # The session only serves the handshake (authentication), it is released once
+        # the socket is accepted or refused; handlers open one per inbound message
+        async def send_wrapper(message):
+            if message.get("type") in ("websocket.accept", "websocket.close"):
+                await db_session.commit()
+                await db_session.close()
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception:
+            await db_session.rollback()
+            raise
+        else:
+            await db_session.commit()
+        finally:
+            await db_session.close()
 
 
 class UniversalDBSessionMiddleware:
@@ -6,9 +6,10 @@ from starlette.authentication import (
     AuthenticationError,
 )
 
-from app.database.session import SessionManager
-from app.modules.users.models import TokenBlacklist, User
-from app.utils.jwt_utils import decode_access_token
+from app.modules.users.models import User
+from app.utils.auth_cache import auth_user_cache
+from app.utils.jwt_utils import decode_token_claims, get_token_id
+from app.utils.token_revocation import token_revocation_store
 
 
 class CodeAuthenticationError(AuthenticationError):
@@ -36,21 +37,22 @@ class OAuth2Backend(AuthenticationBackend):
         if scheme.lower() != "bearer":
             msg = "Invalid authentication scheme"
             raise CodeAuthenticationError(msg, code=401)
-        email = decode_access_token(token)
-        if not email:
+        claims = decode_token_claims(token)
+        if not claims or not claims.get("sub"):
             msg = "Invalid access token"
             raise CodeAuthenticationError(msg, code=401)
-        async with SessionManager() as session:
-            token_blacklist = await TokenBlacklist.is_token_blacklisted(
-                session=session,
-                token=token,
-            )
-            if token_blacklist is True:
-                msg = "Access token has been revoked"
-                raise CodeAuthenticationError(msg, code=401)
-            user = await User.get_user_by_email(session, email)
-            if user is None:
-                msg = "User not found"
-                raise CodeAuthenticationError(msg, code=401)
+        if token_revocation_store.is_revoked(get_token_id(token, claims)):
+            msg = "Access token has been revoked"
+            raise CodeAuthenticationError(msg, code=401)
+        user = auth_user_cache.get(token)
+        if user is not None:
+            request.state.user = user
+            return AuthCredentials(["authenticated"]), user
+        # UniversalDBSessionMiddleware wraps authentication, so the handler's session is reused
+        user = await User.get_user_by_email(await request.scope["db_session"].get(), claims["sub"])
+        if user is None:
+            msg = "User not found"
+            raise CodeAuthenticationError(msg, code=401)
+        auth_user_cache.set(token, user)
         request.state.user = user
         return AuthCredentials(["authenticated"]), user
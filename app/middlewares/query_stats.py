@@ -0,0 +1,50 @@
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.config import settings
+from app.database.query_stats import QueryStats, current_query_stats
+from app.utils.logging import logger
+
+
+class QueryStatsMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = current_query_stats.set(stats)
+
+        async def send_wrapper(message):
+            if message.get("type") == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", stats.server_timing())
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            current_query_stats.reset(token)
+            self.log_stats(scope, stats)
+
+    @staticmethod
+    def log_stats(scope: Scope, stats: QueryStats):
+        if not stats.count:
+            return
+        path = scope["path"]
+        logger.info(
+            "request_queries method=%s path=%s count=%d total_ms=%.2f slowest=%s",
+            scope["method"],
+            path,
+            stats.count,
+            stats.total_ms,
+            [round(duration_ms, 2) for duration_ms, _ in stats.slowest],
+        )
+        repeated = stats.repeated_statements(settings.SQL_REPEATED_STATEMENT_THRESHOLD)
+        for statement, count in repeated.items():
+            logger.warning(
+                "repeated_statement path=%s count=%d statement=%s", path, count, statement
+            )
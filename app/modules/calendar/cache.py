@@ -0,0 +1,78 @@
+import uuid
+from typing import Any, Dict, Hashable, Optional, Set, Tuple
+
+from cachetools import TTLCache
+
+from app.config import settings
+
+
+class TrainerDashboardCache:
+    """Per-worker TTL cache of trainer dashboards.
+
+    A client→trainer index is filled from every cached dashboard, so a task
+    change of a client drops the dashboards of that client's trainer only.
+    That happens on the worker that wrote the change, the other workers serve
+    their copy until it expires, at most ``TRAINER_DASHBOARD_CACHE_TTL_SECONDS``.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._dashboards: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._keys_by_trainer: Dict[uuid.UUID, Set[Tuple[Hashable, ...]]] = {}
+        self._trainer_by_client: Dict[uuid.UUID, uuid.UUID] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, trainer_id: uuid.UUID, params: Tuple[Hashable, ...]) -> Optional[Any]:
+        dashboard = self._dashboards.get((trainer_id, *params))
+        if dashboard is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return dashboard
+
+    def set(
+            self,
+            trainer_id: uuid.UUID,
+            params: Tuple[Hashable, ...],
+            dashboard: Any,
+            client_ids: Set[uuid.UUID],
+    ):
+        key = (trainer_id, *params)
+        self._dashboards[key] = dashboard
+        keys = {
+            cached_key
+            for cached_key in self._keys_by_trainer.get(trainer_id, set())
+            if cached_key in self._dashboards
+        }
+        keys.add(key)
+        self._keys_by_trainer[trainer_id] = keys
+        for client_id in client_ids:
+            self._trainer_by_client[client_id] = trainer_id
+
+    def invalidate_trainer(self, trainer_id: uuid.UUID):
+        for key in self._keys_by_trainer.pop(trainer_id, set()):
+            self._dashboards.pop(key, None)
+
+    def invalidate_client(self, client_id: uuid.UUID):
+        trainer_id = self._trainer_by_client.get(client_id)
+        if trainer_id is not None:
+            self.invalidate_trainer(trainer_id)
+
+    def clear(self):
+        self._dashboards.clear()
+        self._keys_by_trainer.clear()
+        self._trainer_by_client.clear()
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        return {
+            "size": len(self._dashboards),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+trainer_dashboard_cache = TrainerDashboardCache(
+    maxsize=settings.TRAINER_DASHBOARD_CACHE_MAXSIZE,
+    ttl=settings.TRAINER_DASHBOARD_CACHE_TTL_SECONDS,
+)
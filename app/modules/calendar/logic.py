@@ -1,66 +1,322 @@
 import uuid
+from collections import defaultdict, deque
+from datetime import date, datetime, time, timedelta, timezone
+from typing import AsyncIterator, Dict, List, Optional, Tuple
 
-from sqlalchemy import Date, and_, cast, delete, select
+from sqlalchemy import (
+    Date,
+    Interval,
+    Select,
+    Uuid,
+    and_,
+    cast,
+    delete,
+    false,
+    func,
+    literal,
+    literal_column,
+    select,
+    true,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, insert
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm.strategy_options import joinedload
+from sqlalchemy.orm import aliased, with_expression
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.orm.strategy_options import joinedload, selectinload
+from zoneinfo import ZoneInfo
 
+from app.config import settings
+from app.database.session import SessionManager, mark_session_has_writes
+from app.modules.calendar.cache import trainer_dashboard_cache
 from app.modules.calendar.models import Calendar, CalendarType
-from app.modules.calendar.schemas import CalendarFilter, CalendarIn
+from app.modules.calendar.schemas import (
+    CalendarCopyIn,
+    CalendarCopyOut,
+    CalendarDay,
+    CalendarFilter,
+    CalendarIn,
+    CalendarOut,
+    CalendarPlanIn,
+    CalendarRangeFilter,
+    TrainerClientSummary,
+    TrainerDashboard,
+)
+from app.modules.progress.logic import ProgressDeltas
+from app.modules.progress.models import DailyProgress
+from app.modules.tasks.models import Task
+from app.modules.templates.logic import expand_occurrences
+from app.modules.templates.models import CalendarTemplate
 from app.modules.users.models import User
 
+# Calendars per fetch of the range stream, tasks are selectin-loaded per batch
+RANGE_YIELD_PER = 100
 
-async def get_calendar(session: AsyncSession, data: CalendarFilter):
-    calendars_instances = await session.scalars(
-        select(Calendar)
-        .where(
+
+def get_day_bounds(day: date, tz_name: Optional[str] = None) -> Tuple[datetime, datetime]:
+    """Half-open [start, end) range of `scheduled` values that fall on `day`.
+
+    `scheduled` is stored as naive UTC (see `to_naive_utc`), the day is the
+    local day in `tz_name`, or the UTC day without a timezone.
+    """
+    start = datetime.combine(day, time.min)
+    end = datetime.combine(day + timedelta(days=1), time.min)
+    if tz_name is None:
+        return start, end
+    tz = ZoneInfo(tz_name)
+    return tuple(  # type: ignore
+        bound.replace(tzinfo=tz).astimezone(timezone.utc).replace(tzinfo=None)
+        for bound in (start, end)
+    )
+
+
+def with_completion(statement: Select) -> Select:
+    """Populate complete, tasks_total and tasks_done from correlated task aggregates."""
+
+    def aggregate(column):
+        return (
+            select(column)
+            .where(Task.calendar_id == Calendar.id)
+            .correlate(Calendar)
+            .scalar_subquery()
+        )
+
+    return statement.options(
+        with_expression(
+            Calendar.complete,
+            aggregate(func.coalesce(func.bool_and(Task.completed), true())),
+        ),
+        with_expression(Calendar.tasks_total, aggregate(func.count(Task.id))),
+        with_expression(
+            Calendar.tasks_done,
+            aggregate(func.count(Task.id).filter(Task.completed)),
+        ),
+    )
+
+
+async def _get_calendars(session: AsyncSession, statement: Select, with_tasks: bool):
+    statement = with_completion(statement.order_by(Calendar.scheduled)).options(
+        joinedload(Calendar.user),
+        joinedload(Calendar.assigner),
+    )
+    if with_tasks:
+        statement = statement.options(joinedload(Calendar.tasks))
+    calendars_instances = await session.scalars(statement)
+    return list(calendars_instances.unique())
+
+
+def _merge_by_scheduled(calendars: List[Calendar], occurrences: List[Calendar]):
+    if not occurrences:
+        return calendars
+    return sorted(calendars + occurrences, key=lambda calendar: calendar.scheduled)
+
+
+async def get_calendar(session: AsyncSession, data: CalendarFilter, with_tasks: bool = True):
+    day_start, day_end = get_day_bounds(data.scheduled, data.timezone)
+    occurrences = await expand_occurrences(
+        session,
+        day_start,
+        day_end,
+        CalendarTemplate.user_id == data.user_id,
+    )
+    calendars = await _get_calendars(
+        session,
+        select(Calendar).where(
             and_(
                 Calendar.user_id == data.user_id,
-                cast(Calendar.scheduled, Date) == data.scheduled,
+                Calendar.scheduled >= day_start,
+                Calendar.scheduled < day_end,
             )
-        )
-        .order_by(Calendar.scheduled)
-        .options(
-            joinedload(Calendar.tasks),
-            joinedload(Calendar.user)
-        )
+        ),
+        with_tasks=with_tasks,
     )
-    calendars_obj = []
-    for calendar in calendars_instances.unique():
-        calendar.assigner = await session.scalar(
-            select(User).where(User.id == calendar.assigner_id)
-        )
-        calendar.complete = bool(all(task.completed for task in calendar.tasks) is True)
-        calendars_obj.append(calendar)
-
-    return calendars_obj
+    return _merge_by_scheduled(calendars, occurrences)
 
 
-async def get_trainer_calendar(session: AsyncSession, data: CalendarFilter):
-    calendars_instances = await session.scalars(
+async def get_trainer_calendar(
+        session: AsyncSession,
+        data: CalendarFilter,
+        with_tasks: bool = True,
+):
+    day_start, day_end = get_day_bounds(data.scheduled, data.timezone)
+    occurrences = await expand_occurrences(
+        session,
+        day_start,
+        day_end,
+        CalendarTemplate.user_id.in_(select(User.id).where(User.trainer_id == data.user_id)),
+        CalendarTemplate.type == CalendarType.EXERCISE,
+    )
+    calendars = await _get_calendars(
+        session,
         select(Calendar)
         .join(User, User.id == Calendar.user_id)
         .where(
             and_(
                 User.trainer_id == data.user_id,
-                cast(Calendar.scheduled, Date) == data.scheduled,
+                Calendar.scheduled >= day_start,
+                Calendar.scheduled < day_end,
                 Calendar.type == CalendarType.EXERCISE,
             )
-        )
+        ),
+        with_tasks=with_tasks,
+    )
+    return _merge_by_scheduled(calendars, occurrences)
+
+
+def _day_line(day: date, calendars: List[CalendarOut]) -> bytes:
+    line = CalendarDay(day=day, calendars=calendars).model_dump_json(by_alias=True)
+    return line.encode() + b"\n"
+
+
+def _local_day(scheduled: datetime, tz: Optional[ZoneInfo]) -> date:
+    if tz is None:
+        return scheduled.date()
+    return scheduled.replace(tzinfo=timezone.utc).astimezone(tz).date()
+
+
+async def _merge_occurrences(
+        session: AsyncSession,
+        statement: Select,
+        occurrences: List[Calendar],
+) -> AsyncIterator[Calendar]:
+    """Stream the calendars of `statement`, with the sorted occurrences merged in by time."""
+    pending = deque(occurrences)
+    async for calendar in await session.stream_scalars(statement):
+        while pending and pending[0].scheduled <= calendar.scheduled:
+            yield pending.popleft()
+        yield calendar
+    while pending:
+        yield pending.popleft()
+
+
+async def stream_calendar_days(data: CalendarRangeFilter) -> AsyncIterator[bytes]:
+    """Yield one NDJSON line per day of the range, as rows arrive from the database.
+
+    Runs after the endpoint has returned, so it opens its own read-only session
+    instead of holding the request one for the whole response.
+    """
+    range_start = get_day_bounds(data.date_from, data.timezone)[0]
+    range_end = get_day_bounds(data.date_to, data.timezone)[1]
+    conditions = [
+        Calendar.user_id == data.user_id,
+        Calendar.scheduled >= range_start,
+        Calendar.scheduled < range_end,
+    ]
+    template_conditions = [CalendarTemplate.user_id == data.user_id]
+    if data.type is not None:
+        conditions.append(Calendar.type == data.type)
+        template_conditions.append(CalendarTemplate.type == data.type)
+    statement = (
+        with_completion(select(Calendar).where(and_(*conditions)))
         .order_by(Calendar.scheduled)
         .options(
-            joinedload(Calendar.tasks),
-            joinedload(Calendar.user)
+            selectinload(Calendar.tasks),
+            joinedload(Calendar.user),
+            joinedload(Calendar.assigner),
         )
+        .execution_options(yield_per=RANGE_YIELD_PER)
     )
-    calendars_obj = []
-    for calendar in calendars_instances.unique():
-        calendar.assigner = await session.scalar(
-            select(User).where(User.id == calendar.assigner_id)
+    tz = ZoneInfo(data.timezone) if data.timezone else None
+
+    day: Optional[date] = None
+    calendars: List[CalendarOut] = []
+    async with SessionManager(read_only=True) as session:
+        occurrences = await expand_occurrences(
+            session, range_start, range_end, *template_conditions
         )
-        calendar.complete = bool(all(task.completed for task in calendar.tasks) is True)
-        calendars_obj.append(calendar)
+        async for calendar in _merge_occurrences(session, statement, occurrences):
+            calendar_day = _local_day(calendar.scheduled, tz)
+            if day is not None and calendar_day != day:
+                yield _day_line(day, calendars)
+                calendars = []
+            day = calendar_day
+            calendars.append(CalendarOut.model_validate(calendar))
+    if day is not None:
+        yield _day_line(day, calendars)
 
-    return calendars_obj
+
+def _ratio(done: int, total: int) -> Optional[float]:
+    return round(done / total, 4) if total else None
+
+
+async def get_trainer_dashboard(
+        session: AsyncSession,
+        trainer_id: uuid.UUID,
+        day: date,
+        tz_name: Optional[str] = None,
+) -> TrainerDashboard:
+    """Per-client exercise roster of a trainer, computed in a single grouped query."""
+    params = (day, tz_name)
+    dashboard = trainer_dashboard_cache.get(trainer_id, params)
+    if dashboard is not None:
+        return dashboard
+
+    window_days = settings.TRAINER_DASHBOARD_WINDOW_DAYS
+    today_start, today_end = get_day_bounds(day, tz_name)
+    window_start = get_day_bounds(day - timedelta(days=window_days - 1), tz_name)[0]
+    is_today = Calendar.scheduled >= today_start
+    # Tasks have no completion time, the latest completed one is the one scheduled last
+    done_task = aliased(Task)
+    done_calendar = aliased(Calendar)
+    last_completed = (
+        select(done_task.name, done_calendar.scheduled)
+        .join(done_calendar, done_calendar.id == done_task.calendar_id)
+        .where(
+            done_calendar.user_id == User.id,
+            done_calendar.type == CalendarType.EXERCISE,
+            done_calendar.scheduled < today_end,
+            done_task.completed.is_(True),
+        )
+        .order_by(done_calendar.scheduled.desc())
+        .limit(1)
+        .lateral()
+    )
+    rows = await session.execute(
+        User.clients_by_trainer_id_stmt(trainer_id)
+        .add_columns(
+            func.count(Task.id).filter(is_today).label("tasks_today"),
+            func.count(Task.id).filter(is_today, Task.completed).label("tasks_done_today"),
+            func.count(Task.id).label("tasks_window"),
+            func.count(Task.id).filter(Task.completed).label("tasks_done_window"),
+            func.count(Task.id).filter(~is_today, ~Task.completed).label("overdue"),
+            last_completed.c.name.label("last_completed_task"),
+            last_completed.c.scheduled.label("last_completed_at"),
+        )
+        .outerjoin(
+            Calendar,
+            and_(
+                Calendar.user_id == User.id,
+                Calendar.type == CalendarType.EXERCISE,
+                Calendar.scheduled >= window_start,
+                Calendar.scheduled < today_end,
+            ),
+        )
+        .outerjoin(Task, Task.calendar_id == Calendar.id)
+        .outerjoin(last_completed, true())
+        .group_by(User.id, last_completed.c.name, last_completed.c.scheduled)
+        .order_by(User.first_name, User.last_name)
+    )
+    summaries = [
+        TrainerClientSummary(
+            id=row.User.id,
+            user_name=row.User.user_name,
+            email=row.User.email,
+            tasks_today=row.tasks_today,
+            tasks_done_today=row.tasks_done_today,
+            completion_today=_ratio(row.tasks_done_today, row.tasks_today),
+            tasks_window=row.tasks_window,
+            tasks_done_window=row.tasks_done_window,
+            adherence=_ratio(row.tasks_done_window, row.tasks_window),
+            overdue=row.overdue,
+            last_completed_task=row.last_completed_task,
+            last_completed_at=row.last_completed_at,
+        )
+        for row in rows
+    ]
+    dashboard = TrainerDashboard(day=day, window_days=window_days, clients=summaries)
+    trainer_dashboard_cache.set(
+        trainer_id, params, dashboard, {summary.id for summary in summaries}
+    )
+    return dashboard
 
 
 async def create_calendar_instance(
@@ -72,19 +328,210 @@ async def create_calendar_instance(
     calendar_instance.assigner_id = current_user.id
     session.add(calendar_instance)
     await session.flush()
-    calendar_instance.user = await session.scalar(
-        select(User)
-        .where(User.id == data.user_id)
-    )
-    calendar_instance.tasks = []
-    calendar_instance.assigner = await session.scalar(
-            select(User).where(User.id == current_user.id)
+    users = {
+        user.id: user
+        for user in await session.scalars(
+            select(User).where(User.id.in_({data.user_id, current_user.id}))
         )
+    }
+    set_committed_value(calendar_instance, "user", users.get(data.user_id))
+    set_committed_value(calendar_instance, "assigner", users.get(current_user.id))
+    set_committed_value(calendar_instance, "tasks", [])
+    set_committed_value(calendar_instance, "complete", True)
+    set_committed_value(calendar_instance, "tasks_total", 0)
+    set_committed_value(calendar_instance, "tasks_done", 0)
     return calendar_instance
 
 
+async def create_calendar_plan(
+        session: AsyncSession,
+        data: CalendarPlanIn,
+        current_user: User,
+) -> List[Calendar]:
+    """Insert a whole plan with two multi-row INSERT ... RETURNING statements.
+
+    Ids are generated here so tasks can reference their calendars without a
+    round trip, the returned rows are assembled into the response graph as is.
+    """
+    calendar_rows = []
+    task_rows = []
+    for plan_calendar in data.calendars:
+        calendar_id = uuid.uuid4()
+        calendar_rows.append({
+            "id": calendar_id,
+            "user_id": data.user_id,
+            "assigner_id": current_user.id,
+            **plan_calendar.model_dump(exclude={"tasks"}),
+        })
+        task_rows.extend(
+            {"id": uuid.uuid4(), "calendar_id": calendar_id, **task.model_dump()}
+            for task in plan_calendar.tasks
+        )
+
+    calendars = (
+        await session.scalars(insert(Calendar).returning(Calendar), calendar_rows)
+    ).all()
+    tasks_by_calendar: Dict[uuid.UUID, List[Task]] = defaultdict(list)
+    if task_rows:
+        for task in await session.scalars(insert(Task).returning(Task), task_rows):
+            tasks_by_calendar[task.calendar_id].append(task)
+
+    if data.user_id == current_user.id:
+        owner = current_user
+    else:
+        owner = await session.scalar(select(User).where(User.id == data.user_id))
+    progress = ProgressDeltas()
+    for calendar in calendars:
+        tasks = tasks_by_calendar[calendar.id]
+        tasks_done = sum(task.completed for task in tasks)
+        progress.add(
+            calendar.user_id, calendar.scheduled, calendar.type, len(tasks), tasks_done
+        )
+        set_committed_value(calendar, "tasks", tasks)
+        set_committed_value(calendar, "user", owner)
+        set_committed_value(calendar, "assigner", current_user)
+        set_committed_value(calendar, "complete", tasks_done == len(tasks))
+        set_committed_value(calendar, "tasks_total", len(tasks))
+        set_committed_value(calendar, "tasks_done", tasks_done)
+    await progress.apply(session)
+    trainer_dashboard_cache.invalidate_client(data.user_id)
+    return sorted(calendars, key=lambda calendar: calendar.scheduled)
+
+
+async def copy_calendars(
+        session: AsyncSession,
+        data: CalendarCopyIn,
+        current_user: User,
+) -> CalendarCopyOut:
+    """Clone a date range of calendars and tasks to other users in one statement.
+
+    INSERT ... SELECT inside data-modifying CTEs, no rows pass through Python.
+    Copied tasks start uncompleted.
+    """
+    range_start = get_day_bounds(data.date_from, data.timezone)[0]
+    range_end = get_day_bounds(data.date_to, data.timezone)[1]
+    calendars = Calendar.__table__
+    tasks = Task.__table__
+    # Bound parameters aren't typed by the INSERT ... SELECT targets, hence the casts
+    target_ids = cast(literal(list(set(data.target_user_ids)), ARRAY(Uuid)), ARRAY(Uuid))
+    targets = select(func.unnest(target_ids).label("user_id")).cte("targets")
+    conditions = [
+        calendars.c.user_id == data.source_user_id,
+        calendars.c.scheduled >= range_start,
+        calendars.c.scheduled < range_end,
+    ]
+    if data.type is not None:
+        conditions.append(calendars.c.type == data.type)
+    # Materialized so both inserts see the same generated ids
+    mapping = (
+        select(
+            calendars.c.id.label("source_id"),
+            func.gen_random_uuid().label("new_id"),
+            targets.c.user_id,
+            calendars.c.title,
+            calendars.c.scheduled,
+            calendars.c.type,
+        )
+        .join_from(calendars, targets, true())
+        .where(*conditions)
+        .cte("mapping")
+        .prefix_with("MATERIALIZED")
+    )
+    new_calendars = (
+        insert(calendars)
+        .from_select(
+            ["id", "user_id", "title", "scheduled", "assigner_id", "type"],
+            select(
+                mapping.c.new_id,
+                mapping.c.user_id,
+                mapping.c.title,
+                mapping.c.scheduled + cast(literal(timedelta(days=data.offset_days)), Interval),
+                cast(literal(current_user.id), Uuid),
+                mapping.c.type,
+            ),
+        )
+        .returning(calendars.c.id, calendars.c.user_id, calendars.c.scheduled, calendars.c.type)
+        .cte("new_calendars")
+    )
+    new_tasks = (
+        insert(tasks)
+        .from_select(
+            ["id", "calendar_id", "name", "amount", "unit", "completed"],
+            select(
+                func.gen_random_uuid(),
+                mapping.c.new_id,
+                tasks.c.name,
+                tasks.c.amount,
+                tasks.c.unit,
+                false(),
+            ).join_from(mapping, tasks, tasks.c.calendar_id == mapping.c.source_id),
+        )
+        .returning(tasks.c.id, tasks.c.calendar_id)
+        .cte("new_tasks")
+    )
+    progress = DailyProgress.__table__
+    new_progress = insert(progress).from_select(
+        ["user_id", "day", "type", "total", "done"],
+        select(
+            new_calendars.c.user_id,
+            cast(new_calendars.c.scheduled, Date),
+            new_calendars.c.type,
+            func.count(new_tasks.c.id),
+            literal_column("0"),
+        )
+        .join_from(new_calendars, new_tasks, new_tasks.c.calendar_id == new_calendars.c.id)
+        .group_by(
+            new_calendars.c.user_id,
+            cast(new_calendars.c.scheduled, Date),
+            new_calendars.c.type,
+        ),
+    )
+    new_progress = (
+        new_progress.on_conflict_do_update(
+            index_elements=[progress.c.user_id, progress.c.day, progress.c.type],
+            set_={"total": progress.c.total + new_progress.excluded.total},
+        )
+        .returning(progress.c.user_id)
+        .cte("new_progress")
+    )
+    counts = (
+        await session.execute(
+            select(
+                select(func.count()).select_from(new_calendars).scalar_subquery(),
+                select(func.count()).select_from(new_tasks).scalar_subquery(),
+                # Unreferenced CTEs aren't rendered
+                select(func.count()).select_from(new_progress).scalar_subquery(),
+            )
+        )
+    ).one()
+    mark_session_has_writes(session)
+    for user_id in data.target_user_ids:
+        trainer_dashboard_cache.invalidate_client(user_id)
+    return CalendarCopyOut(calendars=counts[0], tasks=counts[1])
+
+
 async def delete_calendar_logic(session: AsyncSession, calendar_id: uuid.UUID):
-    await session.execute(
-        delete(Calendar)
-        .where(Calendar.id == calendar_id)
+    # RETURNING runs before the tasks are removed by the FK cascade
+    tasks = select(Task.id).where(Task.calendar_id == calendar_id).subquery()
+    done_tasks = select(Task.id).where(Task.calendar_id == calendar_id, Task.completed).subquery()
+    calendar = (
+        await session.execute(
+            delete(Calendar)
+            .where(Calendar.id == calendar_id)
+            .returning(
+                Calendar.user_id,
+                Calendar.scheduled,
+                Calendar.type,
+                select(func.count()).select_from(tasks).scalar_subquery().label("total"),
+                select(func.count()).select_from(done_tasks).scalar_subquery().label("done"),
+            )
+        )
+    ).one_or_none()
+    if calendar is None:
+        return
+    progress = ProgressDeltas()
+    progress.add(
+        calendar.user_id, calendar.scheduled, calendar.type, -calendar.total, -calendar.done
     )
+    await progress.apply(session)
+    trainer_dashboard_cache.invalidate_client(calendar.user_id)
@@ -1,17 +1,19 @@
 import datetime
 import enum
 import uuid
-from typing import TYPE_CHECKING, List
+from typing import TYPE_CHECKING, List, Optional
 
 from sqlalchemy import (
     Enum,
     FetchedValue,
     ForeignKey,
+    Index,
     func,
 )
 from sqlalchemy.orm import (
     Mapped,
     mapped_column,
+    query_expression,
     relationship,
 )
 
@@ -30,6 +32,7 @@ class CalendarType(enum.IntEnum):
 
 class Calendar(Base, ModelCRUDMixin):
     __tablename__ = "calendars"
+    __table_args__ = (Index("ix_calendars_user_id_scheduled", "user_id", "scheduled"),)
 
     id: Mapped[uuid.UUID] = mapped_column(
         primary_key=True,
@@ -72,10 +75,16 @@ class Calendar(Base, ModelCRUDMixin):
         back_populates="calendars",
         foreign_keys=[user_id]
     )
-    # assigner: Mapped["User"] = relationship(
-    #     "User",
-    #     back_populates="assigned_calendars",
-    #     foreign_keys=[assigner_id]
-    # )
+    # assigner_id has no FK constraint, so the join condition is spelled out
+    assigner: Mapped[Optional["User"]] = relationship(
+        "User",
+        primaryjoin="foreign(Calendar.assigner_id) == User.id",
+        viewonly=True,
+        lazy="noload",
+    )
+    # Task aggregates, populated per query with with_expression (see calendar.logic)
+    complete: Mapped[Optional[bool]] = query_expression()
+    tasks_total: Mapped[Optional[int]] = query_expression()
+    tasks_done: Mapped[Optional[int]] = query_expression()
 
 
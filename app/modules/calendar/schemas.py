@@ -1,14 +1,25 @@
 import uuid
-from datetime import date, datetime
+from datetime import date, datetime, timezone
 from typing import List, Optional
 
-from pydantic import BaseModel, ConfigDict, RootModel
+from pydantic import BaseModel, ConfigDict, Field, RootModel, field_validator
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
 from app.modules.calendar.models import CalendarType
 from app.modules.tasks.schemas import TaskOut
 from app.modules.users.schemas import UserShort
 
 
+def to_naive_utc(value: datetime) -> datetime:
+    """`scheduled` and every other calendar time is stored as naive UTC.
+
+    Aware input is converted, naive input is taken as UTC already.
+    """
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
 class CalendarOut(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
@@ -20,19 +31,136 @@ class CalendarOut(BaseModel):
     assigner: Optional[UserShort] = None
     user: Optional[UserShort] = None
     complete: Optional[bool] = None
+    tasks_total: Optional[int] = None
+    tasks_done: Optional[int] = None
+    # Set on occurrences expanded from a calendar template
+    template_id: Optional[uuid.UUID] = None
 
 
 class CalendarList(RootModel):
     root: List[CalendarOut]
 
 
-class CalendarFilter(BaseModel):
+class CalendarSummaryOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: uuid.UUID
+    scheduled: datetime
+    title: str
+    type: CalendarType
+    assigner: Optional[UserShort] = None
+    user: Optional[UserShort] = None
+    complete: Optional[bool] = None
+    tasks_total: Optional[int] = None
+    tasks_done: Optional[int] = None
+    # Set on occurrences expanded from a calendar template
+    template_id: Optional[uuid.UUID] = None
+
+
+class CalendarSummaryList(RootModel):
+    root: List[CalendarSummaryOut]
+
+
+class TimezoneFilter(BaseModel):
+    # IANA name, e.g. "Europe/Moscow"
+    timezone: Optional[str] = None
+
+    @field_validator("timezone")
+    @classmethod
+    def validate_timezone(cls, value: Optional[str]) -> Optional[str]:
+        if value is None:
+            return value
+        try:
+            ZoneInfo(value)
+        except (ZoneInfoNotFoundError, ValueError) as error:
+            msg = f"Unknown timezone: {value}"
+            raise ValueError(msg) from error
+        return value
+
+
+class CalendarFilter(TimezoneFilter):
     user_id: Optional[uuid.UUID] = None
     scheduled: date
 
 
+class CalendarRangeFilter(TimezoneFilter):
+    user_id: uuid.UUID
+    date_from: date
+    date_to: date
+    type: Optional[CalendarType] = None
+
+
+class CalendarCopyIn(TimezoneFilter):
+    source_user_id: uuid.UUID
+    target_user_ids: List[uuid.UUID] = Field(min_length=1)
+    date_from: date
+    date_to: date
+    offset_days: int = 0
+    type: Optional[CalendarType] = None
+
+
+class CalendarCopyOut(BaseModel):
+    calendars: int
+    tasks: int
+
+
+class CalendarDay(BaseModel):
+    day: date
+    calendars: List[CalendarOut]
+
+
+class TrainerClientSummary(BaseModel):
+    id: uuid.UUID
+    user_name: str = Field(serialization_alias="name")
+    email: str
+    tasks_today: int
+    tasks_done_today: int
+    completion_today: Optional[float] = None
+    tasks_window: int
+    tasks_done_window: int
+    adherence: Optional[float] = None
+    overdue: int
+    last_completed_task: Optional[str] = None
+    last_completed_at: Optional[datetime] = None
+
+
+class TrainerDashboard(BaseModel):
+    day: date
+    window_days: int
+    clients: List[TrainerClientSummary]
+
+
 class CalendarIn(BaseModel):
     user_id: uuid.UUID
     scheduled: datetime
     title: str
     type: CalendarType
+
+    @field_validator("scheduled")
+    @classmethod
+    def validate_scheduled(cls, value: datetime) -> datetime:
+        return to_naive_utc(value)
+
+
+class PlanTaskIn(BaseModel):
+    name: str
+    amount: int
+    unit: str
+    completed: bool = False
+
+
+class PlanCalendarIn(BaseModel):
+    scheduled: datetime
+    title: str
+    type: CalendarType
+    tasks: List[PlanTaskIn] = []
+
+    @field_validator("scheduled")
+    @classmethod
+    def validate_scheduled(cls, value: datetime) -> datetime:
+        return to_naive_utc(value)
+
+
+class CalendarPlanIn(BaseModel):
+    user_id: uuid.UUID
+    calendars: List[PlanCalendarIn] = Field(min_length=1)
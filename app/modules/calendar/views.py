@@ -1,16 +1,39 @@
 import uuid
+from datetime import date
+from typing import Optional
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config import settings
+from app.database.routing import read_only
 from app.middlewares.request_processing import RequestProcessingRoute
 from app.modules.calendar.logic import (
+    copy_calendars,
     create_calendar_instance,
+    create_calendar_plan,
     delete_calendar_logic,
     get_calendar,
     get_trainer_calendar,
+    get_trainer_dashboard,
+    stream_calendar_days,
+)
+from app.modules.calendar.models import CalendarType
+from app.modules.calendar.schemas import (
+    CalendarCopyIn,
+    CalendarCopyOut,
+    CalendarFilter,
+    CalendarIn,
+    CalendarList,
+    CalendarOut,
+    CalendarPlanIn,
+    CalendarRangeFilter,
+    CalendarSummaryList,
+    TimezoneFilter,
+    TrainerDashboard,
 )
-from app.modules.calendar.schemas import CalendarFilter, CalendarIn, CalendarList, CalendarOut
 from app.modules.users.models import User
 from app.utils.dependencies import get_current_user, get_session
 from app.utils.response_helper import DefaultResponse
@@ -36,7 +59,48 @@ async def create_calendar(
     return CalendarOut.model_validate(calendar_obj)
 
 
+@calendar_router.post("/plan/")
+async def create_plan(
+    data: CalendarPlanIn,
+    session: AsyncSession = Depends(get_session),
+    current_user: User = Depends(get_current_user),
+) -> CalendarList:
+    calendars_obj = await create_calendar_plan(
+        session=session,
+        data=data,
+        current_user=current_user,
+    )
+    return CalendarList.model_validate(calendars_obj)
+
+
+@calendar_router.post("/copy/")
+async def copy_plan(
+    data: CalendarCopyIn,
+    session: AsyncSession = Depends(get_session),
+    current_user: User = Depends(get_current_user),
+) -> CalendarCopyOut:
+    if data.date_to < data.date_from:
+        raise HTTPException(status_code=400, detail="'date_to' must not be before 'date_from'")
+    if (data.date_to - data.date_from).days >= settings.CALENDAR_RANGE_MAX_DAYS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Range is limited to {settings.CALENDAR_RANGE_MAX_DAYS} days",
+        )
+    # Trainers copy between themselves and their own clients only
+    other_user_ids = {data.source_user_id, *data.target_user_ids} - {current_user.id}
+    if other_user_ids:
+        clients = await session.scalar(
+            select(func.count())
+            .select_from(User)
+            .where(User.id.in_(other_user_ids), User.trainer_id == current_user.id)
+        )
+        if clients != len(other_user_ids):
+            raise HTTPException(status_code=403, detail="Forbidden")
+    return await copy_calendars(session=session, data=data, current_user=current_user)
+
+
 @calendar_router.post("/tasks/")
+@read_only
 async def get_calendars(
     data: CalendarFilter,
     session: AsyncSession = Depends(get_session),
@@ -49,6 +113,7 @@ async def get_calendars(
 
 
 @calendar_router.post("/trainer/tasks/")
+@read_only
 async def get_trainer_calendars(
         data: CalendarFilter,
         session: AsyncSession = Depends(get_session),
@@ -60,6 +125,83 @@ async def get_trainer_calendars(
     return CalendarList.model_validate(calendars_obj)
 
 
+@calendar_router.post("/summary/")
+@read_only
+async def get_calendars_summary(
+    data: CalendarFilter,
+    session: AsyncSession = Depends(get_session),
+    current_user: User = Depends(get_current_user),
+) -> CalendarSummaryList:
+    if not data.user_id:
+        data.user_id = current_user.id
+    calendars_obj = await get_calendar(session=session, data=data, with_tasks=False)
+    return CalendarSummaryList.model_validate(calendars_obj)
+
+
+@calendar_router.post("/trainer/summary/")
+@read_only
+async def get_trainer_calendars_summary(
+        data: CalendarFilter,
+        session: AsyncSession = Depends(get_session),
+        current_user: User = Depends(get_current_user),
+) -> CalendarSummaryList:
+    if not data.user_id:
+        data.user_id = current_user.id
+    calendars_obj = await get_trainer_calendar(session=session, data=data, with_tasks=False)
+    return CalendarSummaryList.model_validate(calendars_obj)
+
+
+@calendar_router.get("/trainer/dashboard/")
+async def get_trainer_dashboard_view(
+        day: date,
+        timezone: Optional[str] = None,
+        session: AsyncSession = Depends(get_session),
+        current_user: User = Depends(get_current_user),
+) -> TrainerDashboard:
+    try:
+        TimezoneFilter(timezone=timezone)
+    except ValueError as error:
+        raise HTTPException(status_code=400, detail=str(error)) from error
+    return await get_trainer_dashboard(
+        session=session,
+        trainer_id=current_user.id,
+        day=day,
+        tz_name=timezone,
+    )
+
+
+@calendar_router.get("/range/")
+async def get_calendars_range(
+    request: Request,
+    date_from: date = Query(alias="from"),
+    date_to: date = Query(alias="to"),
+    type: Optional[CalendarType] = None,  # noqa: A002
+    user_id: Optional[uuid.UUID] = None,
+    timezone: Optional[str] = None,
+    current_user: User = Depends(get_current_user),
+) -> StreamingResponse:
+    if date_to < date_from:
+        raise HTTPException(status_code=400, detail="'to' must not be before 'from'")
+    if (date_to - date_from).days >= settings.CALENDAR_RANGE_MAX_DAYS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Range is limited to {settings.CALENDAR_RANGE_MAX_DAYS} days",
+        )
+    try:
+        data = CalendarRangeFilter(
+            user_id=user_id or current_user.id,
+            date_from=date_from,
+            date_to=date_to,
+            type=type,
+            timezone=timezone,
+        )
+    except ValueError as error:
+        raise HTTPException(status_code=400, detail=str(error)) from error
+    # The stream reads through its own session, authentication's must not stay checked out
+    await request.scope["db_session"].close()
+    return StreamingResponse(stream_calendar_days(data), media_type="application/x-ndjson")
+
+
 @calendar_router.delete("/")
 async def delete_calendar(
         calendar_id: uuid.UUID,
@@ -2,7 +2,7 @@ import uuid
 from datetime import datetime
 from typing import TYPE_CHECKING, List, Optional
 
-from sqlalchemy import FetchedValue, ForeignKey, UniqueConstraint, func
+from sqlalchemy import FetchedValue, ForeignKey, Index, UniqueConstraint, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database.session import Base
@@ -44,6 +44,7 @@ class Chat(Base):
 
 class Message(Base):
     __tablename__ = "messages"
+    __table_args__ = (Index("ix_messages_chat_id_created_at", "chat_id", "created_at"),)
 
     id: Mapped[uuid.UUID] = mapped_column(
         primary_key=True,
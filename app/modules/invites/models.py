@@ -11,7 +11,7 @@ class Invite(Base):
     __tablename__ = "invites"
 
     id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
-    email: Mapped[str] = mapped_column()
+    email: Mapped[str] = mapped_column(index=True)
     created_at: Mapped[datetime] = mapped_column(
         default=func.now(),
         server_default=FetchedValue(),
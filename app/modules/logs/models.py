@@ -2,7 +2,7 @@ import uuid
 from datetime import datetime
 from typing import TYPE_CHECKING, Optional
 
-from sqlalchemy import JSON, FetchedValue, ForeignKey, Integer, Text, func
+from sqlalchemy import JSON, FetchedValue, ForeignKey, Index, Integer, Text, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database.session import Base
@@ -16,6 +16,7 @@ if TYPE_CHECKING:
 
 class Logs(Base):
     __tablename__ = "logs"
+    __table_args__ = (Index("ix_logs_user_id_created_at", "user_id", "created_at"),)
 
     id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
     type: Mapped[str] = mapped_column()
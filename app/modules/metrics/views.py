@@ -0,0 +1,31 @@
+from fastapi import APIRouter, Depends
+
+from app.config import settings
+from app.database.metrics import pool_metrics
+from app.middlewares.request_processing import RequestProcessingRoute
+from app.modules.calendar.cache import trainer_dashboard_cache
+from app.utils.auth_cache import auth_user_cache
+from app.utils.dependencies import require_role
+from app.utils.hashing import password_hashing_pool
+from app.utils.websocket_manager import websocket_manager
+
+metrics_router = APIRouter(
+    tags=["Metrics"],
+    prefix="/api/metrics",
+    route_class=RequestProcessingRoute,
+    dependencies=[Depends(require_role(settings.METRICS_ROLE))],
+)
+
+
+@metrics_router.get("/")
+async def get_metrics():
+    return {
+        "database": pool_metrics.as_dict(),
+        "auth_cache": auth_user_cache.stats,
+        "trainer_dashboard_cache": trainer_dashboard_cache.stats,
+        "websocket": websocket_manager.stats,
+        "password_hashing": {
+            "pending": password_hashing_pool.pending,
+            "rejected": password_hashing_pool.rejected,
+        },
+    }
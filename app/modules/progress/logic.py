@@ -0,0 +1,208 @@
+import uuid
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import Date, and_, cast, delete, func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.modules.calendar.models import Calendar, CalendarType
+from app.modules.progress.models import DailyProgress
+from app.modules.tasks.models import Task
+from app.modules.templates.logic import expand_occurrences
+from app.modules.templates.models import CalendarTemplate
+
+# How far back a streak is looked for
+STREAK_MAX_DAYS = 366
+
+
+class ProgressDay(NamedTuple):
+    day: date
+    total: int
+    done: int
+
+
+class ProgressDeltas:
+    """Changes of daily_progress collected during a write, applied in one upsert."""
+
+    def __init__(self):
+        self._deltas: Dict[Tuple[uuid.UUID, date, CalendarType], List[int]] = defaultdict(
+            lambda: [0, 0]
+        )
+
+    def add(
+            self,
+            user_id: uuid.UUID,
+            scheduled: datetime,
+            calendar_type: CalendarType,
+            total: int = 0,
+            done: int = 0,
+    ):
+        delta = self._deltas[(user_id, scheduled.date(), calendar_type)]
+        delta[0] += total
+        delta[1] += done
+
+    async def apply(self, session: AsyncSession):
+        rows = [
+            {"user_id": user_id, "day": day, "type": calendar_type, "total": total, "done": done}
+            for (user_id, day, calendar_type), (total, done) in self._deltas.items()
+            if total or done
+        ]
+        if not rows:
+            return
+        statement = insert(DailyProgress).values(rows)
+        await session.execute(
+            statement.on_conflict_do_update(
+                index_elements=[DailyProgress.user_id, DailyProgress.day, DailyProgress.type],
+                set_={
+                    "total": DailyProgress.total + statement.excluded.total,
+                    "done": DailyProgress.done + statement.excluded.done,
+                },
+            )
+        )
+        self._deltas.clear()
+
+
+def daily_progress_select(*conditions):
+    """Counts of calendars matching ``conditions`` in daily_progress shape."""
+    return (
+        select(
+            Calendar.user_id,
+            cast(Calendar.scheduled, Date).label("day"),
+            Calendar.type,
+            func.count(Task.id).label("total"),
+            func.count(Task.id).filter(Task.completed).label("done"),
+        )
+        .join(Task, Task.calendar_id == Calendar.id)
+        .where(*conditions)
+        .group_by(Calendar.user_id, cast(Calendar.scheduled, Date), Calendar.type)
+    )
+
+
+async def rebuild_daily_progress(
+        session: AsyncSession,
+        user_ids: Optional[Iterable[uuid.UUID]] = None,
+):
+    """Recompute daily_progress from calendars and tasks.
+
+    Template occurrences are not part of the rollup, see ``_template_days``.
+    """
+    progress_conditions = []
+    calendar_conditions = []
+    if user_ids is not None:
+        user_ids = list(user_ids)
+        progress_conditions.append(DailyProgress.user_id.in_(user_ids))
+        calendar_conditions.append(Calendar.user_id.in_(user_ids))
+    await session.execute(delete(DailyProgress).where(*progress_conditions))
+    await session.execute(
+        insert(DailyProgress).from_select(
+            ["user_id", "day", "type", "total", "done"],
+            daily_progress_select(*calendar_conditions),
+        )
+    )
+
+
+def _progress_days(
+        user_id: uuid.UUID,
+        calendar_type: Optional[CalendarType],
+        *conditions,
+):
+    conditions = [DailyProgress.user_id == user_id, *conditions]
+    if calendar_type is not None:
+        conditions.append(DailyProgress.type == calendar_type)
+    return (
+        select(
+            DailyProgress.day,
+            func.sum(DailyProgress.total).label("total"),
+            func.sum(DailyProgress.done).label("done"),
+        )
+        .where(and_(*conditions))
+        .group_by(DailyProgress.day)
+    )
+
+
+async def _template_days(
+        session: AsyncSession,
+        user_id: uuid.UUID,
+        calendar_type: Optional[CalendarType],
+        date_from: date,
+        date_to: date,
+) -> Dict[date, List[int]]:
+    """Task counts per day of template occurrences in [date_from, date_to].
+
+    Endless templates can't be stored per day, so daily_progress covers
+    materialized tasks only and occurrences are counted on read instead.
+    """
+    conditions = [CalendarTemplate.user_id == user_id]
+    if calendar_type is not None:
+        conditions.append(CalendarTemplate.type == calendar_type)
+    days: Dict[date, List[int]] = defaultdict(lambda: [0, 0])
+    for calendar in await expand_occurrences(
+        session,
+        datetime.combine(date_from, time()),
+        datetime.combine(date_to + timedelta(days=1), time()),
+        *conditions,
+    ):
+        counts = days[calendar.scheduled.date()]
+        counts[0] += calendar.tasks_total
+        counts[1] += calendar.tasks_done
+    return days
+
+
+async def _get_days(
+        session: AsyncSession,
+        user_id: uuid.UUID,
+        calendar_type: Optional[CalendarType],
+        date_from: date,
+        date_to: date,
+) -> List[ProgressDay]:
+    days = await _template_days(session, user_id, calendar_type, date_from, date_to)
+    rows = await session.execute(
+        _progress_days(
+            user_id,
+            calendar_type,
+            DailyProgress.day >= date_from,
+            DailyProgress.day <= date_to,
+        )
+    )
+    for row in rows:
+        counts = days[row.day]
+        counts[0] += row.total
+        counts[1] += row.done
+    return [ProgressDay(day, total, done) for day, (total, done) in sorted(days.items())]
+
+
+async def get_progress(
+        session: AsyncSession,
+        user_id: uuid.UUID,
+        date_from: date,
+        date_to: date,
+        calendar_type: Optional[CalendarType] = None,
+) -> List[ProgressDay]:
+    return await _get_days(session, user_id, calendar_type, date_from, date_to)
+
+
+async def get_streak(
+        session: AsyncSession,
+        user_id: uuid.UUID,
+        day: date,
+        calendar_type: Optional[CalendarType] = None,
+) -> int:
+    """Days with tasks in a row, ending at ``day``, on which every task was done.
+
+    Days without tasks don't break a streak, neither does ``day`` itself while
+    it is still incomplete.
+    """
+    days = await _get_days(
+        session, user_id, calendar_type, day - timedelta(days=STREAK_MAX_DAYS - 1), day
+    )
+    streak = 0
+    for progress_day in reversed(days):
+        if not progress_day.total:
+            continue
+        if progress_day.done >= progress_day.total:
+            streak += 1
+        elif progress_day.day != day:
+            break
+    return streak
@@ -0,0 +1,32 @@
+import datetime
+import uuid
+
+from sqlalchemy import Enum, ForeignKey
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database.session import Base
+from app.modules.calendar.models import CalendarType
+
+
+class DailyProgress(Base):
+    """Task counts per user, day and calendar type, maintained by every task write.
+
+    ``day`` is the date of ``Calendar.scheduled`` as stored. Template
+    occurrences are not stored here, reads add them, see ``progress.logic``.
+    Rebuild with ``scripts/rebuild_daily_progress.py`` after out-of-band changes.
+    """
+
+    __tablename__ = "daily_progress"
+
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey(
+            "users.id",
+            onupdate="CASCADE",
+            ondelete="CASCADE",
+        ),
+        primary_key=True,
+    )
+    day: Mapped[datetime.date] = mapped_column(primary_key=True)
+    type: Mapped[CalendarType] = mapped_column(Enum(CalendarType), primary_key=True)
+    total: Mapped[int] = mapped_column(default=0, nullable=False)
+    done: Mapped[int] = mapped_column(default=0, nullable=False)
@@ -0,0 +1,29 @@
+import uuid
+from datetime import date
+from typing import List, Optional
+
+from pydantic import BaseModel, ConfigDict
+
+
+class DayProgressOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    day: date
+    total: int
+    done: int
+
+
+class ProgressOut(BaseModel):
+    user_id: uuid.UUID
+    date_from: date
+    date_to: date
+    total: int
+    done: int
+    adherence: Optional[float] = None
+    days: List[DayProgressOut]
+
+
+class StreakOut(BaseModel):
+    user_id: uuid.UUID
+    day: date
+    streak: int
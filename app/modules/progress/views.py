@@ -0,0 +1,61 @@
+import uuid
+from datetime import date
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.middlewares.request_processing import RequestProcessingRoute
+from app.modules.calendar.models import CalendarType
+from app.modules.progress.logic import get_progress, get_streak
+from app.modules.progress.schemas import DayProgressOut, ProgressOut, StreakOut
+from app.modules.users.models import User
+from app.utils.dependencies import get_current_user, get_session
+
+progress_router = APIRouter(
+    tags=["Progress"],
+    prefix="/api/progress",
+    route_class=RequestProcessingRoute,
+)
+
+
+@progress_router.get("/")
+async def get_progress_view(
+        date_from: date,
+        date_to: date,
+        type: Optional[CalendarType] = None,  # noqa: A002
+        user_id: Optional[uuid.UUID] = None,
+        session: AsyncSession = Depends(get_session),
+        current_user: User = Depends(get_current_user),
+) -> ProgressOut:
+    if date_to < date_from:
+        raise HTTPException(status_code=400, detail="'date_to' must not be before 'date_from'")
+    user_id = user_id or current_user.id
+    days = [
+        DayProgressOut.model_validate(row)
+        for row in await get_progress(session, user_id, date_from, date_to, type)
+    ]
+    total = sum(day.total for day in days)
+    done = sum(day.done for day in days)
+    return ProgressOut(
+        user_id=user_id,
+        date_from=date_from,
+        date_to=date_to,
+        total=total,
+        done=done,
+        adherence=round(done / total, 4) if total else None,
+        days=days,
+    )
+
+
+@progress_router.get("/streak/")
+async def get_streak_view(
+        day: date,
+        type: Optional[CalendarType] = None,  # noqa: A002
+        user_id: Optional[uuid.UUID] = None,
+        session: AsyncSession = Depends(get_session),
+        current_user: User = Depends(get_current_user),
+) -> StreakOut:
+    user_id = user_id or current_user.id
+    streak = await get_streak(session, user_id, day, type)
+    return StreakOut(user_id=user_id, day=day, streak=streak)
@@ -1,14 +1,24 @@
 import uuid
+from typing import List
 
-from sqlalchemy import delete, select
+from sqlalchemy import Row, delete, insert, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm.strategy_options import joinedload
 
+from app.modules.calendar.cache import trainer_dashboard_cache
 from app.modules.calendar.models import Calendar
+from app.modules.progress.logic import ProgressDeltas
 from app.modules.tasks.models import Task
 from app.modules.tasks.schemas import TaskIn
 
 
+def _calendar_columns(calendar_id) -> tuple:
+    return tuple(
+        select(column).where(Calendar.id == calendar_id).scalar_subquery().label(column.key)
+        for column in (Calendar.user_id, Calendar.scheduled, Calendar.type)
+    )
+
+
 async def get_task_instances(session: AsyncSession, calendar_id: uuid.UUID):
     task_instances = await session.scalars(
         select(Task)
@@ -19,32 +29,82 @@ async def get_task_instances(session: AsyncSession, calendar_id: uuid.UUID):
     return task_instances
 
 
+# Written rows come back with their calendar's owner, day and type, so caches and
+# daily_progress are updated without another round trip. UPDATE and DELETE are
+# table statements, the ORM ones drop the calendar columns from RETURNING. The
+# request middleware commits once at the end.
 async def create_task_instance(
         session: AsyncSession,
         data: TaskIn,
-):
-    task_instance = Task(**data.model_dump())
-    session.add(task_instance)
-    await session.commit()
-    await session.refresh(task_instance)
-    task_instance.calendar = await session.scalar(
-        select(Calendar)
-        .where(Calendar.id == data.calendar_id)
-    )
-    return task_instance
+) -> Row:
+    task = (
+        await session.execute(
+            insert(Task)
+            .values(id=uuid.uuid4(), **data.model_dump())
+            .returning(*Task.__table__.c, *_calendar_columns(data.calendar_id))
+        )
+    ).one()
+    progress = ProgressDeltas()
+    progress.add(task.user_id, task.scheduled, task.type, total=1, done=int(task.completed))
+    await progress.apply(session)
+    trainer_dashboard_cache.invalidate_client(task.user_id)
+    return task
 
 
 async def delete_task_logic(session: AsyncSession, task_id: uuid.UUID):
-    await session.execute(
-        delete(Task)
-        .where(Task.id == task_id)
-    )
+    task = (
+        await session.execute(
+            delete(Task.__table__)
+            .where(Task.id == task_id, Task.calendar_id == Calendar.id)
+            .returning(Task.completed, Calendar.user_id, Calendar.scheduled, Calendar.type)
+        )
+    ).one_or_none()
+    if task is None:
+        return
+    progress = ProgressDeltas()
+    progress.add(task.user_id, task.scheduled, task.type, total=-1, done=-int(task.completed))
+    await progress.apply(session)
+    trainer_dashboard_cache.invalidate_client(task.user_id)
+
+
+async def update_tasks_status_logic(
+        session: AsyncSession,
+        task_ids: List[uuid.UUID],
+        completed: bool,
+) -> List[Row]:
+    # Only rows whose status changes are updated, concurrent requests recheck that
+    # condition, so each change reaches daily_progress exactly once
+    columns = (*Task.__table__.c, Calendar.user_id, Calendar.scheduled, Calendar.type)
+    tasks = (
+        await session.execute(
+            update(Task.__table__)
+            .where(
+                Task.id.in_(task_ids),
+                Task.completed.is_distinct_from(completed),
+                Calendar.id == Task.calendar_id,
+            )
+            .values(completed=completed)
+            .returning(*columns)
+        )
+    ).all()
+    progress = ProgressDeltas()
+    for task in tasks:
+        progress.add(task.user_id, task.scheduled, task.type, done=1 if completed else -1)
+    await progress.apply(session)
+    for user_id in {task.user_id for task in tasks}:
+        trainer_dashboard_cache.invalidate_client(user_id)
+
+    unchanged_ids = set(task_ids) - {task.id for task in tasks}
+    if unchanged_ids:
+        tasks += (
+            await session.execute(
+                select(*columns)
+                .where(Task.id.in_(unchanged_ids), Calendar.id == Task.calendar_id)
+            )
+        ).all()
+    return tasks
 
 
 async def update_task_status_logic(session: AsyncSession, task_id: uuid.UUID, completed: bool):
-    task = await session.scalar(select(Task).where(Task.id == task_id))
-    task.completed = completed
-    session.add(task)
-    await session.commit()
-    await session.refresh(task)
-    return task
+    tasks = await update_tasks_status_logic(session, [task_id], completed)
+    return tasks[0] if tasks else None
@@ -32,7 +32,8 @@ class Task(Base, ModelCRUDMixin):
             onupdate="CASCADE",
             ondelete="CASCADE",
         ),
-        nullable=False
+        nullable=False,
+        index=True,
     )
     name: Mapped[str] = mapped_column(
         nullable=False,
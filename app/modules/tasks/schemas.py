@@ -1,7 +1,7 @@
 import uuid
 from typing import List, Optional
 
-from pydantic import BaseModel, ConfigDict, RootModel
+from pydantic import BaseModel, ConfigDict, Field, RootModel
 
 
 class TaskOut(BaseModel):
@@ -12,6 +12,8 @@ class TaskOut(BaseModel):
     amount: int
     unit: str
     completed: bool
+    # Set on tasks expanded from a calendar template
+    template_task_id: Optional[uuid.UUID] = None
 
 
 class TaskList(RootModel):
@@ -26,5 +28,10 @@ class TaskIn(BaseModel):
     completed: Optional[bool] = False
 
 
+class TaskBulkStatusIn(BaseModel):
+    task_ids: List[uuid.UUID] = Field(min_length=1)
+    completed: bool
+
+
 class TaskFilter(BaseModel):
     calendar_id: uuid.UUID
@@ -1,6 +1,6 @@
 import uuid
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.middlewares.request_processing import RequestProcessingRoute
@@ -9,8 +9,9 @@ from app.modules.tasks.logic import (
     delete_task_logic,
     get_task_instances,
     update_task_status_logic,
+    update_tasks_status_logic,
 )
-from app.modules.tasks.schemas import TaskIn, TaskList, TaskOut
+from app.modules.tasks.schemas import TaskBulkStatusIn, TaskIn, TaskList, TaskOut
 from app.utils.dependencies import get_session
 from app.utils.response_helper import DefaultResponse
 
@@ -62,4 +63,19 @@ async def update_task_status(
         session: AsyncSession = Depends(get_session),
 ) -> TaskOut:
     task = await update_task_status_logic(session=session, task_id=task_id, completed=completed)
+    if task is None:
+        raise HTTPException(status_code=404, detail="No such task")
     return TaskOut.model_validate(task)
+
+
+@task_router.post("/complete/bulk/")
+async def update_tasks_status(
+        data: TaskBulkStatusIn,
+        session: AsyncSession = Depends(get_session),
+) -> TaskList:
+    tasks = await update_tasks_status_logic(
+        session=session,
+        task_ids=data.task_ids,
+        completed=data.completed,
+    )
+    return TaskList.model_validate(tasks)
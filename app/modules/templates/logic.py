@@ -0,0 +1,236 @@
+import uuid
+from datetime import datetime
+from typing import List, Optional, Set, Tuple
+
+from dateutil.rrule import rrule
+from sqlalchemy import ColumnElement, delete, or_, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.orm.strategy_options import joinedload, selectinload
+
+from app.config import settings
+from app.modules.calendar.cache import trainer_dashboard_cache
+from app.modules.calendar.models import Calendar
+from app.modules.tasks.models import Task
+from app.modules.templates.models import CalendarTemplate, TemplateTask, TemplateTaskCompletion
+from app.modules.templates.schemas import CalendarTemplateIn, TemplateTaskCompletionIn
+from app.modules.users.models import User
+from app.utils.logging import logger
+
+
+def occurrence_id(parent_id: uuid.UUID, occurrence: datetime) -> uuid.UUID:
+    """Stable id of an expanded calendar or task, the same on every read."""
+    return uuid.uuid5(parent_id, occurrence.isoformat())
+
+
+def get_last_occurrence(rule: rrule) -> Optional[datetime]:
+    """Upper bound of the occurrences of a finite rule, None for an endless one.
+
+    UNTIL is the bound itself, COUNT is walked, which validation keeps short.
+    """
+    if rule._until is not None:
+        return rule._until
+    if rule._count is None:
+        return None
+    last = None
+    for last in rule:  # noqa: B007
+        pass
+    return last
+
+
+async def create_template_instance(
+        session: AsyncSession,
+        data: CalendarTemplateIn,
+        current_user: User,
+):
+    template = CalendarTemplate(
+        **data.model_dump(exclude={"tasks"}),
+        assigner_id=current_user.id,
+    )
+    template.until = get_last_occurrence(template.get_rule())
+    template.tasks = [
+        TemplateTask(position=position, **task.model_dump())
+        for position, task in enumerate(data.tasks)
+    ]
+    session.add(template)
+    await session.flush()
+    users = {
+        user.id: user
+        for user in await session.scalars(
+            select(User).where(User.id.in_({data.user_id, current_user.id}))
+        )
+    }
+    set_committed_value(template, "user", users.get(data.user_id))
+    set_committed_value(template, "assigner", users.get(current_user.id))
+    return template
+
+
+async def get_template_instances(session: AsyncSession, user_id: uuid.UUID):
+    templates = await session.scalars(
+        select(CalendarTemplate)
+        .where(CalendarTemplate.user_id == user_id)
+        .order_by(CalendarTemplate.dtstart)
+        .options(
+            selectinload(CalendarTemplate.tasks),
+            joinedload(CalendarTemplate.user),
+            joinedload(CalendarTemplate.assigner),
+        )
+    )
+    return templates.all()
+
+
+async def delete_template_logic(session: AsyncSession, template_id: uuid.UUID):
+    await session.execute(
+        delete(CalendarTemplate)
+        .where(CalendarTemplate.id == template_id)
+    )
+
+
+def _build_occurrence(
+        template: CalendarTemplate,
+        occurrence: datetime,
+        completed: Set[Tuple[uuid.UUID, datetime]],
+) -> Calendar:
+    calendar = Calendar(
+        id=occurrence_id(template.id, occurrence),
+        user_id=template.user_id,
+        assigner_id=template.assigner_id,
+        title=template.title,
+        type=template.type,
+        scheduled=occurrence,
+    )
+    tasks = []
+    for template_task in template.tasks:
+        task = Task(
+            id=occurrence_id(template_task.id, occurrence),
+            calendar_id=calendar.id,
+            name=template_task.name,
+            amount=template_task.amount,
+            unit=template_task.unit,
+            completed=(template_task.id, occurrence) in completed,
+        )
+        task.template_task_id = template_task.id
+        tasks.append(task)
+    tasks_done = sum(task.completed for task in tasks)
+    set_committed_value(calendar, "tasks", tasks)
+    set_committed_value(calendar, "user", template.user)
+    set_committed_value(calendar, "assigner", template.assigner)
+    set_committed_value(calendar, "complete", tasks_done == len(tasks))
+    set_committed_value(calendar, "tasks_total", len(tasks))
+    set_committed_value(calendar, "tasks_done", tasks_done)
+    calendar.template_id = template.id
+    return calendar
+
+
+def _get_occurrences(
+        templates: List[CalendarTemplate],
+        start: datetime,
+        end: datetime,
+) -> List[Tuple[CalendarTemplate, datetime]]:
+    """Occurrences in [start, end), at most TEMPLATE_MAX_OCCURRENCES of them."""
+    limit = settings.TEMPLATE_MAX_OCCURRENCES
+    occurrences: List[Tuple[CalendarTemplate, datetime]] = []
+    for template in templates:
+        rule = template.get_rule()
+        for occurrence in rule.xafter(start, count=limit - len(occurrences), inc=True):
+            if occurrence >= end:
+                break
+            occurrences.append((template, occurrence))
+        if len(occurrences) >= limit:
+            logger.warning(
+                "Template expansion of [%s, %s) stopped at %s occurrences", start, end, limit
+            )
+            break
+    return occurrences
+
+
+async def expand_occurrences(
+        session: AsyncSession,
+        start: datetime,
+        end: datetime,
+        *conditions: ColumnElement[bool],
+) -> List[Calendar]:
+    """Occurrences of matching templates in [start, end) as transient calendars.
+
+    They are never added to the session, their ids are derived from the
+    template and the occurrence time. Costs two queries whatever the range.
+    """
+    templates = (
+        await session.scalars(
+            select(CalendarTemplate)
+            .where(
+                CalendarTemplate.dtstart < end,
+                or_(CalendarTemplate.until.is_(None), CalendarTemplate.until >= start),
+                *conditions,
+            )
+            .options(
+                selectinload(CalendarTemplate.tasks),
+                joinedload(CalendarTemplate.user),
+                joinedload(CalendarTemplate.assigner),
+            )
+        )
+    ).all()
+    occurrences = _get_occurrences(templates, start, end)
+    task_ids = [task.id for template in templates for task in template.tasks]
+    completed: Set[Tuple[uuid.UUID, datetime]] = set()
+    if occurrences and task_ids:
+        completed = {
+            (row.template_task_id, row.occurrence)
+            for row in await session.execute(
+                select(
+                    TemplateTaskCompletion.template_task_id,
+                    TemplateTaskCompletion.occurrence,
+                ).where(
+                    TemplateTaskCompletion.template_task_id.in_(task_ids),
+                    TemplateTaskCompletion.occurrence >= start,
+                    TemplateTaskCompletion.occurrence < end,
+                )
+            )
+        }
+    calendars = [
+        _build_occurrence(template, occurrence, completed)
+        for template, occurrence in occurrences
+    ]
+    calendars.sort(key=lambda calendar: calendar.scheduled)
+    return calendars
+
+
+async def set_template_task_completion(
+        session: AsyncSession,
+        data: TemplateTaskCompletionIn,
+) -> Optional[Task]:
+    template_task = await session.scalar(
+        select(TemplateTask)
+        .where(TemplateTask.id == data.template_task_id)
+        .options(joinedload(TemplateTask.template))
+    )
+    occurrence = data.occurrence
+    if template_task is None or occurrence not in template_task.template.get_rule():
+        return None
+
+    if data.completed:
+        await session.execute(
+            insert(TemplateTaskCompletion)
+            .values(template_task_id=template_task.id, occurrence=occurrence)
+            .on_conflict_do_nothing()
+        )
+    else:
+        await session.execute(
+            delete(TemplateTaskCompletion)
+            .where(
+                TemplateTaskCompletion.template_task_id == template_task.id,
+                TemplateTaskCompletion.occurrence == occurrence,
+            )
+        )
+    trainer_dashboard_cache.invalidate_client(template_task.template.user_id)
+    task = Task(
+        id=occurrence_id(template_task.id, occurrence),
+        calendar_id=occurrence_id(template_task.template_id, occurrence),
+        name=template_task.name,
+        amount=template_task.amount,
+        unit=template_task.unit,
+        completed=data.completed,
+    )
+    task.template_task_id = template_task.id
+    return task
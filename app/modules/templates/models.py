@@ -0,0 +1,125 @@
+import datetime
+import uuid
+from typing import TYPE_CHECKING, List, Optional
+
+from dateutil.rrule import rrulebase, rrulestr
+from sqlalchemy import (
+    Enum,
+    FetchedValue,
+    ForeignKey,
+    Index,
+    func,
+)
+from sqlalchemy.orm import (
+    Mapped,
+    mapped_column,
+    relationship,
+)
+
+from app.database.session import Base
+from app.modules.calendar.models import CalendarType
+from app.utils.crud_model_mixin import ModelCRUDMixin
+
+if TYPE_CHECKING:
+    from app.modules.users.models import User
+
+
+class CalendarTemplate(Base, ModelCRUDMixin):
+    """A recurring calendar, expanded into occurrences when a day or range is read."""
+
+    __tablename__ = "calendar_templates"
+    __table_args__ = (Index("ix_calendar_templates_user_id_until", "user_id", "until"),)
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        primary_key=True,
+        default=uuid.uuid4,
+        server_default=FetchedValue(),
+    )
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey(
+            "users.id",
+            onupdate="CASCADE",
+            ondelete="CASCADE",
+        ),
+        nullable=False
+    )
+    assigner_id: Mapped[Optional[uuid.UUID]] = mapped_column(nullable=True)
+    title: Mapped[str] = mapped_column(nullable=True)
+    type: Mapped[CalendarType] = mapped_column(
+        Enum(CalendarType),
+        nullable=False
+    )
+    # First occurrence, naive UTC like Calendar.scheduled; its time of day is every occurrence's
+    dtstart: Mapped[datetime.datetime] = mapped_column(nullable=False)
+    # RFC 5545 recurrence rule without DTSTART, e.g. "FREQ=WEEKLY;BYDAY=MO,WE,FR;COUNT=36"
+    rrule: Mapped[str] = mapped_column(nullable=False)
+    # No occurrence is later: UNTIL or the last of COUNT occurrences, NULL for open-ended rules
+    until: Mapped[Optional[datetime.datetime]] = mapped_column(nullable=True)
+    created_at: Mapped[datetime.datetime] = mapped_column(
+        default=func.now(),
+        server_default=FetchedValue(),
+    )
+    tasks: Mapped[List["TemplateTask"]] = relationship(
+        "TemplateTask",
+        back_populates="template",
+        order_by="TemplateTask.position",
+        cascade="all, delete-orphan",
+        lazy="noload",
+    )
+    user: Mapped["User"] = relationship("User", foreign_keys=[user_id], lazy="noload")
+    assigner: Mapped[Optional["User"]] = relationship(
+        "User",
+        primaryjoin="foreign(CalendarTemplate.assigner_id) == User.id",
+        viewonly=True,
+        lazy="noload",
+    )
+
+    def get_rule(self) -> rrulebase:
+        return rrulestr(self.rrule, dtstart=self.dtstart)
+
+
+class TemplateTask(Base, ModelCRUDMixin):
+    __tablename__ = "template_tasks"
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        primary_key=True,
+        default=uuid.uuid4,
+        server_default=FetchedValue(),
+    )
+    template_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey(
+            "calendar_templates.id",
+            onupdate="CASCADE",
+            ondelete="CASCADE",
+        ),
+        nullable=False,
+        index=True,
+    )
+    position: Mapped[int] = mapped_column(default=0, nullable=False)
+    name: Mapped[str] = mapped_column(nullable=False)
+    amount: Mapped[int] = mapped_column(nullable=True)
+    unit: Mapped[str] = mapped_column(nullable=True)
+    template: Mapped["CalendarTemplate"] = relationship(
+        "CalendarTemplate",
+        back_populates="tasks",
+    )
+
+
+class TemplateTaskCompletion(Base):
+    """Completed occurrences of a template task, occurrences without a row are not done."""
+
+    __tablename__ = "template_task_completions"
+
+    template_task_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey(
+            "template_tasks.id",
+            onupdate="CASCADE",
+            ondelete="CASCADE",
+        ),
+        primary_key=True,
+    )
+    occurrence: Mapped[datetime.datetime] = mapped_column(primary_key=True)
+    created_at: Mapped[datetime.datetime] = mapped_column(
+        default=func.now(),
+        server_default=FetchedValue(),
+    )
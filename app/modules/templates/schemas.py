@@ -0,0 +1,90 @@
+import uuid
+from datetime import datetime
+from typing import List, Optional
+
+from dateutil.rrule import DAILY, rrule, rrulestr
+from pydantic import BaseModel, ConfigDict, RootModel, field_validator
+
+from app.config import settings
+from app.modules.calendar.models import CalendarType
+from app.modules.calendar.schemas import to_naive_utc
+from app.modules.users.schemas import UserShort
+
+
+class TemplateTaskIn(BaseModel):
+    name: str
+    amount: int
+    unit: str
+
+
+class TemplateTaskOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: uuid.UUID
+    name: str
+    amount: int
+    unit: str
+
+
+class CalendarTemplateIn(BaseModel):
+    user_id: uuid.UUID
+    title: str
+    type: CalendarType
+    dtstart: datetime
+    rrule: str
+    tasks: List[TemplateTaskIn] = []
+
+    @field_validator("dtstart")
+    @classmethod
+    def validate_dtstart(cls, value: datetime) -> datetime:
+        return to_naive_utc(value)
+
+    @field_validator("rrule")
+    @classmethod
+    def validate_rrule(cls, value: str) -> str:
+        value = value.strip().removeprefix("RRULE:")
+        try:
+            rule = rrulestr(value)
+        except (ValueError, TypeError) as error:
+            msg = f"Invalid recurrence rule: {value}"
+            raise ValueError(msg) from error
+        if not isinstance(rule, rrule):
+            msg = f"Invalid recurrence rule: {value}"
+            raise ValueError(msg)
+        # Frequencies are ordered from YEARLY to SECONDLY
+        if rule._freq > DAILY:
+            msg = "Recurrence rules can't repeat more often than daily"
+            raise ValueError(msg)
+        if rule._count is not None and rule._count > settings.TEMPLATE_MAX_COUNT:
+            msg = f"COUNT is limited to {settings.TEMPLATE_MAX_COUNT}"
+            raise ValueError(msg)
+        return value
+
+
+class CalendarTemplateOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: uuid.UUID
+    title: str
+    type: CalendarType
+    dtstart: datetime
+    rrule: str
+    until: Optional[datetime] = None
+    tasks: List[TemplateTaskOut] = []
+    user: Optional[UserShort] = None
+    assigner: Optional[UserShort] = None
+
+
+class CalendarTemplateList(RootModel):
+    root: List[CalendarTemplateOut]
+
+
+class TemplateTaskCompletionIn(BaseModel):
+    template_task_id: uuid.UUID
+    occurrence: datetime
+    completed: bool = True
+
+    @field_validator("occurrence")
+    @classmethod
+    def validate_occurrence(cls, value: datetime) -> datetime:
+        return to_naive_utc(value)
@@ -0,0 +1,80 @@
+import uuid
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.middlewares.request_processing import RequestProcessingRoute
+from app.modules.tasks.schemas import TaskOut
+from app.modules.templates.logic import (
+    create_template_instance,
+    delete_template_logic,
+    get_template_instances,
+    set_template_task_completion,
+)
+from app.modules.templates.schemas import (
+    CalendarTemplateIn,
+    CalendarTemplateList,
+    CalendarTemplateOut,
+    TemplateTaskCompletionIn,
+)
+from app.modules.users.models import User
+from app.utils.dependencies import get_current_user, get_session
+from app.utils.response_helper import DefaultResponse
+
+template_router = APIRouter(
+    tags=["Calendar templates"],
+    prefix="/api/templates",
+    route_class=RequestProcessingRoute,
+)
+
+
+@template_router.post("/")
+async def create_template(
+        data: CalendarTemplateIn,
+        session: AsyncSession = Depends(get_session),
+        current_user: User = Depends(get_current_user),
+) -> CalendarTemplateOut:
+    template_obj = await create_template_instance(
+        session=session,
+        data=data,
+        current_user=current_user,
+    )
+    return CalendarTemplateOut.model_validate(template_obj)
+
+
+@template_router.get("/")
+async def get_templates(
+        user_id: Optional[uuid.UUID] = None,
+        session: AsyncSession = Depends(get_session),
+        current_user: User = Depends(get_current_user),
+) -> CalendarTemplateList:
+    templates_obj = await get_template_instances(
+        session=session,
+        user_id=user_id or current_user.id,
+    )
+    return CalendarTemplateList.model_validate(templates_obj)
+
+
+@template_router.delete("/")
+async def delete_template(
+        template_id: uuid.UUID,
+        session: AsyncSession = Depends(get_session),
+):
+    await delete_template_logic(session=session, template_id=template_id)
+    return DefaultResponse(
+        success=True,
+        message="Template was deleted successfully",
+        status_code=200
+    )
+
+
+@template_router.post("/complete/")
+async def update_template_task_status(
+        data: TemplateTaskCompletionIn,
+        session: AsyncSession = Depends(get_session),
+) -> TaskOut:
+    task = await set_template_task_completion(session=session, data=data)
+    if task is None:
+        raise HTTPException(status_code=404, detail="No such template task occurrence")
+    return TaskOut.model_validate(task)
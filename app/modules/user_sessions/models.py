@@ -4,9 +4,11 @@ from typing import TYPE_CHECKING, List, Optional
 
 from sqlalchemy import (
     JSON,
+    BigInteger,
     ColumnElement,
     FetchedValue,
     ForeignKey,
+    Index,
     and_,
     desc,
     func,
@@ -22,6 +24,7 @@ if TYPE_CHECKING:
 
 class Session(Base):
     __tablename__ = "user_session"
+    __table_args__ = (Index("ix_user_session_user_id_end_at", "user_id", "end_at"),)
 
     id: Mapped[uuid.UUID] = mapped_column(
         primary_key=True,
@@ -60,3 +63,16 @@ class Session(Base):
         query = select(Session).where(and_(*conditions)).order_by(desc(Session.start_at))
         res = await session.scalar(query)
         return res
+
+
+class WebsocketBroadcast(Base):
+    """Broadcasts too large for a NOTIFY payload, see ``PostgresBackplane``.
+
+    Only the id is notified, rows are removed a minute later by the next one.
+    """
+
+    __tablename__ = "websocket_broadcasts"
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    payload: Mapped[str] = mapped_column(nullable=False)
+    created_at: Mapped[datetime] = mapped_column(server_default=func.now())
@@ -8,15 +8,15 @@ from fastapi import (
     WebSocketDisconnect,
     WebSocketException,
 )
-from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update
 
+from app.database.session import SessionManager
 from app.middlewares.request_logging import create_user_log
 from app.middlewares.request_processing import RequestProcessingRoute
 from app.modules.user_sessions.models import Session
 from app.modules.user_sessions.schemas import MessageData
 from app.modules.users.models import User, UserFingerprint
-from app.utils.dependencies import get_session, get_websocket_manager
+from app.utils.dependencies import get_websocket_manager
 from app.utils.info_from_client_ip import IPInfo
 from app.utils.logging import logger
 
@@ -31,7 +31,6 @@ websocket_rout = APIRouter(
 async def websocket_endpoint(
     websocket: WebSocket,
     user_id: str,
-    session: AsyncSession = Depends(get_session),
     websocket_manager=Depends(get_websocket_manager),
 ):
     if not websocket.client:
@@ -40,26 +39,28 @@ async def websocket_endpoint(
     client_ip = websocket.client.host
     client_location = await IPInfo.get_location(client_ip=client_ip)
 
-    fingerprint_query = (
-        select(UserFingerprint)
-        .where(UserFingerprint.user_id == user_id)
-        .order_by(UserFingerprint.updated_at.desc())
-    )
-    fingerprint: UserFingerprint = await session.scalar(fingerprint_query)
+    # Sessions live for one unit of work only, an idle socket holds no connection
+    async with SessionManager() as session:
+        fingerprint_query = (
+            select(UserFingerprint)
+            .where(UserFingerprint.user_id == user_id)
+            .order_by(UserFingerprint.updated_at.desc())
+        )
+        fingerprint: UserFingerprint = await session.scalar(fingerprint_query)
 
-    # Field start_at must be identical to field updated_at in fingerprint (we initialize them around the same time)
-    start_at = fingerprint.updated_at
-    session_data = Session(
-        user_id=user_id,
-        fingerprint_id=fingerprint.id,
-        ip=client_ip,
-        location=client_location,
-        start_at=start_at,
-    )
-    session.add(session_data)
-    # TODO (aleksandr): We must use commit to make new session available for all workers
-    await session.commit()
-    user_object = await session.scalar(select(User).where(User.id == user_id))
+        # Field start_at must be identical to field updated_at in fingerprint (we initialize them around the same time)
+        start_at = fingerprint.updated_at
+        session_data = Session(
+            user_id=user_id,
+            fingerprint_id=fingerprint.id,
+            ip=client_ip,
+            location=client_location,
+            start_at=start_at,
+        )
+        session.add(session_data)
+        # TODO (aleksandr): We must use commit to make new session available for all workers
+        await session.commit()
+        user_object = await session.scalar(select(User).where(User.id == user_id))
     if user_object is None:
         logger.error(f"User with id {user_id} is not found")
         return
@@ -70,10 +71,7 @@ async def websocket_endpoint(
         action_type="create",
         action_name="Авторизация пользователя",
         account=user_id,
-        room_id=None,
-        entity_id=None,
         ws_session=session_data,
-        document_name=None,
     )
     await websocket_manager.connect(user_id=user_id, websocket=websocket)
     try:
@@ -81,11 +79,24 @@ async def websocket_endpoint(
             data = await websocket.receive_text()
             if data is not None:
                 message = MessageData.model_validate(json.loads(data))
-                await websocket_manager.process_method(
-                    session, session_data, message.model_dump(exclude_unset=True)
-                )
+                async with SessionManager() as session:
+                    # Detached copy from the previous message, already committed
+                    user_session = await session.merge(session_data, load=False)
+                    await websocket_manager.process_method(
+                        session, user_session, message.model_dump(exclude_unset=True)
+                    )
+                session_data = user_session
     except (WebSocketDisconnect, WebSocketException):
-        end_at = datetime.now()
-        session_data.end_at = end_at
-        session.add(session_data)
-        await websocket_manager.disconnect(user_id)
+        pass
+    finally:
+        # Also after a malformed message or a failed write, or the socket stays registered
+        await websocket_manager.disconnect(user_id, websocket)
+        values = {"end_at": datetime.now()}
+        # The last unwritten state goes out together with end_at
+        state = websocket_manager.session_states.pop(session_data.id)
+        if state is not None:
+            values["state"] = state
+        async with SessionManager() as session:
+            await session.execute(
+                update(Session).where(Session.id == session_data.id).values(**values)
+            )
@@ -17,6 +17,7 @@ from app.modules.users import schemas
 from app.modules.users.models import User, UserFingerprint, UserParam, UserStatus
 from app.modules.users.schemas import UserBase, UserParamIn
 from app.utils import jwt_utils
+from app.utils.auth_cache import auth_user_cache
 from app.utils.hashing import Hasher
 from app.utils.save_user_error_log import save_user_error_log_to_table
 
@@ -30,7 +31,7 @@ async def create_refresh_token(user: User):
 
 
 async def create_user(session: AsyncSession, user_data: schemas.UserBase) -> User:
-    hashed_password = Hasher.get_password_hash(user_data.password)
+    hashed_password = await Hasher.get_password_hash_async(user_data.password)
     user = User(
         email=user_data.email,
         hashed_password=hashed_password,
@@ -68,7 +69,7 @@ async def authenticate_user(session: AsyncSession, email: str, password: str):
             session=session,
         )
         return "User is waiting for approval"
-    if not Hasher.verify_password(password, user.hashed_password):
+    if not await Hasher.verify_password_async(password, user.hashed_password):
         await save_user_error_log_to_table(
             user_id=user.id,
             type_of_error="incorrect_password",
@@ -93,6 +94,7 @@ async def update_user_data(
         )
     )
     await session.execute(queryset)
+    auth_user_cache.invalidate_user_on_commit(session, user_id)
 
 
 def change_response_permission_for_user(first_lst, second_lst):
@@ -154,6 +156,7 @@ async def user_activate_logic(
         )
     )
     await session.execute(queryset)
+    auth_user_cache.invalidate_user_on_commit(session, user_id)
     return user
 
 
@@ -179,12 +182,13 @@ async def restore_password_logic(
     restore_data: schemas.RestorePassword,
     session: AsyncSession,
 ):
-    hashed_password = Hasher.get_password_hash(restore_data.password)
+    hashed_password = await Hasher.get_password_hash_async(restore_data.password)
     await User.update_attributes_by_conditions(
         session=session,
         filters={"id": restore_data.user_id},
         attributes_vs_values={"hashed_password": hashed_password},
     )
+    auth_user_cache.invalidate_user_on_commit(session, restore_data.user_id)
 
 
 async def register_user(session: AsyncSession, user: UserBase):
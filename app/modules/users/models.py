@@ -8,9 +8,13 @@ from sqlalchemy import (
     Enum,
     FetchedValue,
     ForeignKey,
+    Index,
+    Select,
+    delete,
     func,
     select,
 )
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import (
@@ -69,6 +73,7 @@ class User(Base, ModelCRUDMixin):
         nullable=True,
         default=None,
         server_default=FetchedValue(),
+        index=True,
     )
     role: Mapped[Optional["Role"]] = relationship(
         Role,
@@ -125,16 +130,17 @@ class User(Base, ModelCRUDMixin):
     def user_name(cls):
         return concat(cls.first_name, " ", cls.last_name)
 
+    @classmethod
+    def clients_by_trainer_id_stmt(cls, trainer_id: uuid.UUID) -> Select:
+        return select(User).where(User.trainer_id == trainer_id)
+
     @classmethod
     async def get_clients_by_trainer_id(
             cls,
             session: AsyncSession,
             trainer_id: uuid.UUID,
     ):
-        user_stmt = (
-            select(User)
-            .where(User.trainer_id == trainer_id)
-        )
+        user_stmt = cls.clients_by_trainer_id_stmt(trainer_id)
         user_result = await session.scalars(user_stmt)
         result = user_result.unique().all()
 
@@ -167,31 +173,51 @@ class TokenBlacklist(Base):
         primary_key=True,
         default=uuid.uuid4,
     )
-    access_token: Mapped[str] = mapped_column()
+    jti: Mapped[str] = mapped_column(unique=True, index=True)
+    expires_at: Mapped[datetime] = mapped_column(index=True)
     created_at: Mapped[datetime] = mapped_column(
         default=func.now(),
         server_default=FetchedValue(),
+        index=True,
     )
 
     @classmethod
     async def add_tokens_to_blacklist(
             cls,
             session: AsyncSession,
-            access_token: str,
+            jti: str,
+            expires_at: datetime,
     ):
-        token_blacklist = cls(access_token=access_token)
-        session.add(token_blacklist)
+        await session.execute(
+            insert(cls)
+            .values(id=uuid.uuid4(), jti=jti, expires_at=expires_at)
+            .on_conflict_do_nothing(index_elements=[cls.jti])
+        )
 
     @classmethod
-    async def is_token_blacklisted(cls, session: AsyncSession, token: str):
-        query = select(cls).where(cls.access_token == token)
+    async def get_revoked_tokens(
+            cls,
+            session: AsyncSession,
+            since: Optional[datetime] = None,
+    ):
+        query = select(cls.jti, cls.expires_at, cls.created_at).where(
+            cls.expires_at > datetime.utcnow()
+        )
+        if since is not None:
+            query = query.where(cls.created_at >= since)
         res = await session.execute(query)
-        blacklisted_token = res.scalar_one_or_none()
-        return blacklisted_token is not None
+        return res.all()
+
+    @classmethod
+    async def delete_expired(cls, session: AsyncSession):
+        await session.execute(delete(cls).where(cls.expires_at <= datetime.utcnow()))
 
 
 class UserFingerprint(Base, ModelCRUDMixin):
     __tablename__ = "user_fingerprint"
+    __table_args__ = (
+        Index("ix_user_fingerprint_user_id_updated_at", "user_id", "updated_at"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
     user_id: Mapped[uuid.UUID] = mapped_column(
@@ -12,6 +12,7 @@ from fastapi.responses import FileResponse, HTMLResponse
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.database.routing import read_only, read_write
 from app.middlewares.request_processing import RequestProcessingRoute
 from app.modules.roles.models import Role
 from app.modules.users import logic, schemas
@@ -23,8 +24,11 @@ from app.modules.users.schemas import (
     UserParamOut,
     UserRetrieve,
 )
+from app.utils import jwt_utils
+from app.utils.auth_cache import auth_user_cache
 from app.utils.dependencies import get_current_user, get_log_context, get_session
 from app.utils.response_helper import DefaultResponse
+from app.utils.token_revocation import token_revocation_store
 
 user_router = APIRouter(
     tags=["Users"],
@@ -84,6 +88,7 @@ async def login(
 
 
 @user_router.post("/user-exists/")
+@read_only
 async def user_exists(
         data: schemas.UserExists,
         session: AsyncSession = Depends(get_session),
@@ -131,10 +136,17 @@ async def logout(
 ):
     auth = request.headers["Authorization"]
     _, token = auth.split()
-    await TokenBlacklist.add_tokens_to_blacklist(
-        session=session,
-        access_token=token,
-    )
+    claims = jwt_utils.decode_token_claims(token)
+    if claims is not None:
+        jti = jwt_utils.get_token_id(token, claims)
+        expires_at = jwt_utils.get_token_expiration(claims)
+        await TokenBlacklist.add_tokens_to_blacklist(
+            session=session,
+            jti=jti,
+            expires_at=expires_at,
+        )
+        token_revocation_store.add(jti, expires_at)
+    auth_user_cache.invalidate_token(token)
     return DefaultResponse(success=True, message="Successfully logged out")
 
 
@@ -153,6 +165,7 @@ async def create_user_fingerprint_view(
 
 
 @user_router.get("/register/accept/{user_id}/")
+@read_write
 async def user_activate_view(
         user_id: UUID,
         session: AsyncSession = Depends(get_session),
@@ -0,0 +1,111 @@
+"""Per-worker cache of the users behind access tokens.
+
+Invalidations only reach the cache of the worker that made the change, other
+workers keep serving the old row until it expires, so a change to a user
+(role, status, trainer) takes up to ``AUTH_CACHE_TTL_SECONDS`` to apply
+everywhere, which is why that TTL is kept short. Revoked tokens don't depend
+on it, they are checked before the cache against the shared revocation store.
+"""
+import uuid
+from typing import Any, Dict, Optional, Set
+
+from cachetools import TTLCache
+from sqlalchemy import event, inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session as SyncSession
+from sqlalchemy.orm import make_transient_to_detached
+
+from app.config import settings
+from app.modules.users.models import User
+
+# session.info key of users to drop from the cache once the session commits
+_PENDING_INVALIDATIONS = "auth_cache_invalidate_users"
+
+
+class AuthUserCache:
+    """Bounded TTL+LRU cache of authenticated users keyed by access token.
+
+    Only column values are stored, every hit builds a fresh detached ``User``
+    so an instance is never shared between two request sessions.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._users: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._tokens_by_user: Dict[uuid.UUID, Set[str]] = {}
+        self._indexed_tokens = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, token: str) -> Optional[User]:
+        snapshot = self._users.get(token)
+        if snapshot is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        user = User(**snapshot)
+        make_transient_to_detached(user)
+        return user
+
+    def set(self, token: str, user: User):
+        snapshot: Dict[str, Any] = {
+            attr.key: getattr(user, attr.key) for attr in inspect(User).column_attrs
+        }
+        self._users[token] = snapshot
+        self._tokens_by_user.setdefault(user.id, set()).add(token)
+        self._indexed_tokens += 1
+        # Expired and evicted tokens stay in the index until it outgrows the cache twice
+        if self._indexed_tokens > 2 * len(self._users):
+            self._rebuild_index()
+
+    def _rebuild_index(self):
+        self._tokens_by_user = {}
+        for token, snapshot in self._users.items():
+            self._tokens_by_user.setdefault(snapshot["id"], set()).add(token)
+        self._indexed_tokens = len(self._users)
+
+    def invalidate_token(self, token: str):
+        snapshot = self._users.pop(token, None)
+        if snapshot is not None:
+            self._tokens_by_user.get(snapshot["id"], set()).discard(token)
+
+    def invalidate_user(self, user_id: uuid.UUID):
+        for token in self._tokens_by_user.pop(user_id, set()):
+            self._users.pop(token, None)
+
+    def invalidate_user_on_commit(self, session: AsyncSession, user_id: uuid.UUID):
+        """Drop the user once ``session`` commits.
+
+        Invalidating before the commit would let a concurrent request cache
+        the row it still reads as it was.
+        """
+        session.info.setdefault(_PENDING_INVALIDATIONS, set()).add(user_id)
+
+    def clear(self):
+        self._users.clear()
+        self._tokens_by_user.clear()
+        self._indexed_tokens = 0
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        return {
+            "size": len(self._users),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+auth_user_cache = AuthUserCache(
+    maxsize=settings.AUTH_CACHE_MAXSIZE,
+    ttl=settings.AUTH_CACHE_TTL_SECONDS,
+)
+
+
+@event.listens_for(SyncSession, "after_commit")
+def _invalidate_committed_users(session: SyncSession):
+    for user_id in session.info.pop(_PENDING_INVALIDATIONS, ()):
+        auth_user_cache.invalidate_user(user_id)
+
+
+@event.listens_for(SyncSession, "after_rollback")
+def _discard_rolled_back_users(session: SyncSession):
+    session.info.pop(_PENDING_INVALIDATIONS, None)
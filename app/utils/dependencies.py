@@ -1,11 +1,12 @@
 import functools
-from typing import Any, AsyncIterable, Callable, Optional, TypeVar
+from typing import Any, AsyncIterable, Awaitable, Callable, Optional, TypeVar
 
-from fastapi import File, HTTPException, Request, params
+from fastapi import Depends, File, HTTPException, Request, params
 from fastapi.requests import HTTPConnection
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing_extensions import ParamSpec
 
+from app.modules.roles.logic import get_role_by_id
 from app.modules.users.models import User
 from app.utils.websocket_manager import WebSocketManager
 
@@ -14,7 +15,7 @@ async def get_session(request: HTTPConnection) -> AsyncIterable[AsyncSession]:
     if "db_session" not in request.scope:
         msg = "Database session is not initialized"
         raise ValueError(msg)
-    return request.scope["db_session"]
+    return await request.scope["db_session"].get()
 
 
 async def get_current_user(request: Request) -> User:
@@ -26,6 +27,24 @@ async def get_current_user(request: Request) -> User:
     return request.state.user
 
 
+def require_role(role_name: str) -> Callable[..., Awaitable[User]]:
+    async def check_role(
+            current_user: User = Depends(get_current_user),
+            session: AsyncSession = Depends(get_session),
+    ) -> User:
+        role = None
+        if current_user.role_id is not None:
+            role = await get_role_by_id(session, current_user.role_id)
+        if role is None or role.name != role_name:
+            raise HTTPException(
+                status_code=403,
+                detail="Forbidden",
+            )
+        return current_user
+
+    return check_role
+
+
 async def get_websocket_manager(request: HTTPConnection) -> WebSocketManager:
     if not hasattr(request.app.state, "websocket_manager"):
         raise HTTPException(
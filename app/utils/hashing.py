@@ -1,7 +1,53 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, TypeVar
+
+from fastapi import HTTPException
 from passlib.context import CryptContext
 
+from app.config import settings
+
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+T = TypeVar("T")
+
+
+class PasswordHashingBusy(HTTPException):
+    def __init__(self) -> None:
+        super().__init__(
+            status_code=503,
+            detail="Server is busy, try again later",
+            headers={"Retry-After": "1"},
+        )
+
+
+class PasswordHashingPool:
+    # bcrypt releases the GIL, so a thread pool is enough to keep it off the event loop
+    def __init__(self, max_workers: int, max_pending: int):
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="password-hashing",
+        )
+        self.max_pending = max_pending
+        self.pending = 0
+        self.rejected = 0
+
+    async def run(self, func: Callable[..., T], *args) -> T:
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            raise PasswordHashingBusy
+        self.pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+        finally:
+            self.pending -= 1
+
+
+password_hashing_pool = PasswordHashingPool(
+    max_workers=settings.PASSWORD_HASHING_WORKERS,
+    max_pending=settings.PASSWORD_HASHING_QUEUE_LIMIT,
+)
+
 
 class Hasher:
     @staticmethod
@@ -11,3 +57,13 @@ class Hasher:
     @staticmethod
     def get_password_hash(password) -> str:
         return pwd_context.hash(password)
+
+    @staticmethod
+    async def verify_password_async(plain_password, hashed_password) -> bool:
+        return await password_hashing_pool.run(
+            Hasher.verify_password, plain_password, hashed_password
+        )
+
+    @staticmethod
+    async def get_password_hash_async(password) -> str:
+        return await password_hashing_pool.run(Hasher.get_password_hash, password)
@@ -1,18 +1,36 @@
+import hashlib
+import time
+import uuid
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Any, Dict, Optional
 
+from cachetools import TLRUCache
 from jose import JWTError, jwt
 
 from app.config import settings
 
 
+def _claims_expiration(_key, claims: Dict[str, Any], now: float) -> float:
+    # Tokens without `exp` expire immediately, i.e. they are never cached
+    return claims.get("exp", now)
+
+
+# Verified token -> claims. Keys include the signing key, so rotating SECRET_KEY
+# never serves claims that were verified with the previous key.
+_verified_claims: TLRUCache = TLRUCache(
+    maxsize=settings.JWT_DECODE_CACHE_MAXSIZE,
+    ttu=_claims_expiration,
+    timer=time.time,
+)
+
+
 def create_access_token(*, data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
     else:
         expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    to_encode.update({"exp": expire})
+    to_encode.update({"exp": expire, "jti": uuid.uuid4().hex})
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
     return encoded_jwt
 
@@ -28,13 +46,34 @@ def create_refresh_token(*, data: dict, expires_delta: Optional[timedelta] = Non
     return encoded_jwt
 
 
-def decode_access_token(token: str):
+def decode_token_claims(token: str) -> Optional[Dict[str, Any]]:
+    cache_key = (settings.SECRET_KEY, settings.JWT_ALGORITHM, token)
+    claims = _verified_claims.get(cache_key)
+    if claims is not None:
+        return claims
     try:
-        payload = jwt.decode(
+        claims = jwt.decode(
             token,
             settings.SECRET_KEY,
             algorithms=[settings.JWT_ALGORITHM],
         )
-        return payload["sub"]
     except JWTError:
         return None
+    _verified_claims[cache_key] = claims
+    return claims
+
+
+def decode_access_token(token: str):
+    claims = decode_token_claims(token)
+    if claims is None:
+        return None
+    return claims["sub"]
+
+
+def get_token_id(token: str, claims: Dict[str, Any]) -> str:
+    # Tokens issued before `jti` was introduced are identified by their digest
+    return claims.get("jti") or hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+def get_token_expiration(claims: Dict[str, Any]) -> datetime:
+    return datetime.utcfromtimestamp(claims["exp"])
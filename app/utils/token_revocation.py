@@ -0,0 +1,80 @@
+import asyncio
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from app.config import settings
+from app.database.session import SessionManager
+from app.modules.users.models import TokenBlacklist
+from app.utils.logging import logger
+
+# created_at is the transaction start time, so rows committed late may carry a
+# timestamp older than the last one seen; re-reading a window hides that gap
+_REFRESH_OVERLAP = timedelta(minutes=1)
+
+
+class TokenRevocationStore:
+    """Per-worker set of live revoked token ids.
+
+    Warmed from ``user_token_blacklist`` at startup and refreshed incrementally,
+    so authentication never queries the table.
+    """
+
+    def __init__(self, refresh_interval: float, prune_interval: float):
+        self.refresh_interval = refresh_interval
+        self.prune_interval = prune_interval
+        self._revoked: Dict[str, datetime] = {}
+        self._last_seen: Optional[datetime] = None
+        self._last_pruned = 0.0
+
+    def is_revoked(self, jti: str) -> bool:
+        expires_at = self._revoked.get(jti)
+        if expires_at is None:
+            return False
+        if expires_at <= datetime.utcnow():
+            self._revoked.pop(jti, None)
+            return False
+        return True
+
+    def add(self, jti: str, expires_at: datetime):
+        self._revoked[jti] = expires_at
+
+    async def warm_up(self):
+        self._revoked.clear()
+        self._last_seen = None
+        await self.refresh()
+
+    async def refresh(self):
+        since = self._last_seen - _REFRESH_OVERLAP if self._last_seen else None
+        async with SessionManager() as session:
+            revoked_tokens = await TokenBlacklist.get_revoked_tokens(session, since=since)
+        for jti, expires_at, created_at in revoked_tokens:
+            self._revoked[jti] = expires_at
+            if self._last_seen is None or created_at > self._last_seen:
+                self._last_seen = created_at
+
+        now = datetime.utcnow()
+        self._revoked = {
+            jti: expires_at for jti, expires_at in self._revoked.items() if expires_at > now
+        }
+
+    async def prune(self):
+        async with SessionManager() as session:
+            await TokenBlacklist.delete_expired(session)
+        self._last_pruned = time.monotonic()
+
+    async def run(self):
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            try:
+                await self.refresh()
+                if time.monotonic() - self._last_pruned >= self.prune_interval:
+                    await self.prune()
+            except Exception:
+                logger.exception("Failed to refresh revoked tokens")
+
+
+token_revocation_store = TokenRevocationStore(
+    refresh_interval=settings.TOKEN_REVOCATION_REFRESH_SECONDS,
+    prune_interval=settings.TOKEN_REVOCATION_PRUNE_SECONDS,
+)
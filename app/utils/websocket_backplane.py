@@ -0,0 +1,184 @@
+import abc
+import asyncio
+import json
+from typing import Awaitable, Callable, Optional
+
+import asyncpg
+
+from app.config import settings
+from app.utils.logging import logger
+
+# Receives (room_id, serialized message) on every worker, including the publisher
+DeliveryHandler = Callable[[str, str], Awaitable[None]]
+
+# Postgres rejects NOTIFY payloads of 8000 bytes and more
+_MAX_NOTIFY_PAYLOAD = 7999
+# Larger ones are stored in websocket_broadcasts and only their id is notified,
+# expired rows are removed by the same statement
+_NOTIFY_STORED = """
+    WITH expired AS (
+        DELETE FROM websocket_broadcasts WHERE created_at < now() - interval '1 minute'
+    ), stored AS (
+        INSERT INTO websocket_broadcasts (payload) VALUES ($2) RETURNING id
+    )
+    SELECT pg_notify($1, json_build_object('id', id)::text) FROM stored
+"""
+_SELECT_STORED = "SELECT payload FROM websocket_broadcasts WHERE id = $1"
+_RECONNECT_DELAYS = (0.5, 1, 2, 5, 10)
+
+
+class Backplane(abc.ABC):
+    """Pub/sub between workers for websocket broadcasts.
+
+    A message published on any worker is handed to the delivery handler of
+    every worker, each of which sends it to its own local connections.
+    """
+
+    def __init__(self):
+        self._handler: Optional[DeliveryHandler] = None
+
+    async def start(self, handler: DeliveryHandler):
+        self._handler = handler
+
+    async def stop(self):
+        self._handler = None
+
+    @abc.abstractmethod
+    async def publish(self, room_id: str, message: str):
+        ...
+
+    async def _deliver_locally(self, room_id: str, message: str):
+        if self._handler is not None:
+            await self._handler(room_id, message)
+
+
+class InMemoryBackplane(Backplane):
+    """Single-process backplane, delivery happens right in ``publish``."""
+
+    async def publish(self, room_id: str, message: str):
+        await self._deliver_locally(room_id, message)
+
+
+class PostgresBackplane(Backplane):
+    """LISTEN/NOTIFY over one dedicated asyncpg connection per worker.
+
+    Notifications are queued and delivered one at a time, so every worker sees
+    messages in the order Postgres committed them. Messages over the NOTIFY
+    limit travel through the websocket_broadcasts table.
+    """
+
+    def __init__(self, dsn: str, channel: str):
+        super().__init__()
+        self.dsn = dsn
+        self.channel = channel
+        self._connection: Optional[asyncpg.Connection] = None
+        self._lock = asyncio.Lock()
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._consumer: Optional[asyncio.Task] = None
+        self._reconnect: Optional[asyncio.Task] = None
+        self._stopping = False
+
+    async def start(self, handler: DeliveryHandler):
+        await super().start(handler)
+        self._stopping = False
+        await self._connect()
+        self._consumer = asyncio.create_task(self._consume())
+
+    async def stop(self):
+        self._stopping = True
+        for task in (self._reconnect, self._consumer):
+            if task is not None:
+                task.cancel()
+        if self._connection is not None and not self._connection.is_closed():
+            await self._connection.close()
+        self._connection = None
+        await super().stop()
+
+    async def publish(self, room_id: str, message: str):
+        payload = json.dumps({"room_id": room_id, "message": message})
+        async with self._lock:
+            if self._connection is None or self._connection.is_closed():
+                # Other workers miss it, but a reconnect must not fail the sender
+                logger.error(
+                    "Websocket backplane is not connected, delivering to room %s locally only",
+                    room_id,
+                )
+                await self._deliver_locally(room_id, message)
+                return
+            try:
+                if len(payload.encode()) > _MAX_NOTIFY_PAYLOAD:
+                    await self._connection.execute(_NOTIFY_STORED, self.channel, payload)
+                else:
+                    await self._connection.execute(
+                        "SELECT pg_notify($1, $2)", self.channel, payload
+                    )
+            except (OSError, asyncpg.PostgresError, asyncpg.InterfaceError):
+                logger.exception(
+                    "Websocket backplane publish failed, delivering to room %s locally only",
+                    room_id,
+                )
+                await self._deliver_locally(room_id, message)
+
+    async def _connect(self):
+        connection = await asyncpg.connect(self.dsn)
+        connection.add_termination_listener(self._on_termination)
+        await connection.add_listener(self.channel, self._on_notification)
+        self._connection = connection
+
+    def _on_notification(self, _connection, _pid, _channel, payload: str):
+        self._queue.put_nowait(payload)
+
+    def _on_termination(self, _connection):
+        if self._stopping:
+            return
+        logger.warning("Websocket backplane connection lost, reconnecting")
+        self._reconnect = asyncio.create_task(self._reconnect_loop())
+
+    async def _reconnect_loop(self):
+        attempt = 0
+        while not self._stopping:
+            if await self._try_connect():
+                logger.info("Websocket backplane reconnected")
+                return
+            delay = _RECONNECT_DELAYS[min(attempt, len(_RECONNECT_DELAYS) - 1)]
+            logger.warning("Retrying the websocket backplane connection in %ss", delay)
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    async def _try_connect(self) -> bool:
+        try:
+            await self._connect()
+        except (OSError, asyncpg.PostgresError):
+            logger.exception("Websocket backplane reconnect failed")
+            return False
+        return True
+
+    async def _consume(self):
+        while True:
+            await self._deliver(await self._queue.get())
+
+    async def _load_stored(self, broadcast_id: int) -> str:
+        async with self._lock:
+            payload = await self._connection.fetchval(_SELECT_STORED, broadcast_id)
+        if payload is None:
+            msg = f"Websocket broadcast {broadcast_id} has expired"
+            raise LookupError(msg)
+        return payload
+
+    async def _deliver(self, payload: str):
+        try:
+            envelope = json.loads(payload)
+            if "id" in envelope:
+                envelope = json.loads(await self._load_stored(envelope["id"]))
+            await self._deliver_locally(envelope["room_id"], envelope["message"])
+        except Exception:
+            logger.exception("Failed to deliver a websocket broadcast")
+
+
+def create_backplane() -> Backplane:
+    if settings.WEBSOCKET_BACKPLANE == "postgres":
+        return PostgresBackplane(
+            dsn=settings.DATABASE_URL.replace("postgresql+asyncpg://", "postgresql://", 1),
+            channel=settings.WEBSOCKET_BACKPLANE_CHANNEL,
+        )
+    return InMemoryBackplane()
@@ -1,23 +1,42 @@
 import asyncio
-import json
 import uuid
 from datetime import datetime
-from typing import ClassVar, Dict, List
+from typing import ClassVar, Dict, Optional, Set
 
-from sqlalchemy import String, and_, null, select, update
+import orjson
+from sqlalchemy import and_, null, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from starlette.websockets import WebSocket
 
+from app.config import settings
 from app.database.session import SessionManager
 from app.modules.user_sessions.models import Session
 from app.modules.user_sessions.schemas import ChatMessageData, SessionMethod
 from app.modules.users.models import User
 from app.utils.logging import logger
+from app.utils.websocket_backplane import Backplane, InMemoryBackplane, create_backplane
+from app.utils.websocket_sender import ConnectionSender, sender_metrics
+from app.utils.websocket_state import SessionStateBuffer
 
 
 class WebSocketManager:
-    def __init__(self):
+    def __init__(self, backplane: Optional[Backplane] = None):
+        self.backplane = backplane or InMemoryBackplane()
         self.connections: Dict[str, WebSocket] = {}
+        self.senders: Dict[str, ConnectionSender] = {}
+        # room_id -> user ids in it, and back; kept in sync with the session state
+        self.rooms: Dict[str, Set[str]] = {}
+        self.user_rooms: Dict[str, str] = {}
+        self.session_states = SessionStateBuffer(
+            flush_after=settings.WEBSOCKET_STATE_FLUSH_SECONDS
+        )
+
+    async def start(self):
+        await self.backplane.start(self.deliver)
+
+    async def stop(self):
+        await self.session_states.close()
+        await self.backplane.stop()
 
     async def close_all_connections(self):
         async with SessionManager() as session:
@@ -28,48 +47,67 @@ class WebSocketManager:
                     .values(end_at=datetime.now())
                 )
             self.connections.clear()
+            for sender in self.senders.values():
+                sender.close()
+            self.senders.clear()
+            self.rooms.clear()
+            self.user_rooms.clear()
+
+    def set_user_room(self, user_id: str, room_id: Optional[str]):
+        current_room_id = self.user_rooms.pop(user_id, None)
+        if current_room_id is not None:
+            room = self.rooms.get(current_room_id)
+            if room is not None:
+                room.discard(user_id)
+                if not room:
+                    del self.rooms[current_room_id]
+        if room_id is not None:
+            self.user_rooms[user_id] = room_id
+            self.rooms.setdefault(room_id, set()).add(user_id)
 
     def __del__(self):
         loop = asyncio.get_event_loop()
         loop.run_until_complete(self.close_all_connections())
 
     @staticmethod
-    async def process_document_update(
-        room_connections: Dict[str, WebSocket], document_id: uuid.UUID
-    ):
-        connections_to_broadcast: List[WebSocket] = list(room_connections.values())
-        return {"document_id": str(document_id)}, connections_to_broadcast
+    async def process_document_update(document_id: uuid.UUID):
+        return {"document_id": str(document_id)}
 
     @staticmethod
-    async def process_chat_message(
-        room_connections: Dict[str, WebSocket],
-        user_id: uuid.UUID,
-        chat_id: uuid.UUID,
-    ):
-        connections_to_broadcast: List[WebSocket] = list(room_connections.values())
-
+    async def process_chat_message(user_id: uuid.UUID, chat_id: uuid.UUID):
         async with SessionManager() as session:
             user = await session.scalar(select(User).where(User.id == user_id))
         return {
             "user_name": user.user_name,
             "email": user.email,
-            "chat_id": chat_id,
-        }, connections_to_broadcast
-
-    async def init_session_state(self, session: AsyncSession, user_session, data):
-        await session.refresh(user_session)
-        user_session.state = data
-        session.add(user_session)
-        await session.commit()
+            "chat_id": str(chat_id),
+        }
 
-    async def update_session_state(self, session: AsyncSession, user_session: Session, data: dict):
-        await session.refresh(user_session)
-        session_state = user_session.state
-        session_state.update(**data)
+    # State changes stay in memory, session_states writes them behind in batches
+    async def init_session_state(self, _session: AsyncSession, user_session: Session, data):
+        self.session_states.set(user_session.id, data)
+        self._index_session_room(user_session, data)
 
-        user_session.state = session_state
-        session.add(user_session)
-        await session.commit()
+    async def update_session_state(
+            self,
+            session: AsyncSession,
+            user_session: Session,
+            data: dict,
+    ):
+        session_state = self.session_states.get(user_session.id)
+        if session_state is None:
+            # Not loaded on the merged instance, the last written state is in the row
+            await session.refresh(user_session, ["state"])
+            session_state = user_session.state
+        session_state = {**(session_state or {}), **data}
+        self.session_states.set(user_session.id, session_state)
+        self._index_session_room(user_session, session_state)
+
+    def _index_session_room(self, user_session: Session, state: Optional[dict]):
+        room_id = (state or {}).get("room_id")
+        self.set_user_room(
+            str(user_session.user_id), str(room_id) if room_id is not None else None
+        )
 
     async def init_chat_message(self, session: AsyncSession, user_session: Session, data: dict):
         serialized_data = ChatMessageData.model_validate(data)
@@ -93,9 +131,30 @@ class WebSocketManager:
 
     async def connect(self, user_id: str, websocket: WebSocket):
         await websocket.accept()
+        previous_sender = self.senders.pop(user_id, None)
+        if previous_sender is not None:
+            previous_sender.close()
         self.connections[user_id] = websocket
+        self.senders[user_id] = ConnectionSender(
+            websocket,
+            queue_size=settings.WEBSOCKET_SEND_QUEUE_SIZE,
+            evict_after=settings.WEBSOCKET_SLOW_CONSUMER_SECONDS,
+            on_evict=lambda sender: self._evict(user_id, sender),
+        )
+
+    async def _evict(self, user_id: str, sender: ConnectionSender):
+        logger.warning("Disconnecting slow websocket client of user %s", user_id)
+        await sender.evict()
+        await self.disconnect(user_id, sender.websocket)
 
-    async def disconnect(self, user_id: str):
+    async def disconnect(self, user_id: str, websocket: Optional[WebSocket] = None):
+        # A reconnected user must not lose the new connection to the old one's cleanup
+        if websocket is not None and self.connections.get(user_id) is not websocket:
+            return
+        self.set_user_room(user_id, None)
+        sender = self.senders.pop(user_id, None)
+        if sender is not None:
+            sender.close()
         if self.connections.get(user_id):
             try:
                 self.connections.pop(user_id)
@@ -104,21 +163,18 @@ class WebSocketManager:
                     "An error occurred while disconnecting user %s: Error: %s", user_id, error
                 )
 
-    async def get_room_connections(self, room_id: str):
-        async with (SessionManager() as session):
-            user_sessions = (
-                await session.scalars(
-                    select(Session.user_id.cast(String)).where(
-                        and_(
-                            Session.state.op("->>")("room_id").cast(String) == room_id,
-                            Session.end_at.is_(null()),
-                        )
-                    )
-                )
-            ).all()
-            return {key: value for key, value in self.connections.items() if key in user_sessions}
+    def get_room_connections(self, room_id: str) -> Dict[str, WebSocket]:
+        return {
+            user_id: self.connections[user_id]
+            for user_id in self.rooms.get(room_id, ())
+            if user_id in self.connections
+        }
 
     async def broadcast(self, message: str, room_id: str, event: str, **params):
+        """Format the message once and publish it, every worker delivers it to its members."""
+        processing_method = self._BROADCAST_STRATEGY.get(event)
+        if not processing_method:
+            return
         timestamp = datetime.now().isoformat()
         formatted_message = {
             "timestamp": timestamp,
@@ -126,18 +182,27 @@ class WebSocketManager:
             "room_id": room_id,
             "event": event,
         }
-        room_connections = await self.get_room_connections(room_id=room_id)
-        if not room_connections:
-            return
-        processing_method = self._BROADCAST_STRATEGY.get(event)
-        if not processing_method:
-            return
-        addons, connections_to_broadcast = await processing_method(
-            room_connections=room_connections, **params
-        )
-        formatted_message.update(addons)
-        for connection in connections_to_broadcast:
-            await connection.send_text(json.dumps(formatted_message))
+        formatted_message.update(await processing_method(**params))
+        await self.backplane.publish(room_id, orjson.dumps(formatted_message).decode())
+
+    async def deliver(self, room_id: str, message: str):
+        # Only enqueues, the writer task of each connection does the sending
+        for user_id in self.rooms.get(room_id, ()):
+            sender = self.senders.get(user_id)
+            if sender is not None:
+                sender.send(message)
+
+    @property
+    def stats(self) -> dict:
+        depths = [sender.depth for sender in self.senders.values()]
+        return {
+            "connections": len(self.connections),
+            "rooms": len(self.rooms),
+            "queue_depth_total": sum(depths),
+            "queue_depth_max": max(depths, default=0),
+            **sender_metrics.as_dict(),
+            **self.session_states.stats,
+        }
 
     async def process_method(self, session: AsyncSession, user_session: Session, message: dict):
         processing_method = self._STATE_METHODS_STRATEGY.get(message["type"])
@@ -146,4 +211,4 @@ class WebSocketManager:
         await processing_method(self, session, user_session, message["data"])
 
 
-websocket_manager = WebSocketManager()
+websocket_manager = WebSocketManager(backplane=create_backplane())
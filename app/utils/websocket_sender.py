@@ -0,0 +1,102 @@
+import asyncio
+import time
+from typing import Awaitable, Callable, Dict, Optional
+
+from starlette.websockets import WebSocket
+
+from app.utils.logging import logger
+
+# "Try Again Later", sent to clients evicted for not reading their messages
+SLOW_CONSUMER_CLOSE_CODE = 1013
+
+
+class SenderMetrics:
+    def __init__(self):
+        self.queued = 0
+        self.sent = 0
+        self.dropped = 0
+        self.evicted = 0
+        self.failed = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        return {
+            "queued": self.queued,
+            "sent": self.sent,
+            "dropped": self.dropped,
+            "evicted": self.evicted,
+            "failed": self.failed,
+        }
+
+
+sender_metrics = SenderMetrics()
+
+
+class ConnectionSender:
+    """Bounded outbound queue of one websocket, drained by its own writer task.
+
+    ``send`` never waits, so a slow client only fills its own queue. Messages
+    that don't fit are dropped, and a client whose queue stays full for
+    ``evict_after`` seconds is closed through ``on_evict``.
+    """
+
+    def __init__(
+            self,
+            websocket: WebSocket,
+            queue_size: int,
+            evict_after: float,
+            on_evict: Callable[["ConnectionSender"], Awaitable[None]],
+    ):
+        self.websocket = websocket
+        self.evict_after = evict_after
+        self._on_evict = on_evict
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self._full_since: Optional[float] = None
+        self._evict_task: Optional[asyncio.Task] = None
+        self._writer = asyncio.create_task(self._write())
+
+    @property
+    def depth(self) -> int:
+        return self._queue.qsize()
+
+    def send(self, message: str):
+        try:
+            self._queue.put_nowait(message)
+        except asyncio.QueueFull:
+            sender_metrics.dropped += 1
+            now = time.monotonic()
+            if self._full_since is None:
+                self._full_since = now
+            elif now - self._full_since >= self.evict_after and self._evict_task is None:
+                sender_metrics.evicted += 1
+                self._evict_task = asyncio.create_task(self._on_evict(self))
+                self._evict_task.add_done_callback(self._evicted)
+            return
+        sender_metrics.queued += 1
+        if not self._queue.full():
+            self._full_since = None
+
+    @staticmethod
+    def _evicted(task: asyncio.Task):
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("Failed to evict a slow websocket client", exc_info=task.exception())
+
+    async def _write(self):
+        while True:
+            message = await self._queue.get()
+            try:
+                await self.websocket.send_text(message)
+            except Exception:
+                sender_metrics.failed += 1
+                logger.warning("Websocket send failed, stopping its writer", exc_info=True)
+                return
+            sender_metrics.sent += 1
+
+    def close(self):
+        self._writer.cancel()
+
+    async def evict(self):
+        self.close()
+        try:
+            await self.websocket.close(code=SLOW_CONSUMER_CLOSE_CODE)
+        except Exception:
+            logger.warning("Failed to close a slow websocket client", exc_info=True)
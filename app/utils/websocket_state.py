@@ -0,0 +1,106 @@
+import asyncio
+import uuid
+from typing import Dict, Optional, Set
+
+from sqlalchemy import update
+
+from app.database.session import SessionManager
+from app.modules.user_sessions.models import Session
+from app.utils.logging import logger
+
+
+class SessionStateBuffer:
+    """Write-behind store of websocket session states.
+
+    The state of every live session is kept here and changed in memory only.
+    Changed states are written to ``user_session`` at most once per
+    ``flush_after`` seconds, in one bulk update by primary key, so only the
+    last of several changes within the window reaches the database.
+    """
+
+    def __init__(self, flush_after: float):
+        self.flush_after = flush_after
+        self.states: Dict[uuid.UUID, dict] = {}
+        self._dirty: Set[uuid.UUID] = set()
+        self._flush_task: Optional[asyncio.Task] = None
+        self._flushing = False
+        self._closed = False
+        self.updates = 0
+        self.rows_written = 0
+        self.flushes = 0
+        self.failed_flushes = 0
+
+    def get(self, session_id: uuid.UUID, default: Optional[dict] = None) -> Optional[dict]:
+        return self.states.get(session_id, default)
+
+    def set(self, session_id: uuid.UUID, state: dict):
+        self.states[session_id] = state
+        self._dirty.add(session_id)
+        self.updates += 1
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_later())
+
+    def pop(self, session_id: uuid.UUID) -> Optional[dict]:
+        """Forget a session, returning its state if it still has to be written."""
+        state = self.states.pop(session_id, None)
+        if session_id not in self._dirty:
+            return None
+        self._dirty.discard(session_id)
+        self.rows_written += 1
+        return state
+
+    async def _flush_later(self):
+        await asyncio.sleep(self.flush_after)
+        self._flushing = True
+        try:
+            await self.flush()
+        finally:
+            self._flushing = False
+        # Changes made during the write, or a failed write, wait for the next window
+        if self._dirty and not self._closed:
+            self._flush_task = asyncio.create_task(self._flush_later())
+
+    async def flush(self):
+        if not self._dirty:
+            return
+        rows = [
+            {"id": session_id, "state": self.states[session_id]}
+            for session_id in self._dirty
+            if session_id in self.states
+        ]
+        self._dirty.clear()
+        if not rows:
+            return
+        try:
+            async with SessionManager() as session:
+                await session.execute(update(Session), rows)
+        except Exception:
+            self.failed_flushes += 1
+            logger.exception("Failed to write %s websocket session states", len(rows))
+            # Retried with the next flush, unless a newer state is already waiting
+            self._dirty.update(row["id"] for row in rows if row["id"] in self.states)
+            return
+        self.flushes += 1
+        self.rows_written += len(rows)
+
+    async def close(self):
+        self._closed = True
+        task, self._flush_task = self._flush_task, None
+        if task is not None:
+            # A write already in progress is let through, only the wait is cut short
+            if self._flushing:
+                await asyncio.gather(task, return_exceptions=True)
+            else:
+                task.cancel()
+        await self.flush()
+
+    @property
+    def stats(self) -> dict:
+        return {
+            "state_updates": self.updates,
+            "state_rows_written": self.rows_written,
+            "state_writes_saved": self.updates - self.rows_written,
+            "state_flushes": self.flushes,
+            "state_failed_flushes": self.failed_flushes,
+            "state_pending": len(self._dirty),
+        }
@@ -1,3 +1,4 @@
+import asyncio
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
@@ -15,16 +16,22 @@ from app.admin.admin import (
     UserParamAdmin,
 )
 from app.config import settings
-from app.database.session import async_engine
+from app.database.pool import run_pool_liveness_checks, warm_up_pool
+from app.database.session import async_engine, replica_engine
 from app.middlewares.content_length import RequestSizeLimitMiddleware
 from app.middlewares.database_session import UniversalDBSessionMiddleware
 from app.middlewares.get_current_user import OAuth2Backend
+from app.middlewares.query_stats import QueryStatsMiddleware
 from app.modules.calendar.views import calendar_router
 from app.modules.logs.views import log_router
+from app.modules.metrics.views import metrics_router
 from app.modules.notifications.views import notification_router
+from app.modules.progress.views import progress_router
 from app.modules.tasks.views import task_router
+from app.modules.templates.views import template_router
 from app.modules.user_sessions.views import websocket_rout
 from app.modules.users.views import user_router
+from app.utils.token_revocation import token_revocation_store
 from app.utils.websocket_manager import websocket_manager
 
 middlewares = [
@@ -40,12 +47,14 @@ middlewares = [
         max_request_size=settings.MAX_CONTENT_LENGTH,
         include_limits_in_error_responses=settings.LOGLEVEL == "DEBUG",
     ),
+    Middleware(QueryStatsMiddleware),
+    # Authentication runs inside the DB session middleware so both share one session
+    Middleware(UniversalDBSessionMiddleware),
     Middleware(
         AuthenticationMiddleware,
         backend=OAuth2Backend(),
         on_error=OAuth2Backend.handle_error,
     ),
-    Middleware(UniversalDBSessionMiddleware),
 ]
 
 
@@ -57,6 +66,9 @@ routes = [
     notification_router,
     calendar_router,
     task_router,
+    template_router,
+    progress_router,
+    metrics_router,
 ]
 
 
@@ -64,7 +76,25 @@ routes = [
 async def lifespan(_app: FastAPI):
 
     app.state.websocket_manager = websocket_manager
+    engines = [engine for engine in (async_engine, replica_engine) if engine is not None]
+    background_tasks = []
+    if settings.DB_POOL_WARMUP_CONNECTIONS:
+        await asyncio.gather(
+            *(warm_up_pool(engine, settings.DB_POOL_WARMUP_CONNECTIONS) for engine in engines)
+        )
+    if settings.DB_POOL_PRE_PING == "background":
+        background_tasks.append(
+            asyncio.create_task(
+                run_pool_liveness_checks(engines, settings.DB_POOL_LIVENESS_CHECK_SECONDS)
+            )
+        )
+    await token_revocation_store.warm_up()
+    background_tasks.append(asyncio.create_task(token_revocation_store.run()))
+    await websocket_manager.start()
     yield
+    for task in background_tasks:
+        task.cancel()
+    await websocket_manager.stop()
 
 
 def create_app():
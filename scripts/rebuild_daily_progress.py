@@ -0,0 +1,29 @@
+import argparse
+import asyncio
+import uuid
+
+from app.database.session import SessionManager
+from app.modules.progress.logic import rebuild_daily_progress
+from app.utils.logging import logger
+
+
+async def main(user_ids):
+    async with SessionManager() as session:
+        await rebuild_daily_progress(session, user_ids)
+    logger.info("Rebuilt daily progress for %s", "all users" if user_ids is None else user_ids)
+
+
+parser = argparse.ArgumentParser(
+    description="Recompute daily_progress from calendars and tasks, template occurrences"
+    " are counted on read and are not part of it",
+)
+parser.add_argument(
+    "--user-id",
+    dest="user_ids",
+    type=uuid.UUID,
+    action="append",
+    help="Only rebuild these users, may be repeated. All users by default.",
+)
+args = parser.parse_args()
+
+asyncio.run(main(args.user_ids))
@@ -0,0 +1,36 @@
+"""Backplane listener run in worker processes by test_websocket_backplane.
+
+Kept apart from the test module so workers don't import the websocket manager.
+"""
+import asyncio
+import json
+import time
+from typing import List
+
+from app.utils.websocket_backplane import PostgresBackplane
+
+MESSAGES = 2_000
+
+
+def listen(dsn: str, channel: str, ready, results):
+    """Receive MESSAGES broadcasts, then put their delivery latencies on ``results``."""
+
+    async def receive():
+        latencies: List[float] = []
+        done = asyncio.Event()
+
+        async def handler(_room_id: str, message: str):
+            latencies.append(time.time() - json.loads(message)["sent"])
+            if len(latencies) == MESSAGES:
+                done.set()
+
+        backplane = PostgresBackplane(dsn, channel)
+        await backplane.start(handler)
+        ready.set()
+        try:
+            await asyncio.wait_for(done.wait(), timeout=60)
+        finally:
+            await backplane.stop()
+            results.put(latencies)
+
+    asyncio.run(receive())
@@ -0,0 +1,184 @@
+import asyncio
+import os
+import subprocess
+import sys
+import uuid
+from pathlib import Path
+from typing import Any, Dict
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Settings are read when app modules are imported, so everything they need is set up front
+os.environ.setdefault("SECRET_KEY", "test-secret-key")
+os.environ.setdefault("JWT_ALGORITHM", "HS256")
+os.environ.setdefault("SMTP_PASSWORD", "test")
+os.environ.setdefault("INVITE_PROTOCOL", "http")
+os.environ.setdefault("INVITE_DOMAIN", "localhost")
+os.environ.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "30")
+os.environ.setdefault("REFRESH_TOKEN_EXPIRE_MINUTES", "60")
+os.environ.setdefault("LOGLEVEL", "INFO")
+
+# The started Postgres container, and why Postgres is unavailable if it is
+_state: Dict[str, Any] = {"container": None, "error": None}
+
+
+def _start_postgres():
+    """Point POSTGRES_* at the test database, POSTGRES_TEST_* or a testcontainers Postgres."""
+    if os.environ.get("POSTGRES_TEST_HOST"):
+        for name in ("HOST", "PORT", "USER", "PASSWORD", "DB"):
+            os.environ[f"POSTGRES_{name}"] = os.environ[f"POSTGRES_TEST_{name}"]
+        return
+
+    from testcontainers.postgres import PostgresContainer
+
+    container = PostgresContainer("postgres:16-alpine").with_command(
+        "postgres -c max_connections=300"
+    )
+    container.start()
+    _state["container"] = container
+    os.environ["POSTGRES_HOST"] = container.get_container_host_ip()
+    os.environ["POSTGRES_PORT"] = str(container.get_exposed_port(5432))
+    os.environ["POSTGRES_USER"] = container.POSTGRES_USER
+    os.environ["POSTGRES_PASSWORD"] = container.POSTGRES_PASSWORD
+    os.environ["POSTGRES_DB"] = container.POSTGRES_DB
+
+
+def _migrate():
+    # A separate process, alembic's event loop must not own the app engine's connections
+    subprocess.run(
+        [sys.executable, "-m", "alembic", "upgrade", "head"],  # noqa: S603
+        cwd=ROOT,
+        env=os.environ.copy(),
+        check=True,
+        capture_output=True,
+    )
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers", "benchmark: timing measurements, deselect with -m 'not benchmark'"
+    )
+    try:
+        _start_postgres()
+        _migrate()
+    except Exception as error:
+        _state["error"] = f"Postgres is not available: {error}"
+        for name, value in (
+            ("HOST", "localhost"),
+            ("PORT", "5432"),
+            ("USER", "test"),
+            ("PASSWORD", "test"),
+            ("DB", "test"),
+        ):
+            os.environ.setdefault(f"POSTGRES_{name}", value)
+
+
+def pytest_unconfigure(config):
+    if _state["container"] is not None:
+        _state["container"].stop()
+
+
+@pytest.fixture(scope="session")
+def event_loop():
+    # The app engine is module-level, its pooled connections belong to one loop
+    loop = asyncio.new_event_loop()
+    yield loop
+    # Background work such as debounced state flushes is still waiting
+    pending = asyncio.all_tasks(loop)
+    for task in pending:
+        task.cancel()
+    loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+    loop.close()
+
+
+@pytest.fixture(scope="session")
+def database():
+    if _state["error"] is not None:
+        pytest.skip(_state["error"])
+    _import_models()
+
+
+async def truncate_tables():
+    from sqlalchemy import text
+
+    from app.database.session import Base, async_engine
+
+    tables = ", ".join(f'"{table.name}"' for table in Base.metadata.sorted_tables)
+    async with async_engine.begin() as connection:
+        await connection.execute(text(f"TRUNCATE {tables} CASCADE"))
+
+
+def _import_models():
+    # Every mapper the application uses, so relationships between modules resolve
+    import main  # noqa: F401
+
+
+@pytest.fixture
+async def session(database):
+    from app.database.session import AsyncSessionMaker
+
+    async with AsyncSessionMaker() as session:
+        yield session
+    await truncate_tables()
+
+
+@pytest.fixture
+def make_user(session):
+    from sqlalchemy import select
+
+    from app.modules.roles.models import Role
+    from app.modules.users.models import User, UserStatus
+
+    async def make_user(role: str = "user", **values):
+        role_object = await session.scalar(select(Role).where(Role.name == role))
+        if role_object is None:
+            role_object = Role(name=role)
+            session.add(role_object)
+        user = User(
+            email=values.pop("email", f"{uuid.uuid4().hex}@example.com"),
+            hashed_password=values.pop("hashed_password", "not-a-hash"),
+            first_name=values.pop("first_name", "Test"),
+            telegram_url=values.pop("telegram_url", "https://t.me/test"),
+            status=values.pop("status", UserStatus.ACTIVE),
+            role=role_object,
+            **values,
+        )
+        session.add(user)
+        await session.commit()
+        return user
+
+    return make_user
+
+
+@pytest.fixture
+def access_token():
+    from app.utils import jwt_utils
+
+    def access_token(user) -> str:
+        return jwt_utils.create_access_token(data={"sub": user.email})
+
+    return access_token
+
+
+@pytest.fixture
+async def client(database):
+    from httpx import AsyncClient
+
+    from main import app
+
+    async with AsyncClient(app=app, base_url="http://testserver") as client:
+        yield client
+
+
+@pytest.fixture
+async def websocket_manager():
+    from app.utils.websocket_backplane import InMemoryBackplane
+    from app.utils.websocket_manager import websocket_manager
+
+    assert isinstance(websocket_manager.backplane, InMemoryBackplane)
+    await websocket_manager.start()
+    yield websocket_manager
+    for user_id in list(websocket_manager.connections):
+        await websocket_manager.disconnect(user_id)
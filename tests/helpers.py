@@ -0,0 +1,108 @@
+import asyncio
+import json
+import time
+from contextlib import contextmanager
+from typing import Any, Iterator, List, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+
+def percentile(samples: Sequence[float], share: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * share))]
+
+
+def report(name: str, samples: Sequence[float]):
+    """Print a latency summary, shown with ``pytest -s``."""
+    print(  # noqa: T201
+        f"{name}: n={len(samples)} p50={percentile(samples, 0.5) * 1000:.3f}ms "
+        f"p99={percentile(samples, 0.99) * 1000:.3f}ms"
+    )
+
+
+class Timer:
+    """Collects the duration of every ``with timer:`` block."""
+
+    def __init__(self):
+        self.samples: List[float] = []
+
+    def __enter__(self):
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *_exc):
+        self.samples.append(time.perf_counter() - self._started)
+
+
+@contextmanager
+def capture_statements(engine: AsyncEngine) -> Iterator[List[Tuple[str, Any]]]:
+    """Record every statement ``engine`` sends to the database, with its parameters."""
+    statements: List[Tuple[str, Any]] = []
+
+    def before_cursor_execute(_connection, _cursor, statement, parameters, _context, _many):
+        statements.append((statement, parameters))
+
+    event.listen(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+
+
+class FakeWebSocket:
+    """Records sent messages, ``slow`` ones never finish sending."""
+
+    def __init__(self, slow: bool = False):
+        self.slow = slow
+        self.sent: List[str] = []
+        self.close_code: Optional[int] = None
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, message: str):
+        if self.slow:
+            await asyncio.Event().wait()
+        self.sent.append(message)
+
+    async def close(self, code: int = 1000):
+        self.close_code = code
+
+
+class WebSocketClient:
+    """One end of an in-process websocket, fed to the ASGI app as receive/send."""
+
+    def __init__(self, user_id: str):
+        self.user_id = user_id
+        self.inbox: asyncio.Queue = asyncio.Queue()
+        self.inbox.put_nowait({"type": "websocket.connect"})
+        self.accepted = asyncio.Event()
+        self.messages: List[dict] = []
+
+    def scope(self, port: int) -> dict:
+        path = f"/users/{self.user_id}/"
+        return {
+            "type": "websocket",
+            "asgi": {"version": "3.0"},
+            "scheme": "ws",
+            "path": path,
+            "raw_path": path.encode(),
+            "root_path": "",
+            "query_string": b"",
+            "headers": [],
+            "client": ("127.0.0.1", port),
+            "server": ("testserver", 80),
+            "subprotocols": [],
+        }
+
+    async def receive(self) -> dict:
+        return await self.inbox.get()
+
+    async def send(self, message: dict):
+        self.messages.append(message)
+        if message["type"] == "websocket.accept":
+            self.accepted.set()
+
+    def send_text(self, data: dict):
+        self.inbox.put_nowait({"type": "websocket.receive", "text": json.dumps(data)})
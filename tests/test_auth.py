@@ -0,0 +1,87 @@
+import pytest
+from starlette.requests import Request
+
+from app.database.session import LazySession
+from app.middlewares.get_current_user import OAuth2Backend
+from app.utils.auth_cache import AuthUserCache, auth_user_cache
+from tests.helpers import Timer, percentile, report
+
+
+def _request(token: str) -> Request:
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": "/api/users/me/",
+        "query_string": b"",
+        "headers": [(b"authorization", f"Bearer {token}".encode())],
+    }
+    scope["db_session"] = LazySession(scope)
+    return Request(scope)
+
+
+async def _authenticate(backend: OAuth2Backend, token: str):
+    request = _request(token)
+    try:
+        return await backend.authenticate(request)
+    finally:
+        await request.scope["db_session"].close()
+
+
+async def test_auth_cache_counts_hits_and_misses(make_user, access_token):
+    user = await make_user()
+    token = access_token(user)
+    auth_user_cache.clear()
+    hits, misses = auth_user_cache.hits, auth_user_cache.misses
+
+    _, first = await _authenticate(OAuth2Backend(), token)
+    _, second = await _authenticate(OAuth2Backend(), token)
+
+    assert first.id == second.id == user.id
+    assert first is not second
+    assert auth_user_cache.misses == misses + 1
+    assert auth_user_cache.hits == hits + 1
+
+
+async def test_auth_cache_index_does_not_outgrow_cache(make_user):
+    user = await make_user()
+    cache = AuthUserCache(maxsize=10, ttl=60)
+
+    for number in range(1_000):
+        cache.set(f"token-{number}", user)
+
+    assert len(cache._users) == 10
+    assert sum(len(tokens) for tokens in cache._tokens_by_user.values()) <= 20
+
+
+async def test_auth_cache_invalidates_user_after_commit(session, make_user):
+    user = await make_user()
+    auth_user_cache.set("token", user)
+
+    auth_user_cache.invalidate_user_on_commit(session, user.id)
+    assert auth_user_cache.get("token") is not None
+    await session.rollback()
+    assert auth_user_cache.get("token") is not None
+
+    auth_user_cache.invalidate_user_on_commit(session, user.id)
+    await session.commit()
+    assert auth_user_cache.get("token") is None
+
+
+@pytest.mark.benchmark
+async def test_auth_overhead_with_and_without_cache(make_user, access_token):
+    user = await make_user()
+    token = access_token(user)
+    backend = OAuth2Backend()
+    cached, uncached = Timer(), Timer()
+
+    for _ in range(300):
+        auth_user_cache.clear()
+        with uncached:
+            await _authenticate(backend, token)
+    for _ in range(300):
+        with cached:
+            await _authenticate(backend, token)
+
+    report("auth without cache", uncached.samples)
+    report("auth with cache", cached.samples)
+    assert percentile(cached.samples, 0.5) < percentile(uncached.samples, 0.5)
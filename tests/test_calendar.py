@@ -0,0 +1,347 @@
+import json
+from datetime import date, datetime, timedelta
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
+from starlette.requests import Request
+
+from app.database.session import LazySession, async_engine
+from app.modules.calendar.logic import (
+    create_calendar_instance,
+    create_calendar_plan,
+    get_calendar,
+    get_trainer_calendar,
+    get_trainer_dashboard,
+)
+from app.modules.calendar.models import Calendar, CalendarType
+from app.modules.calendar.schemas import (
+    CalendarFilter,
+    CalendarIn,
+    CalendarOut,
+    CalendarPlanIn,
+    PlanCalendarIn,
+    PlanTaskIn,
+)
+from app.modules.calendar.views import get_calendars_range
+from app.modules.progress.models import DailyProgress
+from app.modules.tasks.logic import create_task_instance
+from app.modules.tasks.models import Task
+from app.modules.tasks.schemas import TaskIn
+from app.modules.templates.logic import create_template_instance
+from app.modules.templates.schemas import CalendarTemplateIn, TemplateTaskIn
+from tests.helpers import Timer, capture_statements, percentile, report
+
+
+async def test_create_calendar_loads_both_users_in_one_query(session, make_user):
+    trainer = await make_user(role="trainer")
+    client = await make_user(trainer_id=trainer.id)
+    data = CalendarIn(
+        user_id=client.id,
+        scheduled=datetime(2026, 3, 1, 8),
+        title="Run",
+        type=CalendarType.EXERCISE,
+    )
+    session.expunge_all()
+
+    with capture_statements(async_engine) as statements:
+        calendar = await create_calendar_instance(session, data, trainer)
+        calendar_out = CalendarOut.model_validate(calendar)
+
+    kinds = [statement.split(None, 1)[0] for statement, _ in statements]
+    assert kinds == ["INSERT", "SELECT"]
+    assert " IN " in statements[1][0]
+    assert calendar_out.user.id == client.id
+    assert calendar_out.assigner.id == trainer.id
+    assert calendar_out.tasks == []
+    assert (calendar_out.complete, calendar_out.tasks_total, calendar_out.tasks_done) == (
+        True,
+        0,
+        0,
+    )
+
+
+async def _day_view_statements(session, make_user, clients: int) -> tuple:
+    trainer = await make_user(role="trainer")
+    client_ids = []
+    for _ in range(clients):
+        client = await make_user(trainer_id=trainer.id)
+        calendar = Calendar(
+            user_id=client.id,
+            scheduled=datetime(2026, 3, 1, 8),
+            title="Run",
+            type=CalendarType.EXERCISE,
+        )
+        calendar.tasks = [Task(name="Run", amount=1, unit="km")]
+        session.add(calendar)
+        await create_template_instance(
+            session,
+            CalendarTemplateIn(
+                user_id=client.id,
+                title="Stretch",
+                type=CalendarType.EXERCISE,
+                dtstart=datetime(2026, 2, 1, 18),
+                rrule="FREQ=DAILY",
+                tasks=[TemplateTaskIn(name="Stretch", amount=1, unit="set")],
+            ),
+            trainer,
+        )
+        client_ids.append(client.id)
+    await session.commit()
+    session.expunge_all()
+
+    with capture_statements(async_engine) as client_statements:
+        client_day = [
+            CalendarOut.model_validate(calendar)
+            for calendar in await get_calendar(
+                session, CalendarFilter(user_id=client_ids[0], scheduled=date(2026, 3, 1))
+            )
+        ]
+    with capture_statements(async_engine) as trainer_statements:
+        trainer_day = [
+            CalendarOut.model_validate(calendar)
+            for calendar in await get_trainer_calendar(
+                session, CalendarFilter(user_id=trainer.id, scheduled=date(2026, 3, 1))
+            )
+        ]
+    assert len(client_day) == 2
+    assert len(trainer_day) == 2 * clients
+    assert all(len(calendar.tasks) == 1 for calendar in trainer_day)
+    return len(client_statements), len(trainer_statements)
+
+
+async def test_day_views_issue_a_fixed_number_of_statements(session, make_user):
+    assert await _day_view_statements(session, make_user, 1) == await _day_view_statements(
+        session, make_user, 40
+    )
+
+
+@pytest.mark.parametrize("view", ["/api/calendars/summary/", "/api/calendars/trainer/summary/"])
+async def test_summary_completion(session, make_user, client, access_token, view):
+    trainer = await make_user(role="trainer")
+    owner = await make_user(trainer_id=trainer.id)
+    seeded = {}
+    for hour, completed in enumerate(([], [False, False], [True, False], [True, True]), 8):
+        calendar = Calendar(
+            user_id=owner.id,
+            scheduled=datetime(2026, 3, 1, hour),
+            title="Run",
+            type=CalendarType.EXERCISE,
+        )
+        calendar.tasks = [
+            Task(name="Run", amount=1, unit="km", completed=done) for done in completed
+        ]
+        session.add(calendar)
+        await session.flush()
+        seeded[str(calendar.id)] = (all(completed), len(completed), sum(completed))
+    await session.commit()
+    viewer = trainer if "trainer" in view else owner
+
+    response = await client.post(
+        view,
+        json={"scheduled": "2026-03-01"},
+        headers={"Authorization": f"Bearer {access_token(viewer)}"},
+    )
+
+    assert response.status_code == 200
+    assert {
+        calendar["id"]: (calendar["complete"], calendar["tasks_total"], calendar["tasks_done"])
+        for calendar in response.json()
+    } == seeded
+
+
+async def test_range_stream_releases_the_request_session(session, make_user):
+    user = await make_user()
+    session.add(
+        Calendar(
+            user_id=user.id,
+            scheduled=datetime(2026, 3, 1, 8),
+            title="Run",
+            type=CalendarType.EXERCISE,
+        )
+    )
+    await session.commit()
+    checked_out = async_engine.pool.checkedout()
+    scope = {"type": "http", "method": "GET", "path": "/", "headers": [], "query_string": b""}
+    scope["db_session"] = LazySession(scope)
+    request_session = await scope["db_session"].get()
+    await request_session.execute(select(1))
+
+    response = await get_calendars_range(
+        request=Request(scope),
+        date_from=date(2026, 3, 1),
+        date_to=date(2026, 3, 2),
+        type=None,
+        user_id=None,
+        timezone=None,
+        current_user=user,
+    )
+
+    assert async_engine.pool.checkedout() == checked_out
+    lines = [json.loads(line) async for line in response.body_iterator]
+    assert [line["day"] for line in lines] == ["2026-03-01"]
+
+
+async def test_dashboard_last_completed_ignores_later_days(session, make_user):
+    trainer = await make_user(role="trainer")
+    client = await make_user(trainer_id=trainer.id)
+    for scheduled, name in ((datetime(2026, 3, 1, 8), "Done"), (datetime(2026, 3, 9, 8), "Ahead")):
+        calendar = Calendar(
+            user_id=client.id, scheduled=scheduled, title=name, type=CalendarType.EXERCISE
+        )
+        calendar.tasks = [Task(name=name, amount=1, unit="set", completed=True)]
+        session.add(calendar)
+    await session.commit()
+
+    dashboard = await get_trainer_dashboard(session, trainer.id, date(2026, 3, 2))
+
+    [summary] = dashboard.clients
+    assert summary.last_completed_task == "Done"
+    assert summary.last_completed_at == datetime(2026, 3, 1, 8)
+
+
+async def test_copy_shifts_a_range_to_a_client(session, make_user, client, access_token):
+    trainer = await make_user(role="trainer")
+    source, target = await make_user(trainer_id=trainer.id), await make_user(trainer_id=trainer.id)
+    for scheduled, tasks in (
+        (datetime(2026, 3, 1, 8), 2),
+        (datetime(2026, 3, 2, 18), 1),
+        (datetime(2026, 3, 3, 8), 4),
+    ):
+        calendar = Calendar(
+            user_id=source.id, scheduled=scheduled, title="Run", type=CalendarType.EXERCISE
+        )
+        calendar.tasks = [
+            Task(name=f"Task {number}", amount=1, unit="km", completed=True)
+            for number in range(tasks)
+        ]
+        session.add(calendar)
+    await session.commit()
+
+    response = await client.post(
+        "/api/calendars/copy/",
+        json={
+            "source_user_id": str(source.id),
+            "target_user_ids": [str(target.id)],
+            "date_from": "2026-03-01",
+            "date_to": "2026-03-02",
+            "offset_days": 7,
+        },
+        headers={"Authorization": f"Bearer {access_token(trainer)}"},
+    )
+
+    assert response.status_code == 200
+    assert response.json() == {"calendars": 2, "tasks": 3}
+    copies = (
+        await session.scalars(
+            select(Calendar)
+            .where(Calendar.user_id == target.id)
+            .order_by(Calendar.scheduled)
+            .options(selectinload(Calendar.tasks))
+        )
+    ).all()
+    assert [calendar.scheduled for calendar in copies] == [
+        datetime(2026, 3, 8, 8),
+        datetime(2026, 3, 9, 18),
+    ]
+    assert [calendar.assigner_id for calendar in copies] == [trainer.id, trainer.id]
+    assert [[task.completed for task in calendar.tasks] for calendar in copies] == [
+        [False, False],
+        [False],
+    ]
+    progress = await session.execute(
+        select(DailyProgress.day, DailyProgress.total, DailyProgress.done)
+        .where(DailyProgress.user_id == target.id)
+        .order_by(DailyProgress.day)
+    )
+    assert [tuple(row) for row in progress] == [(date(2026, 3, 8), 2, 0), (date(2026, 3, 9), 1, 0)]
+
+
+async def test_copy_is_limited_to_own_clients(session, make_user, client, access_token):
+    trainer = await make_user(role="trainer")
+    own_client = await make_user(trainer_id=trainer.id)
+    stranger = await make_user()
+    payload = {"date_from": "2026-03-01", "date_to": "2026-03-02"}
+    headers = {"Authorization": f"Bearer {access_token(trainer)}"}
+
+    statuses = [
+        (
+            await client.post(
+                "/api/calendars/copy/",
+                json={
+                    **payload,
+                    "source_user_id": str(source.id),
+                    "target_user_ids": [str(target.id) for target in targets],
+                },
+                headers=headers,
+            )
+        ).status_code
+        for source, targets in (
+            (trainer, [own_client]),
+            (stranger, [own_client]),
+            (own_client, [trainer, stranger]),
+        )
+    ]
+
+    assert statuses == [200, 403, 403]
+
+
+def _plan(user_id, calendars: int = 30, tasks: int = 5) -> CalendarPlanIn:
+    return CalendarPlanIn(
+        user_id=user_id,
+        calendars=[
+            PlanCalendarIn(
+                scheduled=datetime(2026, 3, 1, 8) + timedelta(days=number),
+                title=f"Day {number}",
+                type=CalendarType.EXERCISE,
+                tasks=[
+                    PlanTaskIn(name=f"Task {task}", amount=10, unit="reps")
+                    for task in range(tasks)
+                ],
+            )
+            for number in range(calendars)
+        ],
+    )
+
+
+async def _create_item_by_item(session, plan: CalendarPlanIn, current_user):
+    for plan_calendar in plan.calendars:
+        calendar = await create_calendar_instance(
+            session,
+            CalendarIn(
+                user_id=plan.user_id,
+                scheduled=plan_calendar.scheduled,
+                title=plan_calendar.title,
+                type=plan_calendar.type,
+            ),
+            current_user,
+        )
+        for task in plan_calendar.tasks:
+            await create_task_instance(
+                session, TaskIn(calendar_id=calendar.id, **task.model_dump())
+            )
+
+
+def test_plan_task_completed_is_not_nullable():
+    with pytest.raises(ValueError, match="completed"):
+        PlanTaskIn(name="Run", amount=1, unit="km", completed=None)
+
+
+@pytest.mark.benchmark
+async def test_plan_against_item_by_item(session, make_user):
+    trainer = await make_user(role="trainer")
+    client = await make_user(trainer_id=trainer.id)
+    plan_timer, items_timer = Timer(), Timer()
+
+    for _ in range(10):
+        with capture_statements(async_engine) as plan_statements, plan_timer:
+            await create_calendar_plan(session, _plan(client.id), trainer)
+            await session.commit()
+        with capture_statements(async_engine) as item_statements, items_timer:
+            await _create_item_by_item(session, _plan(client.id), trainer)
+            await session.commit()
+
+    report("plan of 30 calendars x 5 tasks", plan_timer.samples)
+    report("the same, item by item", items_timer.samples)
+    assert len(plan_statements) < len(item_statements) / 10
+    assert percentile(plan_timer.samples, 0.5) < percentile(items_timer.samples, 0.5)
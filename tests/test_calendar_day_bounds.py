@@ -0,0 +1,98 @@
+import os
+import uuid
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import Date, and_, cast, select, text
+
+from app.database.session import async_engine
+from app.modules.calendar.logic import get_day_bounds
+from app.modules.calendar.models import Calendar, CalendarType
+from app.modules.calendar.schemas import CalendarIn
+from tests.conftest import truncate_tables
+from tests.helpers import Timer, percentile, report
+
+# The request measured 10M rows, the default keeps the suite quick
+BENCHMARK_ROWS = int(os.environ.get("CALENDAR_BENCHMARK_ROWS", "200000"))
+
+
+def test_day_bounds_are_utc_without_timezone():
+    assert get_day_bounds(date(2026, 3, 1)) == (datetime(2026, 3, 1), datetime(2026, 3, 2))
+
+
+def test_day_bounds_are_the_local_day_in_utc():
+    start, end = get_day_bounds(date(2026, 3, 1), "Europe/Moscow")
+
+    assert start == datetime(2026, 2, 28, 21)
+    assert end == datetime(2026, 3, 1, 21)
+
+
+def test_scheduled_is_stored_as_naive_utc():
+    moscow = timezone(timedelta(hours=3))
+
+    aware = CalendarIn(
+        user_id=uuid.uuid4(),
+        scheduled=datetime(2026, 3, 1, 8, tzinfo=moscow),
+        title="Run",
+        type=CalendarType.EXERCISE,
+    )
+    naive = CalendarIn(
+        user_id=uuid.uuid4(),
+        scheduled=datetime(2026, 3, 1, 5),
+        title="Run",
+        type=CalendarType.EXERCISE,
+    )
+
+    assert aware.scheduled == naive.scheduled == datetime(2026, 3, 1, 5)
+
+
+@pytest.mark.benchmark
+async def test_day_range_against_date_cast(database):
+    async with async_engine.begin() as connection:
+        await connection.execute(
+            text(
+                "INSERT INTO users (id, email, hashed_password, first_name, status,"
+                " created_at, changed_at)"
+                " SELECT gen_random_uuid(), 'bench-' || n || '@example.com', 'x', 'Bench',"
+                " 'ACTIVE', now(), now() FROM generate_series(1, 1000) AS n"
+            )
+        )
+        await connection.execute(
+            text(
+                "INSERT INTO calendars (id, user_id, scheduled, type, title)"
+                " SELECT gen_random_uuid(), users.id,"
+                " timestamp '2026-01-01' + (n * interval '7 hours'), 'EXERCISE', 'Bench'"
+                " FROM users, generate_series(1, :per_user) AS n"
+            ),
+            {"per_user": max(BENCHMARK_ROWS // 1000, 1)},
+        )
+        await connection.execute(text("ANALYZE calendars"))
+        user_id = await connection.scalar(text("SELECT id FROM users LIMIT 1"))
+    day = date(2026, 1, 20)
+    day_start, day_end = get_day_bounds(day)
+    sargable = select(Calendar.id).where(
+        and_(
+            Calendar.user_id == user_id,
+            Calendar.scheduled >= day_start,
+            Calendar.scheduled < day_end,
+        )
+    )
+    casted = select(Calendar.id).where(
+        and_(Calendar.user_id == user_id, cast(Calendar.scheduled, Date) == day)
+    )
+    range_timer, cast_timer = Timer(), Timer()
+
+    try:
+        async with async_engine.connect() as connection:
+            assert set(await connection.scalars(sargable)) == set(await connection.scalars(casted))
+            for _ in range(200):
+                with range_timer:
+                    await connection.execute(sargable)
+                with cast_timer:
+                    await connection.execute(casted)
+    finally:
+        await truncate_tables()
+
+    report(f"day as a scheduled range, {BENCHMARK_ROWS} rows", range_timer.samples)
+    report(f"day as a date cast, {BENCHMARK_ROWS} rows", cast_timer.samples)
+    assert percentile(range_timer.samples, 0.5) <= percentile(cast_timer.samples, 0.5)
@@ -0,0 +1,86 @@
+import uuid
+from types import SimpleNamespace
+
+from sqlalchemy import select, text
+
+from app.database.routing import PRIMARY_PIN_COOKIE, has_primary_pin, primary_pin_cookie
+from app.database.session import LazySession, async_engine
+from app.middlewares.database_session import DBSessionMiddleware
+from app.modules.roles.models import Role
+
+
+def _scope(method: str = "GET", user_id=None, cookie=None):
+    headers = [(b"cookie", cookie.encode())] if cookie else []
+    scope = {"type": "http", "method": method, "path": "/", "headers": headers}
+    if user_id is not None:
+        scope["user"] = SimpleNamespace(id=user_id)
+    return scope
+
+
+def _pin(cookie_header: str) -> str:
+    return f"{PRIMARY_PIN_COOKIE}={cookie_header.split(';')[0].split('=', 1)[1]}"
+
+
+async def _run(middleware_app, scope):
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def send(message):
+        messages.append((message, async_engine.pool.checkedout()))
+
+    await DBSessionMiddleware(middleware_app)(scope, receive, send)
+    return messages
+
+
+async def test_read_request_releases_connection_at_response_start(database):
+    async def app(scope, _receive, send):
+        session = await scope["db_session"].get()
+        await session.execute(select(1))
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"{}"})
+
+    checked_out = async_engine.pool.checkedout()
+    messages = await _run(app, _scope())
+
+    assert [checked for _, checked in messages] == [checked_out, checked_out]
+
+
+async def test_write_sets_signed_primary_pin_cookie(session):
+    user_id = uuid.uuid4()
+
+    async def app(scope, _receive, send):
+        db_session = await scope["db_session"].get()
+        db_session.add(Role(name="pinned"))
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"{}"})
+
+    messages = await _run(app, _scope(method="POST", user_id=user_id))
+
+    headers = dict(messages[0][0]["headers"])
+    cookie = _pin(headers[b"set-cookie"].decode())
+    assert await session.scalar(select(Role.name).where(Role.name == "pinned")) == "pinned"
+    assert has_primary_pin(_scope(cookie=cookie), user_id)
+    assert not has_primary_pin(_scope(cookie=cookie), uuid.uuid4())
+    assert not has_primary_pin(_scope(cookie=cookie[:-1] + "x"), user_id)
+
+
+def test_primary_pin_routes_reads_to_the_primary():
+    user_id = uuid.uuid4()
+    cookie = _pin(primary_pin_cookie(user_id))
+
+    assert LazySession(_scope(user_id=user_id))._wants_read_only()
+    assert not LazySession(_scope(user_id=user_id, cookie=cookie))._wants_read_only()
+
+
+async def test_skipped_commit_ends_the_transaction(database):
+    lazy_session = LazySession(_scope())
+    session = await lazy_session.get()
+    await session.execute(text("SELECT 1"))
+    assert session.in_transaction()
+
+    await lazy_session.commit()
+
+    assert lazy_session.session is None
+    assert not session.in_transaction()
@@ -0,0 +1,45 @@
+import time
+from datetime import timedelta
+
+import pytest
+
+from app.config import settings
+from app.utils import jwt_utils
+
+
+def test_decode_cache_is_keyed_by_signing_key(monkeypatch):
+    token = jwt_utils.create_access_token(data={"sub": "user@example.com"})
+    assert jwt_utils.decode_token_claims(token)["sub"] == "user@example.com"
+
+    monkeypatch.setattr(settings, "SECRET_KEY", "rotated-secret-key")
+    assert jwt_utils.decode_token_claims(token) is None
+
+
+def test_expired_token_is_not_decoded():
+    token = jwt_utils.create_access_token(
+        data={"sub": "user@example.com"}, expires_delta=timedelta(seconds=-1)
+    )
+    assert jwt_utils.decode_token_claims(token) is None
+
+
+def _throughput(tokens, rounds: int) -> float:
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for token in tokens:
+            jwt_utils.decode_token_claims(token)
+    return rounds * len(tokens) / (time.perf_counter() - started)
+
+
+@pytest.mark.benchmark
+def test_decode_throughput():
+    tokens = [
+        jwt_utils.create_access_token(data={"sub": f"user-{number}@example.com"})
+        for number in range(1_000)
+    ]
+
+    jwt_utils._verified_claims.clear()
+    uncached = _throughput(tokens, rounds=1)
+    cached = _throughput(tokens, rounds=20)
+
+    print(f"jwt decode: {uncached:,.0f}/s verified, {cached:,.0f}/s cached")  # noqa: T201
+    assert cached > uncached
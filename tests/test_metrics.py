@@ -0,0 +1,14 @@
+async def test_metrics_require_the_metrics_role(client, make_user, access_token):
+    user = await make_user(role="trainer")
+    admin = await make_user(role="admin")
+
+    forbidden = await client.get(
+        "/api/metrics/", headers={"Authorization": f"Bearer {access_token(user)}"}
+    )
+    allowed = await client.get(
+        "/api/metrics/", headers={"Authorization": f"Bearer {access_token(admin)}"}
+    )
+
+    assert forbidden.status_code == 403
+    assert allowed.status_code == 200
+    assert "database" in allowed.json()
@@ -0,0 +1,42 @@
+import asyncio
+import time
+
+import pytest
+
+from app.utils.hashing import Hasher, password_hashing_pool
+from tests.helpers import percentile, report
+
+PASSWORD = "correct horse battery staple"  # noqa: S105
+
+
+async def _probe_loop_lag(samples, stop: asyncio.Event, interval: float = 0.005):
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        samples.append(time.perf_counter() - started - interval)
+
+
+@pytest.mark.benchmark
+async def test_event_loop_lag_during_concurrent_logins(client, make_user):
+    user = await make_user(hashed_password=Hasher.get_password_hash(PASSWORD))
+    lag, stop = [], asyncio.Event()
+    probe = asyncio.create_task(_probe_loop_lag(lag, stop))
+    rejected = password_hashing_pool.rejected
+
+    responses = await asyncio.gather(
+        *(
+            client.post("/api/users/login/", json={"email": user.email, "password": PASSWORD})
+            for _ in range(50)
+        )
+    )
+    stop.set()
+    await probe
+
+    report("event loop lag during 50 logins", lag)
+    statuses = [response.status_code for response in responses]
+    # Logins over PASSWORD_HASHING_QUEUE_LIMIT are shed with 503 instead of queueing
+    assert set(statuses) <= {200, 503}
+    assert statuses.count(503) == password_hashing_pool.rejected - rejected
+    assert statuses.count(200) > 0
+    # One bcrypt round on the loop alone would stall it for far longer than this
+    assert percentile(lag, 0.99) < 0.05
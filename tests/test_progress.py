@@ -0,0 +1,120 @@
+import uuid
+from datetime import date, datetime
+
+from sqlalchemy import select
+
+from app.modules.calendar.logic import delete_calendar_logic
+from app.modules.calendar.models import Calendar, CalendarType
+from app.modules.progress.logic import get_progress, get_streak, rebuild_daily_progress
+from app.modules.progress.models import DailyProgress
+from app.modules.tasks.logic import (
+    create_task_instance,
+    delete_task_logic,
+    update_task_status_logic,
+    update_tasks_status_logic,
+)
+from app.modules.tasks.schemas import TaskIn
+from app.modules.templates.logic import create_template_instance, set_template_task_completion
+from app.modules.templates.schemas import (
+    CalendarTemplateIn,
+    TemplateTaskCompletionIn,
+    TemplateTaskIn,
+)
+
+
+async def _daily_progress(session, user_id: uuid.UUID) -> set:
+    # Writes leave emptied days behind as zeros, a rebuild doesn't create them
+    rows = await session.execute(
+        select(
+            DailyProgress.day, DailyProgress.type, DailyProgress.total, DailyProgress.done
+        ).where(DailyProgress.user_id == user_id, DailyProgress.total > 0)
+    )
+    return {tuple(row) for row in rows}
+
+
+async def test_rollup_matches_a_rebuild(session, make_user):
+    user = await make_user()
+    calendars = [
+        Calendar(user_id=user.id, scheduled=scheduled, title="Day", type=calendar_type)
+        for scheduled, calendar_type in (
+            (datetime(2026, 3, 1, 8), CalendarType.EXERCISE),
+            (datetime(2026, 3, 1, 20), CalendarType.FOOD),
+            (datetime(2026, 3, 2, 8), CalendarType.EXERCISE),
+            (datetime(2026, 3, 3, 8), CalendarType.FOOD),
+        )
+    ]
+    session.add_all(calendars)
+    await session.flush()
+    tasks = [
+        await create_task_instance(
+            session, TaskIn(calendar_id=calendar.id, name=f"Task {number}", amount=1, unit="set")
+        )
+        for calendar in calendars
+        for number in range(3)
+    ]
+    await update_tasks_status_logic(session, [task.id for task in tasks[:5]], True)
+    await update_task_status_logic(session, tasks[1].id, False)
+    await delete_task_logic(session, tasks[0].id)
+    await delete_task_logic(session, tasks[8].id)
+    await delete_calendar_logic(session, calendars[3].id)
+    await session.commit()
+
+    maintained = await _daily_progress(session, user.id)
+    await rebuild_daily_progress(session, [user.id])
+    await session.commit()
+
+    assert maintained == await _daily_progress(session, user.id)
+    assert maintained == {
+        (date(2026, 3, 1), CalendarType.EXERCISE, 2, 1),
+        (date(2026, 3, 1), CalendarType.FOOD, 3, 2),
+        (date(2026, 3, 2), CalendarType.EXERCISE, 2, 0),
+    }
+
+
+async def test_progress_counts_template_occurrences(session, make_user):
+    user = await make_user()
+    template = await create_template_instance(
+        session,
+        CalendarTemplateIn(
+            user_id=user.id,
+            title="Run",
+            type=CalendarType.EXERCISE,
+            dtstart=datetime(2026, 3, 1, 8),
+            rrule="FREQ=DAILY;COUNT=3",
+            tasks=[TemplateTaskIn(name=name, amount=1, unit="km") for name in ("Warm up", "Run")],
+        ),
+        user,
+    )
+    calendar = Calendar(
+        user_id=user.id,
+        scheduled=datetime(2026, 3, 2, 20),
+        title="Stretch",
+        type=CalendarType.EXERCISE,
+    )
+    session.add(calendar)
+    await session.flush()
+    task = await create_task_instance(
+        session, TaskIn(calendar_id=calendar.id, name="Stretch", amount=1, unit="set")
+    )
+    await update_task_status_logic(session, task.id, True)
+    for occurrence in (datetime(2026, 3, 1, 8), datetime(2026, 3, 2, 8)):
+        for template_task in template.tasks:
+            await set_template_task_completion(
+                session,
+                TemplateTaskCompletionIn(template_task_id=template_task.id, occurrence=occurrence),
+            )
+    await session.commit()
+
+    days = await get_progress(session, user.id, date(2026, 3, 1), date(2026, 3, 5))
+    streak = await get_streak(session, user.id, date(2026, 3, 3))
+    food = await get_progress(
+        session, user.id, date(2026, 3, 1), date(2026, 3, 5), CalendarType.FOOD
+    )
+
+    assert [tuple(day) for day in days] == [
+        (date(2026, 3, 1), 2, 2),
+        (date(2026, 3, 2), 3, 3),
+        (date(2026, 3, 3), 2, 0),
+    ]
+    assert streak == 2
+    assert food == []
@@ -0,0 +1,241 @@
+"""Hot query paths must be served by the indexes of the hot_path_indexes migration.
+
+Volumes are seeded so the planner prefers an index over a sequential scan for
+one user's rows, scale them with EXPLAIN_SEED_SCALE.
+"""
+import json
+import os
+from datetime import date
+from typing import Any, Dict, Iterator, List, Set, Tuple
+
+import pytest
+from sqlalchemy import text
+
+from app.database.session import AsyncSessionMaker, async_engine
+from app.modules.calendar.logic import get_calendar
+from app.modules.calendar.schemas import CalendarFilter
+from app.modules.invites.logic import update_or_get_invite_object_logic
+from app.modules.logs.logic import get_log_report_logic
+from app.modules.logs.models import Logs
+from app.modules.notifications.views import get_notifications
+from app.modules.tasks.logic import get_task_instances
+from app.modules.users.logic import create_user_fingerprint_logic
+from app.modules.users.models import User
+from app.utils.websocket_manager import websocket_manager
+from tests.conftest import truncate_tables
+from tests.helpers import capture_statements
+
+SCALE = int(os.environ.get("EXPLAIN_SEED_SCALE", "1"))
+USERS = 2_000 * SCALE
+TRAINERS = 50 * SCALE
+
+SEED = (
+    f"""
+    INSERT INTO users (id, email, hashed_password, first_name, telegram_url, status,
+                       created_at, changed_at)
+    SELECT gen_random_uuid(), 'seed-' || n || '@example.com', 'x', 'Seed', '', 'ACTIVE',
+           now(), now()
+    FROM generate_series(1, {USERS}) AS n
+    """,
+    f"""
+    WITH trainers AS (
+        SELECT id, row_number() OVER (ORDER BY id) - 1 AS number
+        FROM users ORDER BY id LIMIT {TRAINERS}
+    )
+    UPDATE users SET trainer_id = trainers.id
+    FROM trainers
+    WHERE trainers.number = abs(hashtext(users.id::text)) % {TRAINERS}
+      AND users.id NOT IN (SELECT id FROM trainers)
+    """,
+    """
+    INSERT INTO calendars (id, user_id, scheduled, type, title)
+    SELECT gen_random_uuid(), users.id, timestamp '2026-01-01 08:00' + n * interval '1 day',
+           (CASE WHEN n % 2 = 0 THEN 'FOOD' ELSE 'EXERCISE' END)::calendartype, 'Seed'
+    FROM users, generate_series(1, 30) AS n
+    """,
+    """
+    INSERT INTO tasks (id, calendar_id, name, completed)
+    SELECT gen_random_uuid(), calendars.id, 'Task ' || n, n = 1
+    FROM calendars, generate_series(1, 3) AS n
+    """,
+    """
+    INSERT INTO logs (id, type, name, created_at, user_id)
+    SELECT gen_random_uuid(), 'view', 'Seed', now() - n * interval '1 minute', users.id
+    FROM users, generate_series(1, 50) AS n
+    """,
+    """
+    INSERT INTO notifications (id, type, message, status, user_id, created_at)
+    SELECT gen_random_uuid(), 'INVITE', 'Seed', 'NEW', users.id, now() - n * interval '1 minute'
+    FROM users, generate_series(1, 25) AS n
+    """,
+    """
+    INSERT INTO user_fingerprint (id, user_id, created_at, updated_at, fingerprint_data)
+    SELECT gen_random_uuid(), users.id, now(), now() - n * interval '1 day',
+           json_build_object('seed', n)
+    FROM users, generate_series(1, 5) AS n
+    """,
+    """
+    INSERT INTO user_session (id, user_id, fingerprint_id, ip, location, start_at, end_at)
+    SELECT gen_random_uuid(), fingerprints.user_id, fingerprints.id, '127.0.0.1', '',
+           now() - n * interval '1 hour',
+           CASE WHEN n > 1 THEN now() - n * interval '1 hour' + interval '10 minutes' END
+    FROM (SELECT DISTINCT ON (user_id) id, user_id FROM user_fingerprint) AS fingerprints,
+         generate_series(1, 25) AS n
+    """,
+    f"""
+    INSERT INTO invites (id, email, created_at)
+    SELECT gen_random_uuid(), 'invite-' || n || '@example.com', now()
+    FROM generate_series(1, {10 * USERS}) AS n
+    """,
+    f"""
+    INSERT INTO chats (id, title, archived, created_at)
+    SELECT gen_random_uuid(), 'Chat ' || n, false, now()
+    FROM generate_series(1, {USERS // 2}) AS n
+    """,
+    """
+    INSERT INTO messages (id, author_id, chat_id, content, created_at)
+    SELECT gen_random_uuid(), (SELECT min(id::text)::uuid FROM users), chats.id, 'Seed',
+           now() - n * interval '1 minute'
+    FROM chats, generate_series(1, 100) AS n
+    """,
+)
+
+INDEX_NODES = {"Index Scan", "Index Only Scan", "Bitmap Index Scan"}
+
+
+@pytest.fixture(scope="module")
+async def seeded(database) -> Dict[str, Any]:
+    async with async_engine.begin() as connection:
+        for statement in SEED:
+            await connection.execute(text(statement))
+    async with async_engine.connect() as connection:
+        await connection.execution_options(isolation_level="AUTOCOMMIT")
+        await connection.execute(text("ANALYZE"))
+        row = (
+            await connection.execute(
+                text(
+                    "SELECT users.trainer_id, users.id AS user_id, calendars.id AS calendar_id,"
+                    " (SELECT id FROM chats LIMIT 1) AS chat_id"
+                    " FROM users JOIN calendars ON calendars.user_id = users.id"
+                    " WHERE users.trainer_id IS NOT NULL LIMIT 1"
+                )
+            )
+        ).one()
+    yield row._asdict()
+    await truncate_tables()
+
+
+def _nodes(plan: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    yield plan
+    for child in plan.get("Plans", ()):
+        yield from _nodes(child)
+
+
+async def _scans(statements: List[Tuple[str, Any]], table: str) -> Set[Tuple[str, str]]:
+    """(node type, index name or relation) of every scan of ``table`` in the plans."""
+    scans = set()
+    async with async_engine.connect() as connection:
+        for statement, parameters in statements:
+            if f"FROM {table}" not in statement and f"UPDATE {table}" not in statement:
+                continue
+            result = await connection.exec_driver_sql(
+                f"EXPLAIN (FORMAT JSON) {statement}", parameters
+            )
+            plan = result.scalar()
+            plan = json.loads(plan) if isinstance(plan, str) else plan
+            for node in _nodes(plan[0]["Plan"]):
+                if node.get("Relation Name") == table or node.get("Index Name", "").startswith(
+                    f"ix_{table}_"
+                ):
+                    scans.add((node["Node Type"], node.get("Index Name", table)))
+    assert scans, f"no statement read {table}"
+    return scans
+
+
+async def _assert_index_scan(statements: List[Tuple[str, Any]], table: str, index: str):
+    scans = await _scans(statements, table)
+    assert ("Seq Scan", table) not in scans, scans
+    assert any(node in INDEX_NODES and name == index for node, name in scans), scans
+
+
+async def test_calendar_day_uses_user_scheduled_index(seeded):
+    with capture_statements(async_engine) as statements:
+        async with AsyncSessionMaker() as session:
+            await get_calendar(
+                session, CalendarFilter(user_id=seeded["user_id"], scheduled=date(2026, 1, 5))
+            )
+
+    await _assert_index_scan(statements, "calendars", "ix_calendars_user_id_scheduled")
+    await _assert_index_scan(statements, "tasks", "ix_tasks_calendar_id")
+
+
+async def test_task_instances_use_calendar_id_index(seeded):
+    with capture_statements(async_engine) as statements:
+        async with AsyncSessionMaker() as session:
+            await get_task_instances(session, seeded["calendar_id"])
+
+    await _assert_index_scan(statements, "tasks", "ix_tasks_calendar_id")
+
+
+async def test_log_report_uses_user_created_at_index(seeded):
+    with capture_statements(async_engine) as statements:
+        async with AsyncSessionMaker() as session:
+            await get_log_report_logic([Logs.user_id == seeded["user_id"]], session)
+
+    await _assert_index_scan(statements, "logs", "ix_logs_user_id_created_at")
+
+
+async def test_notifications_use_user_created_at_index(seeded):
+    with capture_statements(async_engine) as statements:
+        async with AsyncSessionMaker() as session:
+            await get_notifications(session=session, current_user=User(id=seeded["user_id"]))
+
+    await _assert_index_scan(statements, "notifications", "ix_notifications_user_id_created_at")
+
+
+async def test_open_sessions_use_user_end_at_index(seeded):
+    websocket_manager.connections[str(seeded["user_id"])] = None
+    with capture_statements(async_engine) as statements:
+        await websocket_manager.close_all_connections()
+
+    await _assert_index_scan(statements, "user_session", "ix_user_session_user_id_end_at")
+
+
+async def test_fingerprint_lookup_uses_user_updated_at_index(seeded):
+    with capture_statements(async_engine) as statements:
+        async with AsyncSessionMaker() as session:
+            await create_user_fingerprint_logic('{"seed": 0}', session, seeded["user_id"])
+            await session.rollback()
+
+    await _assert_index_scan(
+        statements, "user_fingerprint", "ix_user_fingerprint_user_id_updated_at"
+    )
+
+
+async def test_invite_lookup_uses_email_index(seeded):
+    with capture_statements(async_engine) as statements:
+        async with AsyncSessionMaker() as session:
+            await update_or_get_invite_object_logic(session, "invite-7@example.com")
+            await session.rollback()
+
+    await _assert_index_scan(statements, "invites", "ix_invites_email")
+
+
+async def test_trainer_clients_use_trainer_id_index(seeded):
+    with capture_statements(async_engine) as statements:
+        async with AsyncSessionMaker() as session:
+            await User.get_clients_by_trainer_id(session, seeded["trainer_id"])
+
+    await _assert_index_scan(statements, "users", "ix_users_trainer_id")
+
+
+async def test_chat_messages_use_chat_created_at_index(seeded):
+    # The chats module isn't mounted, so this is the statement of get_messages_by_chat_id
+    statement = (
+        "SELECT messages.id, messages.content, messages.created_at FROM messages"
+        " WHERE messages.chat_id = $1::UUID ORDER BY messages.created_at DESC"
+    )
+
+    await _assert_index_scan(
+        [(statement, (seeded["chat_id"],))], "messages", "ix_messages_chat_id_created_at"
+    )
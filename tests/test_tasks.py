@@ -0,0 +1,108 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import select
+
+from app.modules.calendar.models import Calendar, CalendarType
+from app.modules.progress.models import DailyProgress
+from app.modules.tasks.logic import create_task_instance, update_tasks_status_logic
+from app.modules.tasks.models import Task
+from app.modules.tasks.schemas import TaskIn
+
+
+async def _calendar(session, user) -> Calendar:
+    calendar = Calendar(
+        user_id=user.id,
+        scheduled=datetime(2026, 3, 1, 8),
+        title="Run",
+        type=CalendarType.EXERCISE,
+    )
+    session.add(calendar)
+    await session.flush()
+    return calendar
+
+
+async def _progress(session, user) -> tuple:
+    return tuple(
+        (
+            await session.execute(
+                select(DailyProgress.total, DailyProgress.done).where(
+                    DailyProgress.user_id == user.id
+                )
+            )
+        ).one()
+    )
+
+
+async def test_created_task_returns_its_calendar_columns(session, make_user):
+    user = await make_user()
+    calendar = await _calendar(session, user)
+
+    task = await create_task_instance(
+        session, TaskIn(calendar_id=calendar.id, name="Run", amount=5, unit="km", completed=True)
+    )
+
+    assert (task.calendar_id, task.name, task.amount, task.unit, task.completed) == (
+        calendar.id,
+        "Run",
+        5,
+        "km",
+        True,
+    )
+    assert (task.user_id, task.scheduled, task.type) == (
+        user.id,
+        datetime(2026, 3, 1, 8),
+        CalendarType.EXERCISE,
+    )
+    assert await _progress(session, user) == (1, 1)
+
+
+async def test_bulk_status_returns_unchanged_tasks_and_ignores_unknown_ids(session, make_user):
+    user = await make_user()
+    calendar = await _calendar(session, user)
+    done, pending = [
+        await create_task_instance(
+            session,
+            TaskIn(calendar_id=calendar.id, name=name, amount=1, unit="set", completed=completed),
+        )
+        for name, completed in (("Done", True), ("Pending", False))
+    ]
+
+    tasks = await update_tasks_status_logic(
+        session, [done.id, pending.id, uuid.uuid4()], completed=True
+    )
+
+    assert sorted((task.name, task.completed) for task in tasks) == [
+        ("Done", True),
+        ("Pending", True),
+    ]
+    assert {task.user_id for task in tasks} == {user.id}
+    assert await _progress(session, user) == (2, 2)
+
+
+async def test_bulk_status_view(session, make_user, client):
+    user = await make_user()
+    calendar = await _calendar(session, user)
+    tasks = [
+        Task(calendar_id=calendar.id, name=f"Task {number}", amount=1, unit="set")
+        for number in range(3)
+    ]
+    tasks[0].completed = True
+    session.add_all(tasks)
+    await session.commit()
+
+    response = await client.post(
+        "/api/tasks/complete/bulk/",
+        json={
+            "task_ids": [str(task.id) for task in tasks[:2]] + [str(uuid.uuid4())],
+            "completed": True,
+        },
+    )
+
+    assert response.status_code == 200
+    assert sorted(task["name"] for task in response.json()) == ["Task 0", "Task 1"]
+    assert all(task["completed"] for task in response.json())
+    completed = await session.scalars(
+        select(Task.name).where(Task.completed).execution_options(populate_existing=True)
+    )
+    assert sorted(completed) == ["Task 0", "Task 1"]
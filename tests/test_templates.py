@@ -0,0 +1,153 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from pydantic import ValidationError
+
+from app.config import settings
+from app.modules.calendar.cache import trainer_dashboard_cache
+from app.modules.calendar.logic import get_calendar
+from app.modules.calendar.models import Calendar, CalendarType
+from app.modules.calendar.schemas import CalendarFilter
+from app.modules.templates.logic import (
+    create_template_instance,
+    expand_occurrences,
+    set_template_task_completion,
+)
+from app.modules.templates.models import CalendarTemplate
+from app.modules.templates.schemas import (
+    CalendarTemplateIn,
+    TemplateTaskCompletionIn,
+    TemplateTaskIn,
+)
+
+
+def _template_in(rrule: str, **values) -> CalendarTemplateIn:
+    return CalendarTemplateIn(
+        user_id=values.pop("user_id", uuid.uuid4()),
+        title="Run",
+        type=CalendarType.EXERCISE,
+        dtstart=values.pop("dtstart", datetime(2026, 3, 2, 8)),
+        rrule=rrule,
+        **values,
+    )
+
+
+@pytest.mark.parametrize("rrule", ["FREQ=HOURLY", "FREQ=MINUTELY;COUNT=10", "FREQ=SECONDLY"])
+def test_rules_finer_than_daily_are_rejected(rrule):
+    with pytest.raises(ValidationError, match="more often than daily"):
+        _template_in(rrule)
+
+
+def test_rule_count_is_capped():
+    _template_in(f"FREQ=DAILY;COUNT={settings.TEMPLATE_MAX_COUNT}")
+
+    with pytest.raises(ValidationError, match="COUNT is limited"):
+        _template_in(f"FREQ=DAILY;COUNT={settings.TEMPLATE_MAX_COUNT + 1}")
+
+
+def test_dtstart_is_stored_as_naive_utc():
+    data = _template_in(
+        "FREQ=DAILY", dtstart=datetime(2026, 3, 2, 11, tzinfo=timezone(timedelta(hours=3)))
+    )
+
+    assert data.dtstart == datetime(2026, 3, 2, 8)
+
+
+@pytest.mark.parametrize(
+    ("rrule", "until"),
+    [
+        ("FREQ=WEEKLY;COUNT=3", datetime(2026, 3, 16, 8)),
+        ("FREQ=DAILY;UNTIL=20260310T000000", datetime(2026, 3, 10)),
+        ("FREQ=WEEKLY;BYDAY=MO", None),
+    ],
+)
+async def test_template_until_comes_from_the_parsed_rule(session, make_user, rrule, until):
+    user = await make_user()
+
+    template = await create_template_instance(session, _template_in(rrule, user_id=user.id), user)
+
+    assert template.until == until
+
+
+async def test_expansion_is_capped(session, make_user, monkeypatch):
+    user = await make_user()
+    template = await create_template_instance(
+        session, _template_in("FREQ=DAILY;BYHOUR=1,2,3,4,5,6", user_id=user.id), user
+    )
+    await session.commit()
+    monkeypatch.setattr(settings, "TEMPLATE_MAX_OCCURRENCES", 10)
+
+    occurrences = await expand_occurrences(
+        session,
+        datetime(2026, 3, 1),
+        datetime(2026, 5, 1),
+        CalendarTemplate.id == template.id,
+    )
+
+    assert len(occurrences) == 10
+    assert [calendar.scheduled for calendar in occurrences] == sorted(
+        calendar.scheduled for calendar in occurrences
+    )
+
+
+async def test_occurrences_and_calendars_share_the_utc_day(session, make_user):
+    user = await make_user()
+    moscow = timezone(timedelta(hours=3))
+    # 01:30 in Moscow is still the previous day in UTC, for both sources alike
+    await create_template_instance(
+        session,
+        _template_in(
+            "FREQ=DAILY;COUNT=1",
+            user_id=user.id,
+            dtstart=datetime(2026, 3, 2, 1, 30, tzinfo=moscow),
+        ),
+        user,
+    )
+    session.add(
+        Calendar(
+            user_id=user.id,
+            scheduled=datetime(2026, 3, 1, 22, 30),
+            title="Concrete",
+            type=CalendarType.EXERCISE,
+        )
+    )
+    await session.commit()
+
+    utc_day = await get_calendar(session, CalendarFilter(user_id=user.id, scheduled="2026-03-01"))
+    moscow_day = await get_calendar(
+        session,
+        CalendarFilter(user_id=user.id, scheduled="2026-03-02", timezone="Europe/Moscow"),
+    )
+
+    assert [calendar.scheduled for calendar in utc_day] == [
+        datetime(2026, 3, 1, 22, 30),
+        datetime(2026, 3, 1, 22, 30),
+    ]
+    assert len(moscow_day) == 2
+
+
+async def test_completion_invalidates_the_trainer_dashboard(session, make_user):
+    trainer = await make_user(role="trainer")
+    client = await make_user(trainer_id=trainer.id)
+    template = await create_template_instance(
+        session,
+        _template_in(
+            "FREQ=DAILY;COUNT=3",
+            user_id=client.id,
+            tasks=[TemplateTaskIn(name="Run", amount=1, unit="km")],
+        ),
+        trainer,
+    )
+    await session.commit()
+    trainer_dashboard_cache.set(trainer.id, ("dashboard",), object(), {client.id})
+
+    task = await set_template_task_completion(
+        session,
+        TemplateTaskCompletionIn(
+            template_task_id=template.tasks[0].id, occurrence=datetime(2026, 3, 3, 8)
+        ),
+    )
+
+    assert task.completed
+    assert trainer_dashboard_cache.get(trainer.id, ("dashboard",)) is None
@@ -0,0 +1,164 @@
+import asyncio
+import json
+import multiprocessing
+import time
+import uuid
+
+import asyncpg
+import pytest
+
+from app.config import settings
+from app.utils.websocket_backplane import Backplane, PostgresBackplane
+from tests.backplane_worker import MESSAGES, listen
+from tests.helpers import FakeWebSocket, percentile, report
+
+WORKERS = 4
+
+
+def _dsn() -> str:
+    return settings.DATABASE_URL.replace("postgresql+asyncpg://", "postgresql://", 1)
+
+
+def test_backplane_requires_publish():
+    with pytest.raises(TypeError):
+        Backplane()
+
+
+async def test_broadcast_reaches_room_members_only(websocket_manager):
+    members = {str(uuid.uuid4()): FakeWebSocket() for _ in range(3)}
+    outsider = FakeWebSocket()
+    for user_id, websocket in members.items():
+        await websocket_manager.connect(user_id, websocket)
+        websocket_manager.set_user_room(user_id, "room")
+    await websocket_manager.connect(str(uuid.uuid4()), outsider)
+
+    await websocket_manager.broadcast(
+        "saved", room_id="room", event="document", document_id=uuid.uuid4()
+    )
+    await asyncio.sleep(0)
+
+    for websocket in members.values():
+        [message] = websocket.sent
+        assert json.loads(message)["message"] == "saved"
+    assert outsider.sent == []
+
+
+async def test_room_index_drops_empty_rooms(websocket_manager):
+    moving, staying = str(uuid.uuid4()), str(uuid.uuid4())
+    for user_id in (moving, staying):
+        await websocket_manager.connect(user_id, FakeWebSocket())
+        websocket_manager.set_user_room(user_id, "first")
+
+    websocket_manager.set_user_room(moving, "second")
+    assert websocket_manager.rooms == {"first": {staying}, "second": {moving}}
+    websocket_manager.set_user_room(moving, None)
+    assert websocket_manager.rooms == {"first": {staying}}
+    assert moving not in websocket_manager.user_rooms
+    websocket_manager.set_user_room(moving, "second")
+    await websocket_manager.disconnect(moving)
+    await websocket_manager.disconnect(staying)
+
+    assert websocket_manager.rooms == {}
+    assert websocket_manager.user_rooms == {}
+
+
+async def test_disconnected_postgres_backplane_delivers_locally(database):
+    delivered = []
+
+    async def handler(room_id: str, message: str):
+        delivered.append((room_id, message))
+
+    backplane = PostgresBackplane(_dsn(), f"test_{uuid.uuid4().hex}")
+    await backplane.start(handler)
+    try:
+        await backplane._connection.close()
+        await backplane.publish("room", "hello")
+    finally:
+        await backplane.stop()
+
+    assert delivered == [("room", "hello")]
+
+
+async def test_large_broadcasts_go_through_the_payload_table(database):
+    received = asyncio.Queue()
+
+    async def handler(room_id: str, message: str):
+        received.put_nowait((room_id, message))
+
+    message = "x" * 20_000
+    backplane = PostgresBackplane(_dsn(), f"test_{uuid.uuid4().hex}")
+    await backplane.start(handler)
+    try:
+        await backplane.publish("room", message)
+        delivered = await asyncio.wait_for(received.get(), 10)
+    finally:
+        await backplane.stop()
+
+    assert delivered == ("room", message)
+
+
+class _BrokenConnection:
+    def is_closed(self) -> bool:
+        return False
+
+    async def execute(self, *_args):
+        msg = "connection was closed in the middle of operation"
+        raise asyncpg.ConnectionDoesNotExistError(msg)
+
+
+async def test_failed_notify_delivers_locally(database):
+    delivered = []
+
+    async def handler(room_id: str, message: str):
+        delivered.append((room_id, message))
+
+    backplane = PostgresBackplane(_dsn(), f"test_{uuid.uuid4().hex}")
+    await backplane.start(handler)
+    connection, backplane._connection = backplane._connection, _BrokenConnection()
+    try:
+        await backplane.publish("room", "hello")
+    finally:
+        backplane._connection = connection
+        await backplane.stop()
+
+    assert delivered == [("room", "hello")]
+
+
+@pytest.mark.benchmark
+async def test_postgres_backplane_across_workers(database):
+    context = multiprocessing.get_context("spawn")
+    channel = f"test_{uuid.uuid4().hex}"
+    results = context.Queue()
+    readies = [context.Event() for _ in range(WORKERS)]
+    workers = [
+        context.Process(target=listen, args=(_dsn(), channel, ready, results)) for ready in readies
+    ]
+    for worker in workers:
+        worker.start()
+    loop = asyncio.get_running_loop()
+    for ready in readies:
+        assert await loop.run_in_executor(None, ready.wait, 60)
+
+    async def ignore(_room_id: str, _message: str):
+        pass
+
+    publisher = PostgresBackplane(_dsn(), channel)
+    await publisher.start(ignore)
+    started = time.perf_counter()
+    try:
+        for number in range(MESSAGES):
+            await publisher.publish("room", json.dumps({"number": number, "sent": time.time()}))
+        published = time.perf_counter() - started
+        received = [
+            await loop.run_in_executor(None, results.get, True, 90) for _ in range(WORKERS)
+        ]
+    finally:
+        await publisher.stop()
+        for worker in workers:
+            worker.join(10)
+
+    latencies = [latency for worker_latencies in received for latency in worker_latencies]
+    report(f"backplane delivery, {WORKERS} workers", latencies)
+    print(f"backplane publish throughput: {MESSAGES / published:.0f} msg/s")  # noqa: T201
+    assert [len(worker_latencies) for worker_latencies in received] == [MESSAGES] * WORKERS
+    assert percentile(latencies, 0.99) < 1
@@ -0,0 +1,59 @@
+import asyncio
+import logging
+import uuid
+
+import pytest
+
+from app.config import settings
+from app.utils.websocket_sender import SLOW_CONSUMER_CLOSE_CODE, ConnectionSender
+from tests.helpers import FakeWebSocket, Timer, report
+
+CONNECTIONS = 5_000
+SLOW_SHARE = 0.01
+BROADCASTS = 200
+
+
+async def test_failed_eviction_is_logged(caplog):
+    async def on_evict(_sender: ConnectionSender):
+        msg = "close failed"
+        raise RuntimeError(msg)
+
+    sender = ConnectionSender(
+        FakeWebSocket(slow=True), queue_size=1, evict_after=0, on_evict=on_evict
+    )
+    with caplog.at_level(logging.ERROR):
+        for number in range(4):
+            sender.send(str(number))
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+    sender.close()
+
+    assert sender._evict_task.done()
+    assert "Failed to evict a slow websocket client" in caplog.text
+
+
+@pytest.mark.benchmark
+async def test_slow_receivers_do_not_hold_back_a_room(websocket_manager, monkeypatch):
+    monkeypatch.setattr(settings, "WEBSOCKET_SEND_QUEUE_SIZE", 10)
+    monkeypatch.setattr(settings, "WEBSOCKET_SLOW_CONSUMER_SECONDS", 0.05)
+    websockets = {
+        str(uuid.uuid4()): FakeWebSocket(slow=number < CONNECTIONS * SLOW_SHARE)
+        for number in range(CONNECTIONS)
+    }
+    for user_id, websocket in websockets.items():
+        await websocket_manager.connect(user_id, websocket)
+        websocket_manager.set_user_room(user_id, "room")
+    timer = Timer()
+
+    for number in range(BROADCASTS):
+        with timer:
+            await websocket_manager.deliver("room", str(number))
+        await asyncio.sleep(0.001)
+    await asyncio.sleep(0.1)
+
+    report(f"deliver to a room of {CONNECTIONS}", timer.samples)
+    slow = [user_id for user_id, websocket in websockets.items() if websocket.slow]
+    fast = [websocket for websocket in websockets.values() if not websocket.slow]
+    assert all(len(websocket.sent) == BROADCASTS for websocket in fast)
+    assert not set(slow) & set(websocket_manager.connections)
+    assert all(websockets[user_id].close_code == SLOW_CONSUMER_CLOSE_CODE for user_id in slow)
@@ -0,0 +1,95 @@
+import asyncio
+from typing import Dict, List
+
+import pytest
+from sqlalchemy import text
+
+from app.database.session import async_engine
+from app.utils.websocket_manager import websocket_manager
+from tests.conftest import truncate_tables
+from tests.helpers import WebSocketClient
+
+SOCKETS = 1_000
+SAMPLES = 10
+
+
+async def _all_in_room(room_id: str):
+    while len(websocket_manager.rooms.get(room_id, ())) < SOCKETS:
+        await asyncio.sleep(0.05)
+
+
+async def _state_written(checked_out: int):
+    # The room changes are written behind in one batch, which may still be running
+    await websocket_manager.session_states.flush()
+    while async_engine.pool.checkedout() > checked_out:
+        await asyncio.sleep(0.05)
+
+
+async def _checked_out_while_idle() -> List[int]:
+    samples = []
+    for _ in range(SAMPLES):
+        await asyncio.sleep(0.05)
+        samples.append(async_engine.pool.checkedout())
+    return samples
+
+
+@pytest.mark.benchmark
+async def test_idle_websockets_hold_no_connections(database):
+    from main import app
+
+    async with async_engine.begin() as connection:
+        user_ids = (
+            await connection.scalars(
+                text(
+                    "INSERT INTO users (id, email, hashed_password, first_name, status,"
+                    " created_at, changed_at)"
+                    " SELECT gen_random_uuid(), 'soak-' || n || '@example.com', 'x', 'Soak',"
+                    " 'ACTIVE', now(), now() FROM generate_series(1, :sockets) AS n"
+                    " RETURNING id"
+                ),
+                {"sockets": SOCKETS},
+            )
+        ).all()
+        await connection.execute(
+            text(
+                "INSERT INTO user_fingerprint (id, user_id, created_at, updated_at,"
+                " fingerprint_data) SELECT gen_random_uuid(), id, now(), now(), '{}'::json"
+                " FROM users"
+            )
+        )
+    app.state.websocket_manager = websocket_manager
+    await websocket_manager.start()
+    clients: Dict[str, WebSocketClient] = {
+        str(user_id): WebSocketClient(str(user_id)) for user_id in user_ids
+    }
+    checked_out = async_engine.pool.checkedout()
+    tasks = [
+        asyncio.create_task(app(client.scope(10_000 + number), client.receive, client.send))
+        for number, client in enumerate(clients.values())
+    ]
+
+    try:
+        await asyncio.wait_for(
+            asyncio.gather(*(client.accepted.wait() for client in clients.values())), 60
+        )
+        idle = await _checked_out_while_idle()
+        for client in clients.values():
+            client.send_text({"type": "update", "data": {"room_id": "soak"}})
+        await asyncio.wait_for(_all_in_room("soak"), 60)
+        await asyncio.wait_for(_state_written(checked_out), 60)
+        after_messages = await _checked_out_while_idle()
+    finally:
+        for client in clients.values():
+            client.inbox.put_nowait({"type": "websocket.disconnect", "code": 1000})
+        results = await asyncio.wait_for(asyncio.gather(*tasks, return_exceptions=True), 60)
+        async with async_engine.connect() as connection:
+            open_sessions = await connection.scalar(
+                text("SELECT count(*) FROM user_session WHERE end_at IS NULL")
+            )
+        await truncate_tables()
+
+    assert [result for result in results if result is not None] == []
+    assert len(websocket_manager.connections) == 0
+    assert idle == [checked_out] * SAMPLES
+    assert after_messages == [checked_out] * SAMPLES
+    assert open_sessions == 0
@@ -0,0 +1,68 @@
+import asyncio
+from datetime import datetime
+
+from sqlalchemy import select, update
+
+from app.database.session import SessionManager
+from app.modules.user_sessions.models import Session
+from app.modules.users.models import UserFingerprint
+from tests.helpers import WebSocketClient
+
+
+async def test_update_merges_into_the_written_state(session, make_user, websocket_manager):
+    user = await make_user()
+    fingerprint = UserFingerprint(user_id=user.id, fingerprint_data={})
+    session.add(fingerprint)
+    await session.flush()
+    user_session = Session(
+        user_id=user.id,
+        fingerprint_id=fingerprint.id,
+        ip="127.0.0.1",
+        location="",
+        start_at=datetime.now(),
+    )
+    session.add(user_session)
+    await session.commit()
+    # As in the endpoint, state was never loaded on the instance but was written since
+    await session.execute(
+        update(Session)
+        .where(Session.id == user_session.id)
+        .values(state={"room_id": "written", "cursor": 1})
+    )
+    await session.commit()
+    session.expunge(user_session)
+
+    async with SessionManager() as message_session:
+        merged = await message_session.merge(user_session, load=False)
+        await websocket_manager.update_session_state(message_session, merged, {"cursor": 2})
+
+    assert websocket_manager.session_states.pop(user_session.id) == {
+        "room_id": "written",
+        "cursor": 2,
+    }
+    assert websocket_manager.user_rooms[str(user.id)] == "written"
+    websocket_manager.set_user_room(str(user.id), None)
+
+
+async def test_malformed_message_still_ends_the_session(session, make_user, websocket_manager):
+    from main import app
+
+    user = await make_user()
+    session.add(UserFingerprint(user_id=user.id, fingerprint_data={}))
+    await session.commit()
+    app.state.websocket_manager = websocket_manager
+    client = WebSocketClient(str(user.id))
+    endpoint = asyncio.create_task(app(client.scope(10_000), client.receive, client.send))
+    await asyncio.wait_for(client.accepted.wait(), 10)
+
+    client.inbox.put_nowait({"type": "websocket.receive", "text": "not json"})
+    result = await asyncio.wait_for(asyncio.gather(endpoint, return_exceptions=True), 10)
+
+    assert isinstance(result[0], ValueError)
+    assert str(user.id) not in websocket_manager.connections
+    end_at = await session.scalar(
+        select(Session.end_at)
+        .where(Session.user_id == user.id)
+        .execution_options(populate_existing=True)
+    )
+    assert end_at is not None